@@ -0,0 +1,89 @@
+"""
+ResuMate Micro-Batcher
+──────────────────────
+Hands items submitted under the same key to one async handler call. An
+item for a key with no batch running is dispatched at once, so a lone
+caller never waits; items arriving while that key's batch runs are
+collected and sent together when it finishes, after at most the window,
+or as soon as the size cap is hit. Each submitter gets back its own slot of
+the handler's result list.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+
+class MicroBatcher:
+    """Group concurrent submissions per key into a single handler call."""
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        window_seconds: float = 0.25,
+        max_batch_size: int = 8,
+    ):
+        self.handler = handler
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._pending: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._running: Dict[str, int] = {}
+        self._tasks: set = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, key: str, item: Any) -> Any:
+        """Queue an item under key and wait for its individual result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= self.max_batch_size or not self._running.get(key):
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.window_seconds, self._flush, key)
+        return await future
+
+    def _flush(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self._running[key] = self._running.get(key, 0) + 1
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: str, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            self._finish(key)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _finish(self, key: str) -> None:
+        """A batch for key is done: send what queued up behind it."""
+        self._running[key] -= 1
+        if not self._running[key]:
+            del self._running[key]
+            if self._pending.get(key):
+                self._flush(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "pending_keys": len(self._pending),
+        }
@@ -0,0 +1,138 @@
+"""
+JSON extraction benchmark
+─────────────────────────
+Compares the old regex + repair_json extractor with json_extract.extract_json
+on the malformed model outputs in malformed_outputs.jsonl (accuracy) and on
+synthetic long outputs (scaling).
+
+Usage (from model-server/):
+    python benchmarks/bench_json_extraction.py [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_extract import extract_json  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "malformed_outputs.jsonl")
+
+
+def legacy_repair_json(text):
+    try:
+        text = re.sub(r',\s*([}\]])', r'\1', text)
+        text = re.sub(r'//.*?$', '', text, flags=re.MULTILINE)
+        text = text.replace("'", '"')
+        json.loads(text)
+        return text
+    except json.JSONDecodeError:
+        return None
+
+
+def legacy_extract(text):
+    """The extractor server.py used before json_extract.py."""
+    try:
+        json.loads(text)
+        return text
+    except json.JSONDecodeError:
+        pass
+    patterns = [
+        r'```json\s*([\s\S]*?)\s*```',
+        r'```\s*([\s\S]*?)\s*```',
+        r'(\{[\s\S]*\})',
+        r'(\[[\s\S]*\])',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            candidate = match.group(1).strip()
+            try:
+                json.loads(candidate)
+                return candidate
+            except json.JSONDecodeError:
+                repaired = legacy_repair_json(candidate)
+                if repaired:
+                    return repaired
+    return None
+
+
+def run_legacy(text):
+    extracted = legacy_extract(text)
+    return json.loads(extracted) if extracted else None
+
+
+def run_new(text):
+    extraction = extract_json(text)
+    return extraction.value if extraction else None
+
+
+def grade(value, expected_keys):
+    """ok: all expected keys recovered; partial: some; miss: none/wrong."""
+    if expected_keys is None:
+        return "ok" if value is None or isinstance(value, list) else "miss"
+    if not isinstance(value, dict):
+        return "miss"
+    found = sum(1 for key in expected_keys if key in value)
+    if found == len(expected_keys):
+        return "ok"
+    return "partial" if found else "miss"
+
+
+def timed(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(text)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def accuracy(repeat):
+    with open(CORPUS, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+
+    print(f"{'case':32} {'legacy':>8} {'us':>8} {'new':>8} {'us':>8}")
+    totals = {"legacy": {"ok": 0, "partial": 0, "miss": 0, "time": 0.0},
+              "new": {"ok": 0, "partial": 0, "miss": 0, "time": 0.0}}
+    for case in cases:
+        row = [f"{case['id']:32}"]
+        for name, fn in (("legacy", run_legacy), ("new", run_new)):
+            value, seconds = timed(fn, case["output"], repeat)
+            verdict = grade(value, case["expected_keys"])
+            totals[name][verdict] += 1
+            totals[name]["time"] += seconds
+            row.append(f"{verdict:>8} {seconds * 1e6:8.1f}")
+        print(" ".join(row))
+
+    print()
+    for name, t in totals.items():
+        print(f"{name:7} ok={t['ok']:2} partial={t['partial']:2} miss={t['miss']:2} "
+              f"total={t['time'] * 1e3:.3f} ms/pass")
+
+
+def scaling():
+    body = json.dumps({"score": 70, "feedback": "fine", "strengths": ["a"], "improvements": ["b"]})
+    print("\nscaling (ms per call)")
+    print(f"{'input':38} {'chars':>8} {'legacy':>10} {'new':>10}")
+    for size in (2_000, 8_000, 32_000):
+        inputs = {
+            "json + long trailing prose": body + " The candidate is good." * (size // 23),
+            "long preamble + json": "Thinking about the answer. " * (size // 27) + body,
+            "unclosed braces (degenerate)": "{ " * (size // 2),
+        }
+        for label, text in inputs.items():
+            repeat = 3 if "degenerate" in label else 20
+            _, legacy_s = timed(run_legacy, text, repeat)
+            _, new_s = timed(run_new, text, repeat)
+            print(f"{label:38} {len(text):8} {legacy_s * 1e3:10.3f} {new_s * 1e3:10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="iterations per corpus case")
+    args = parser.parse_args()
+    accuracy(args.repeat)
+    scaling()
@@ -0,0 +1,138 @@
+"""
+Pre-fork serving benchmark
+──────────────────────────
+Starts prefork.py with 1, 2 and 4 workers (rule-based parsing only, so
+Ollama is not involved), drives /parse-resume with concurrent clients and
+reports throughput and latency percentiles for each worker count. Also
+reports each worker's unique (unshared) memory, which stays small because
+the preloaded tables are shared copy-on-write with the master.
+
+Usage (from model-server/):
+    python benchmarks/bench_prefork.py [--workers 1 2 4] [--requests 400] [--concurrency 32]
+
+Throughput only scales up to the number of CPU cores; on a single-core
+machine extra workers add context switching and no speedup.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+
+from server import PRELOAD_SAMPLE_RESUME  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def unique_memory_mb(pid: int) -> float:
+    """Private (dirty + clean) memory of a process from /proc; 0 where unavailable."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as handle:
+            fields = dict(line.split(":", 1) for line in handle if ":" in line)
+    except OSError:
+        return 0.0
+    kb = sum(int(fields.get(key, "0 kB").split()[0]) for key in ("Private_Clean", "Private_Dirty"))
+    return kb / 1024.0
+
+
+def child_pids(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as handle:
+            return [int(child) for child in handle.read().split()]
+    except OSError:
+        return []
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/ready")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not become ready")
+
+
+async def drive(url: str, requests: int, concurrency: int):
+    body = {"resumeText": PRELOAD_SAMPLE_RESUME * 4}
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def client_loop(client):
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/parse-resume", json=body)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def run(workers: int, port: int, requests: int, concurrency: int) -> None:
+    env = dict(
+        os.environ,
+        RESUME_PARSER_MODE="regex",
+        OLLAMA_WARMUP_ENABLED="false",
+        OLLAMA_URL="http://127.0.0.1:9",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "prefork.py", "--workers", str(workers), "--port", str(port), "--log-level", "warning"],
+        cwd=HERE,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_ready(url))
+        asyncio.run(drive(url, min(requests, 50), concurrency))  # warm up
+        latencies, errors, elapsed = asyncio.run(drive(url, requests, concurrency))
+        memory = [unique_memory_mb(pid) for pid in child_pids(process.pid)]
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    print(
+        f"{workers:>7}  {len(latencies) / elapsed:>8.1f}  {percentile(latencies, 50) * 1000:>8.1f}"
+        f"  {percentile(latencies, 95) * 1000:>8.1f}  {errors:>6}"
+        f"  {(sum(memory) / len(memory) if memory else 0.0):>13.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=18460)
+    args = parser.parse_args()
+    print(f"cpus={os.cpu_count()} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'workers':>7}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'errors':>6}  {'unique MB/wkr':>13}")
+    for count in args.workers:
+        run(count, args.port, args.requests, args.concurrency)
@@ -0,0 +1,135 @@
+"""
+Cold-start benchmark
+────────────────────
+Starts `python server.py` from scratch several times (rule-based parsing,
+no Ollama) and reports, from process spawn:
+  - time to the first successful /health
+  - time to the first successful /parse-resume (and that parse's latency)
+  - the server's own phase timings from /health "startup"
+
+The server's modules are copied to a temporary directory and run there,
+once without bytecode for them (as on a first start, or wherever
+PYTHONDONTWRITEBYTECODE is set) and once precompiled with compileall.
+--imports N adds a run with STARTUP_PROFILE_IMPORTS on and prints the N
+slowest imports it recorded.
+
+Usage (from model-server/):
+    python benchmarks/bench_startup.py [--runs 5] [--imports 15] [--no-parser-warmup]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+
+from server import PRELOAD_SAMPLE_RESUME  # noqa: E402
+
+
+def copy_server(target: str, precompile: bool) -> None:
+    for path in glob.glob(os.path.join(HERE, "*.py")):
+        shutil.copy(path, target)
+    if precompile:
+        subprocess.run([sys.executable, "-m", "compileall", "-q", "-l", target], check=True)
+
+
+def wait_for(client: httpx.Client, method: str, url: str, deadline: float, **kwargs) -> httpx.Response:
+    while time.monotonic() < deadline:
+        try:
+            response = client.request(method, url, **kwargs)
+            if response.status_code == 200:
+                return response
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise RuntimeError(f"{method} {url} did not succeed in time")
+
+
+def start_once(directory: str, port: int, env: dict, timeout: float = 60.0) -> dict:
+    url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=directory,
+        env=dict(env, PORT=str(port)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        with httpx.Client(timeout=10.0) as client:
+            wait_for(client, "GET", f"{url}/health", deadline)
+            health = time.perf_counter() - start
+            parse_start = time.perf_counter()
+            wait_for(client, "POST", f"{url}/parse-resume", deadline, json={"resumeText": PRELOAD_SAMPLE_RESUME})
+            parse = time.perf_counter() - start
+            parse_latency = time.perf_counter() - parse_start
+            startup = client.get(f"{url}/health").json().get("startup", {})
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {"health": health, "parse": parse, "parse_latency": parse_latency, "startup": startup}
+
+
+def report(label: str, runs) -> None:
+    def median_ms(values):
+        return statistics.median(values) * 1000
+
+    phases = [run["startup"].get("phases_s", {}) for run in runs]
+    imports = median_ms([p.get("imports", 0.0) for p in phases])
+    ready = median_ms([p.get("startup", 0.0) for p in phases])
+    print(
+        f"{label:>12}  {median_ms([r['health'] for r in runs]):>9.1f}  {min(r['health'] for r in runs) * 1000:>9.1f}"
+        f"  {median_ms([r['parse'] for r in runs]):>9.1f}  {median_ms([r['parse_latency'] for r in runs]):>9.1f}"
+        f"  {imports:>10.1f}  {ready:>10.1f}"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=18470)
+    parser.add_argument("--imports", type=int, default=0, help="print the N slowest imports (one profiled run)")
+    parser.add_argument("--no-parser-warmup", action="store_true", help="load the parser on the first parse instead")
+    args = parser.parse_args(argv)
+
+    env = dict(
+        os.environ,
+        RESUME_PARSER_MODE="regex",
+        OLLAMA_WARMUP_ENABLED="false",
+        OLLAMA_URL="http://127.0.0.1:9",
+        PARSER_WARMUP_ENABLED="false" if args.no_parser_warmup else "true",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    env.pop("STARTUP_PROFILE_IMPORTS", None)
+
+    print(f"runs={args.runs} parser_warmup={not args.no_parser_warmup} (medians unless noted; ms from spawn)")
+    print(
+        f"{'bytecode':>12}  {'health':>9}  {'health min':>9}  {'parse':>9}  {'parse lat':>9}"
+        f"  {'in: imports':>10}  {'in: ready':>10}"
+    )
+    for label, precompile in (("none", False), ("precompiled", True)):
+        with tempfile.TemporaryDirectory(prefix="resumate-startup-") as directory:
+            copy_server(directory, precompile)
+            report(label, [start_once(directory, args.port, env) for _ in range(args.runs)])
+
+    if args.imports:
+        with tempfile.TemporaryDirectory(prefix="resumate-startup-") as directory:
+            copy_server(directory, precompile=True)
+            run = start_once(directory, args.port, dict(env, STARTUP_PROFILE_IMPORTS="true"))
+        print(f"\nslowest imports (cumulative ms, self ms), {run['startup'].get('modules_loaded', 0)} modules loaded:")
+        for entry in run["startup"].get("slowest_imports", [])[: args.imports]:
+            print(f"  {entry['cumulative_ms']:>8.1f}  {entry['self_ms']:>8.1f}  {entry['module']}")
+
+
+if __name__ == "__main__":
+    main()
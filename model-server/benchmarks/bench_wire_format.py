@@ -0,0 +1,82 @@
+"""
+Wire format benchmark
+─────────────────────
+Encode/decode time and size of typical model-server bodies in each format
+the server negotiates (see wire_format.py): stdlib JSON, orjson and
+MessagePack, each also gzipped at RESPONSE_GZIP_LEVEL.
+
+Bodies: one /parse-resume response, a bulk body of --batch distinct parse
+results and the /parse-resume request for a full resume text.
+
+Usage (from model-server/):
+    python benchmarks/bench_wire_format.py [--batch 50] [--iterations 200] [--level 5]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+
+from resume_parser import parse_resume  # noqa: E402
+from server import PRELOAD_SAMPLE_RESUME  # noqa: E402
+from wire_format import msgpack, orjson  # noqa: E402
+
+
+def stdlib_dumps(content):
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def codecs():
+    yield "json", stdlib_dumps, json.loads
+    if orjson is not None:
+        yield "orjson", orjson.dumps, orjson.loads
+    if msgpack is not None:
+        yield "msgpack", lambda c: msgpack.packb(c, use_bin_type=True), lambda b: msgpack.unpackb(b, raw=False)
+
+
+def timed(fn, arg, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = fn(arg)
+    return (time.perf_counter() - start) / iterations * 1e6, result
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--level", type=int, default=5, help="gzip level")
+    args = parser.parse_args(argv)
+
+    resume_text = PRELOAD_SAMPLE_RESUME * 6
+
+    def parse_response(index: int = 0):
+        text = resume_text.replace("Jane Doe", f"Candidate {index}").replace("2016", str(1990 + index))
+        return {"success": True, "data": parse_resume(text), "parser": "regex"}
+
+    bodies = {
+        "parse response": parse_response(),
+        f"bulk x{args.batch}": {"results": [parse_response(i) for i in range(args.batch)]},
+        "parse request": {"resumeText": resume_text},
+    }
+
+    print(f"{'body':>16}  {'format':>8}  {'bytes':>8}  {'gzip':>8}  {'encode us':>10}  {'decode us':>10}  {'gzip us':>8}")
+    for label, body in bodies.items():
+        iterations = max(1, args.iterations // args.batch) if label.startswith("bulk") else args.iterations
+        for name, dumps, loads in codecs():
+            encode_us, encoded = timed(dumps, body, iterations)
+            decode_us, _ = timed(loads, encoded, iterations)
+            gzip_us, compressed = timed(lambda data: gzip.compress(data, args.level), encoded, iterations)
+            print(
+                f"{label:>16}  {name:>8}  {len(encoded):>8}  {len(compressed):>8}"
+                f"  {encode_us:>10.1f}  {decode_us:>10.1f}  {gzip_us:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
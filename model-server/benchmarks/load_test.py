@@ -0,0 +1,378 @@
+"""
+Load-test harness
+─────────────────
+Starts one or more mock Ollama servers (mock_ollama.py) and the model
+server pointed at them, then drives every server.py endpoint at a given
+concurrency. Each endpoint runs as its own phase and gets a row with
+throughput, latency percentiles and error count. /metrics is scraped
+before and after each phase to add what the phase caused upstream: Ollama
+calls, generation retries, backend failovers, local fallbacks, cache hits,
+coalesced calls, 429 rejections and calls short-circuited by the open
+circuit breaker.
+
+No GPU or tunnel is needed, so scheduler, cache and pooling changes can be
+compared run to run on one machine.
+
+Usage (from model-server/):
+    python benchmarks/load_test.py --concurrency 16 --requests 100
+    python benchmarks/load_test.py --endpoints score-resume chat --mock-error-rate 0.05 \\
+        --mock-malformed-rate 0.1 --server-env LLM_CACHE_ENABLED=false
+    python benchmarks/load_test.py --target http://localhost:8000 --repeat-rate 0.5
+
+--target drives an already running server (no mocks are started).
+--repeat-rate sends that fraction of requests with an identical body, to
+exercise the response cache and single-flight coalescing.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 010 0000 | San Francisco, CA
+
+SUMMARY
+Backend engineer building Python and Go services.
+
+EXPERIENCE
+Senior Software Engineer, Acme Corp
+Jan 2020 - Present
+- Built REST APIs with FastAPI, PostgreSQL and Redis on AWS
+- Cut p95 latency by 40% by adding caching and connection pooling
+
+EDUCATION
+B.S. Computer Science, State University, 2016
+
+SKILLS
+Python, Go, Docker, Kubernetes, SQL
+"""
+
+# Counters diffed per phase: column -> (metric name, optional label filter).
+COUNTERS = {
+    "ollama_calls": ("resumate_ollama_calls_total", None),
+    "retries": ("resumate_ollama_retries_total", None),
+    "failovers": ("resumate_ollama_failovers_total", None),
+    "fallbacks": ("resumate_fallback_activations_total", None),
+    "cache_hits": ("resumate_llm_cache_hits_total", None),
+    "coalesced": ("resumate_singleflight_coalesced_total", None),
+    "rejected": ("resumate_scheduler_rejected_total", None),
+    "short_circuited": ("resumate_ollama_circuit_rejected_total", None),
+    "hedge_wins": ("resumate_hedged_calls_total", 'outcome="hedge_won"'),
+}
+
+SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$")
+
+
+def parse_metrics(text: str) -> Dict[str, float]:
+    totals: Dict[str, float] = defaultdict(float)
+    for line in text.splitlines():
+        match = SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.group(1), match.group(2) or "", match.group(3)
+        for column, (metric, label_filter) in COUNTERS.items():
+            if name == metric and (label_filter is None or label_filter in labels):
+                totals[column] += float(value)
+    return totals
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+# ── Scenarios ──
+# Each takes (client, i, body_variant) and returns the final HTTP response.
+
+Scenario = Callable[[httpx.AsyncClient, int, str], Awaitable[httpx.Response]]
+
+
+def resume(variant: str) -> str:
+    return f"{RESUME}\nReference {variant}" if variant else RESUME
+
+
+async def read_sse(client: httpx.AsyncClient, path: str, body: dict) -> httpx.Response:
+    """POST to an SSE endpoint and read it to the end; an error event counts as a failure."""
+    async with client.stream("POST", path, json=body) as response:
+        text = (await response.aread()).decode("utf-8", "replace")
+    if response.status_code == 200 and "event: error" in text:
+        return httpx.Response(502, text=text, request=response.request)
+    return response
+
+
+def post(path: str, body: Callable[[str], dict]) -> Scenario:
+    async def run(client, i, variant):
+        return await client.post(path, json=body(variant))
+    return run
+
+
+def get(path: str) -> Scenario:
+    async def run(client, i, variant):
+        return await client.get(path)
+    return run
+
+
+def stream(path: str, body: Callable[[str], dict]) -> Scenario:
+    async def run(client, i, variant):
+        return await read_sse(client, path, body(variant))
+    return run
+
+
+def answer(variant: str) -> dict:
+    return {
+        "question": "How do you keep API latency low under load?",
+        "userAnswer": f"I profile first, then add caching and pooling. {variant}",
+        "expectedKeywords": ["caching", "profiling", "pooling"],
+    }
+
+
+async def chat_session(client, i, variant):
+    """A three-message conversation, then the session is read back and deleted."""
+    session_id = uuid.uuid4().hex
+    for turn in range(3):
+        body = {"message": f"Turn {turn}: how should I improve my resume? {variant}", "sessionId": session_id}
+        if turn == 0:
+            body["resumeData"] = {"skills": ["Python", "Go"], "experience": [{"jobTitle": "Engineer"}]}
+        response = await client.post("/chat", json=body)
+        if response.status_code != 200:
+            return response
+    await client.get(f"/chat/sessions/{session_id}")
+    response = await client.delete(f"/chat/sessions/{session_id}")
+    return response
+
+
+async def job(client, i, variant):
+    """Submit a scoring job and long-poll it to completion."""
+    response = await client.post("/jobs", json={"task": "score-resume", "input": {"resumeText": resume(variant)}})
+    if response.status_code != 202:
+        return response
+    job_id = response.json()["id"]
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        response = await client.get(f"/jobs/{job_id}", params={"wait": 30})
+        status = response.json().get("status") if response.status_code == 200 else None
+        if status == "succeeded":
+            return response
+        if status == "failed" or response.status_code != 200:
+            return httpx.Response(502, text=response.text, request=response.request)
+    return httpx.Response(504, request=response.request)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "root": get("/"),
+    "health": get("/health"),
+    "ready": get("/ready"),
+    "metrics": get("/metrics"),
+    "token-stats": get("/token-stats"),
+    "json-stats": get("/json-stats"),
+    "generate": post("/generate", lambda v: {"prompt": f"Give one resume tip. {v}", "task_type": "general"}),
+    "parse-resume": post("/parse-resume", lambda v: {"resumeText": resume(v), "progressive": False}),
+    "parse-resume-stream": stream("/parse-resume/stream", lambda v: {"resumeText": resume(v)}),
+    "score-resume": post("/score-resume", lambda v: {"resumeText": resume(v), "jobTitle": "Backend Engineer"}),
+    "score-resume-stream": stream("/score-resume/stream", lambda v: {"resumeText": resume(v)}),
+    "match-resume": post("/match-resume", lambda v: {
+        "resumeText": resume(v), "jobTitle": "Backend Engineer", "requiredSkills": ["Python", "AWS"],
+    }),
+    "match-resume-stream": stream("/match-resume/stream", lambda v: {
+        "resumeText": resume(v), "jobTitle": "Backend Engineer", "requiredSkills": ["Python", "AWS"],
+    }),
+    "analyze-resume": post("/analyze-resume", lambda v: {
+        "resumeText": resume(v), "jobTitle": "Backend Engineer", "requiredSkills": ["Python"],
+    }),
+    "generate-interview": post("/generate-interview", lambda v: {
+        "jobRole": f"Backend Engineer {v}".strip(), "skills": ["Python", "SQL"], "count": 3,
+    }),
+    "evaluate-answer": post("/evaluate-answer", answer),
+    "evaluate-answers": post("/evaluate-answers", lambda v: {"answers": [answer(v), answer(v + " again")]}),
+    "interview-feedback": post("/interview-feedback", lambda v: {
+        "allAnswers": [answer(v)], "scores": [72],
+    }),
+    "chat": chat_session,
+    "evaluate": post("/evaluate", lambda v: {
+        "predicted": {"skills": ["Python", "Go"], "note": v}, "expected": {"skills": ["Python", "Docker"]},
+    }),
+    "compare-models": post("/compare-models", lambda v: {"resumeText": resume(v)}),
+    "jobs": job,
+}
+
+
+async def run_phase(
+    base_url: str, name: str, requests: int, concurrency: int, repeat_rate: float, rng: random.Random,
+) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = defaultdict(int)
+    remaining = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency + 2)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300.0) as client:
+        before = parse_metrics((await client.get("/metrics")).text)
+
+        async def worker():
+            for i in remaining:
+                variant = "" if rng.random() < repeat_rate else f"{name}-{i}-{rng.random():.6f}"
+                start = time.perf_counter()
+                try:
+                    response = await scenario(client, i, variant)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 599
+                statuses[status] += 1
+                if status < 400:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        after = parse_metrics((await client.get("/metrics")).text)
+
+    deltas = {column: after.get(column, 0.0) - before.get(column, 0.0) for column in COUNTERS}
+    if name == "metrics":
+        deltas = {column: 0.0 for column in COUNTERS}  # the phase's own scrapes are the load
+    return {
+        "endpoint": name,
+        "requests": requests,
+        "ok": len(latencies),
+        "errors": requests - len(latencies),
+        "statuses": dict(statuses),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        **{column: int(value) for column, value in deltas.items()},
+        "fallback_rate": round(deltas["fallbacks"] / requests, 4) if requests else 0.0,
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    columns = [
+        ("endpoint", 20), ("ok", 5), ("errors", 6), ("rps", 8), ("p50_ms", 8), ("p95_ms", 8), ("p99_ms", 8),
+        ("ollama_calls", 12), ("retries", 7), ("failovers", 9), ("fallbacks", 9), ("fallback_rate", 13),
+        ("cache_hits", 10), ("coalesced", 9), ("rejected", 8), ("short_circuited", 15),
+    ]
+    print("  ".join(f"{name:>{width}}" for name, width in columns))
+    for row in rows:
+        print("  ".join(f"{row[name]:>{width}}" for name, width in columns))
+
+
+# ── Process management ──
+
+def start_process(args: List[str], env: Optional[dict] = None, log_path: Optional[str] = None) -> subprocess.Popen:
+    output = open(log_path, "w") if log_path else subprocess.DEVNULL
+    return subprocess.Popen([sys.executable, *args], cwd=HERE, env=env, stdout=output, stderr=subprocess.STDOUT)
+
+
+async def wait_until_up(url: str, path: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}{path}")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url}{path} did not come up within {timeout:.0f}s")
+
+
+def start_stack(args: argparse.Namespace) -> Tuple[str, List[subprocess.Popen]]:
+    processes = []
+    mock_urls = []
+    for index in range(args.mock_backends):
+        port = args.mock_port + index
+        processes.append(start_process([
+            "benchmarks/mock_ollama.py", "--port", str(port),
+            "--latency", str(args.mock_latency), "--jitter", str(args.mock_jitter),
+            "--tokens-per-second", str(args.mock_tps), "--error-rate", str(args.mock_error_rate),
+            "--malformed-rate", str(args.mock_malformed_rate), "--seed", str(args.seed + index),
+        ]))
+        mock_urls.append(f"http://127.0.0.1:{port}")
+    for url in mock_urls:
+        asyncio.run(wait_until_up(url, "/api/tags"))
+
+    env = dict(os.environ, PORT=str(args.port), OLLAMA_URL=mock_urls[0], OLLAMA_URLS=",".join(mock_urls))
+    env["RESUME_PARSER_MODE"] = "ollama"
+    for item in args.server_env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    entry = ["prefork.py", "--workers", str(args.server_workers), "--port", str(args.port), "--host", "127.0.0.1"] \
+        if args.server_workers > 1 else ["server.py"]
+    processes.append(start_process(entry, env, args.server_log))
+    base_url = f"http://127.0.0.1:{args.port}"
+    asyncio.run(wait_until_up(base_url, "/ready", timeout=120.0))
+    return base_url, processes
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=50, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat-rate", type=float, default=0.0, help="fraction of requests with a repeated body")
+    parser.add_argument("--target", help="drive this running server instead of starting one")
+    parser.add_argument("--port", type=int, default=18470, help="port for the started model server")
+    parser.add_argument("--server-workers", type=int, default=1, help=">1 starts the server with prefork.py")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the model server (repeatable)")
+    parser.add_argument("--server-log", default=None, help="write the model server's output to this file")
+    parser.add_argument("--mock-backends", type=int, default=1)
+    parser.add_argument("--mock-port", type=int, default=11600)
+    parser.add_argument("--mock-latency", type=float, default=0.2)
+    parser.add_argument("--mock-jitter", type=float, default=0.1)
+    parser.add_argument("--mock-tps", type=float, default=200.0)
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    parser.add_argument("--mock-malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    processes: List[subprocess.Popen] = []
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+        else:
+            base_url, processes = start_stack(args)
+        rng = random.Random(args.seed)
+        rows = []
+        for name in args.endpoints:
+            rows.append(asyncio.run(run_phase(base_url, name, args.requests, args.concurrency, args.repeat_rate, rng)))
+            print(f"  {name}: {rows[-1]['ok']}/{args.requests} ok, {rows[-1]['rps']} req/s", file=sys.stderr)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print(f"\nconcurrency={args.concurrency} requests/endpoint={args.requests} repeat_rate={args.repeat_rate}")
+    if not args.target:
+        print(
+            f"mock: backends={args.mock_backends} latency={args.mock_latency}s(+{args.mock_jitter}) "
+            f"tps={args.mock_tps} errors={args.mock_error_rate} malformed={args.mock_malformed_rate}"
+        )
+    print_table(rows)
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump({"args": vars(args), "results": rows}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
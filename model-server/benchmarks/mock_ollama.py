@@ -0,0 +1,228 @@
+"""
+Mock Ollama server
+──────────────────
+A stand-in for Ollama for load tests on machines without a GPU or tunnel.
+Implements /api/tags, /api/generate and /api/chat, streaming (NDJSON) and
+non-streaming, with a configurable time to first token, generation speed,
+error rate and malformed-output rate.
+
+Replies are synthesized from the request: when the request carries a JSON
+schema in `format` (OLLAMA_STRUCTURED_OUTPUT, the default) the reply is a
+random instance of that schema, otherwise a few sentences of filler text.
+A malformed reply is the same JSON cut off part-way, as a model hitting
+num_predict would produce. Injected errors are HTTP 500s.
+
+Usage (from model-server/):
+    python benchmarks/mock_ollama.py --port 11434 --latency 0.3 --tokens-per-second 40 \\
+        --error-rate 0.02 --malformed-rate 0.05
+
+GET /mock/stats returns request and injected-fault counts.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "candidate experience skills project team delivered improved built designed "
+    "python service data results clear strong role impact metrics lead quality"
+).split()
+
+# Bytes per token for synthesized text and the reported prompt_eval_count.
+CHARS_PER_TOKEN = 4
+
+
+class MockConfig:
+    def __init__(
+        self,
+        models: Optional[List[str]] = None,
+        latency: float = 0.2,
+        jitter: float = 0.0,
+        tokens_per_second: float = 50.0,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        # Defaults match server.py's PRIMARY_MODEL and FALLBACK_MODEL.
+        self.models = models or ["qwen2.5:14b", "qwen2.5:7b"]
+        # Time to first token (prompt processing), plus up to `jitter` seconds extra.
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        # 0 = generate instantly once the first token is due.
+        self.tokens_per_second = max(0.0, float(tokens_per_second))
+        self.error_rate = float(error_rate)
+        self.malformed_rate = float(malformed_rate)
+        self.rng = random.Random(seed)
+
+
+def sample_schema(schema: Dict[str, Any], rng: random.Random, key: str = "") -> Any:
+    """A random value matching a (flat, $ref-free) JSON schema."""
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        return {name: sample_schema(sub, rng, name) for name, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        items = [sample_schema(schema.get("items", {}), rng, key) for _ in range(rng.randint(2, 4))]
+        for position, item in enumerate(items, start=1):
+            # Batched replies (evaluate-answers) are matched to inputs by 1-based index.
+            if isinstance(item, dict) and isinstance(item.get("index"), int):
+                item["index"] = position
+        return items
+    if kind == "integer":
+        return rng.randint(40, 95)
+    if kind == "number":
+        return round(rng.uniform(0.4, 0.95), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return filler(rng, rng.randint(2, 8) if key else 6)
+
+
+def filler(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def request_text(body: Dict[str, Any]) -> str:
+    if "messages" in body:
+        return "\n".join(str(m.get("content", "")) for m in body.get("messages") or [])
+    return f"{body.get('system') or ''}\n{body.get('prompt') or ''}".strip()
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    app = FastAPI(title="Mock Ollama")
+    stats = {"requests": 0, "streamed": 0, "loads": 0, "errors": 0, "malformed": 0, "in_flight": 0, "max_in_flight": 0}
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": name, "model": name, "size": 4_700_000_000} for name in config.models]}
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return stats
+
+    async def generate(request: Request, chat: bool):
+        body = await request.json()
+        rng = config.rng
+        prompt = request_text(body)
+        stats["requests"] += 1
+        if body.get("model") not in config.models:
+            return JSONResponse(status_code=404, content={"error": f"model '{body.get('model')}' not found"})
+        if not prompt:
+            # keep_alive-only request: Ollama just loads the model.
+            stats["loads"] += 1
+            return done_body(body, chat, "", 0, 0.0, 0.0)
+        if rng.random() < config.error_rate:
+            stats["errors"] += 1
+            await asyncio.sleep(config.latency / 2)
+            return JSONResponse(status_code=500, content={"error": "mock: injected failure"})
+
+        schema = body.get("format")
+        if isinstance(schema, dict):
+            text = json.dumps(sample_schema(schema, rng))
+        elif schema == "json":
+            text = json.dumps({"result": filler(rng, 12)})
+        else:
+            sentences = max(1, min(8, int((body.get("options") or {}).get("num_predict", 200)) // 40))
+            text = ". ".join(filler(rng, rng.randint(8, 16)) for _ in range(sentences)) + "."
+        done_reason = "stop"
+        if rng.random() < config.malformed_rate:
+            stats["malformed"] += 1
+            text = text[: max(1, len(text) * rng.randint(3, 8) // 10)]
+            done_reason = "length"
+
+        first_token = config.latency + rng.uniform(0, config.jitter)
+        pieces = [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+        per_token = 1.0 / config.tokens_per_second if config.tokens_per_second else 0.0
+        prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        if not body.get("stream", True):
+            try:
+                await asyncio.sleep(first_token + per_token * len(pieces))
+            finally:
+                stats["in_flight"] -= 1
+            return done_body(body, chat, text, prompt_tokens, first_token, per_token * len(pieces), len(pieces), done_reason)
+
+        stats["streamed"] += 1
+
+        async def chunks():
+            try:
+                await asyncio.sleep(first_token)
+                for piece in pieces:
+                    yield json.dumps(chunk_body(body, chat, piece, done=False)) + "\n"
+                    if per_token:
+                        await asyncio.sleep(per_token)
+                final = done_body(body, chat, "", prompt_tokens, first_token, per_token * len(pieces), len(pieces), done_reason)
+                yield json.dumps(final) + "\n"
+            finally:
+                stats["in_flight"] -= 1
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.post("/api/generate")
+    async def api_generate(request: Request):
+        return await generate(request, chat=False)
+
+    @app.post("/api/chat")
+    async def api_chat(request: Request):
+        return await generate(request, chat=True)
+
+    return app
+
+
+def chunk_body(body: Dict[str, Any], chat: bool, text: str, done: bool) -> Dict[str, Any]:
+    out = {"model": body.get("model"), "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "done": done}
+    if chat:
+        out["message"] = {"role": "assistant", "content": text}
+    else:
+        out["response"] = text
+    return out
+
+
+def done_body(
+    body: Dict[str, Any], chat: bool, text: str, prompt_tokens: int, prompt_seconds: float,
+    eval_seconds: float, eval_tokens: int = 0, done_reason: str = "stop",
+) -> Dict[str, Any]:
+    out = chunk_body(body, chat, text, done=True)
+    out.update(
+        done_reason=done_reason,
+        total_duration=int((prompt_seconds + eval_seconds) * 1e9),
+        load_duration=1_000_000,
+        prompt_eval_count=prompt_tokens,
+        prompt_eval_duration=int(prompt_seconds * 1e9),
+        eval_count=eval_tokens,
+        eval_duration=int(eval_seconds * 1e9),
+    )
+    return out
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--models", nargs="+", default=None, help="model names listed by /api/tags")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds to first token")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="generation speed (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with HTTP 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of replies cut off mid-JSON")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    config = MockConfig(
+        args.models, args.latency, args.jitter, args.tokens_per_second, args.error_rate, args.malformed_rate, args.seed
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Cassette replay benchmark / regression check
+────────────────────────────────────────────
+Re-runs the calls recorded in an Ollama cassette (OLLAMA_CASSETTE_MODE=record,
+see cassette.py) through the server's own code, offline: resume parses go
+through /parse-resume (LLM parse, skill post-processing, fallbacks), other
+JSON tasks through run_json_task (extraction, schema checks, retries) and
+text tasks through run_text_task. Retries follow the recording, so a call
+that needed a second attempt in production needs one here too.
+
+Reports per task: cases, errors, warnings, retries, salvaged outputs,
+fallbacks and the server-side time per case. --save writes each case's
+output; --compare diffs a run against a saved one, which turns a cassette
+into a regression test for extraction and post-processing changes.
+
+Usage (from model-server/):
+    python benchmarks/replay_cassette.py ollama_cassette.jsonl [--timing 1] \\
+        [--save replay.json] [--compare replay.json] [--tasks parse-resume-ollama score-resume]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_server(args: argparse.Namespace):
+    os.environ.update(
+        OLLAMA_CASSETTE_MODE="replay",
+        OLLAMA_CASSETTE_PATH=os.path.abspath(args.cassette),
+        OLLAMA_CASSETTE_TIMING=str(args.timing),
+        RESUME_PARSER_MODE="ollama",
+        PARSE_RESUME_PROGRESSIVE="false",
+        LLM_CACHE_ENABLED="false",
+        LLM_SINGLEFLIGHT_ENABLED="false",
+        HEDGE_ENABLED="false",
+    )
+    sys.path.insert(0, HERE)
+    import server
+    logging.getLogger("model-server").setLevel(logging.ERROR)
+    return server
+
+
+def cases(server, tasks):
+    """First attempts in the cassette (retries are replayed by the code under test), one per key."""
+    seen = set()
+    for entry in server.ollama_cassette.entries():
+        request = entry["request"]
+        if entry["key"] in seen or request["prompt"].endswith(server.JSON_RETRY_HINT):
+            continue
+        if tasks and request["task"] not in tasks:
+            continue
+        seen.add(entry["key"])
+        yield entry
+
+
+async def run_case(server, entry):
+    request = entry["request"]
+    task, prompt, system = request["task"], request["prompt"], request.get("system")
+    if task == "parse-resume-ollama":
+        text = prompt[len("RESUME TEXT:\n"):] if prompt.startswith("RESUME TEXT:\n") else prompt
+        return await server.parse_resume(server.ParseResumeRequest(resumeText=text, progressive=False))
+    if task in server.TASK_SCHEMAS:
+        return await server.run_json_task(prompt, task, max_tokens=request.get("num_predict", 2048), system=system)
+    return await server.run_text_task(prompt, task, max_tokens=request.get("num_predict", 2048), system=system)
+
+
+def counter_totals(counter, label: str):
+    totals = defaultdict(float)
+    index = counter.labelnames.index(label)
+    for labels, value in counter.samples().items():
+        totals[labels[index]] += value
+    return totals
+
+
+async def replay(server, tasks):
+    results = []
+    for entry in cases(server, tasks):
+        task = entry["request"]["task"]
+        retries_before = server.OLLAMA_RETRIES.value(task=task)
+        start = time.perf_counter()
+        try:
+            output = await run_case(server, entry)
+            status = 200
+        except server.HTTPException as exc:
+            output, status = {"detail": exc.detail}, exc.status_code
+        except Exception as exc:
+            output, status = {"detail": str(exc)}, 500
+        results.append({
+            "key": entry["key"],
+            "task": task,
+            "status": status,
+            "seconds": round(time.perf_counter() - start, 4),
+            "retries": int(server.OLLAMA_RETRIES.value(task=task) - retries_before),
+            "warning": output.get("warning") if isinstance(output, dict) else None,
+            "salvaged": bool(isinstance(output, dict) and output.get("salvaged")),
+            "model": output.get("model") if isinstance(output, dict) else None,
+            "data": output.get("data", output.get("response", output)) if isinstance(output, dict) else output,
+        })
+    return results
+
+
+def report(results, fallbacks) -> None:
+    by_task = defaultdict(list)
+    for result in results:
+        by_task[result["task"]].append(result)
+    columns = [("task", 22), ("cases", 6), ("errors", 6), ("warnings", 8), ("retries", 7),
+               ("salvaged", 8), ("fallbacks", 9), ("avg_ms", 8), ("max_ms", 8)]
+    print("  ".join(f"{name:>{width}}" for name, width in columns))
+    for task, rows in sorted(by_task.items()):
+        seconds = [row["seconds"] for row in rows]
+        values = {
+            "task": task,
+            "cases": len(rows),
+            "errors": sum(row["status"] != 200 for row in rows),
+            "warnings": sum(bool(row["warning"]) for row in rows),
+            "retries": sum(row["retries"] for row in rows),
+            "salvaged": sum(row["salvaged"] for row in rows),
+            "fallbacks": int(fallbacks.get(task.replace("-ollama", ""), 0)),
+            "avg_ms": round(sum(seconds) / len(seconds) * 1000, 1),
+            "max_ms": round(max(seconds) * 1000, 1),
+        }
+        print("  ".join(f"{values[name]:>{width}}" for name, width in columns))
+
+
+def compare(results, baseline_path: str) -> int:
+    with open(baseline_path) as handle:
+        baseline = {row["key"]: row for row in json.load(handle)["results"]}
+    changed = 0
+    for row in results:
+        before = baseline.get(row["key"])
+        if before is None:
+            continue
+        fields = [name for name in ("status", "data", "warning", "retries") if before.get(name) != row.get(name)]
+        if fields:
+            changed += 1
+            print(f"  changed {row['task']} {row['key'][:12]}: {', '.join(fields)}")
+    missing = len(set(baseline) - {row["key"] for row in results})
+    print(f"{changed} of {len(results)} case(s) changed vs {baseline_path}" + (f"; {missing} not replayed" if missing else ""))
+    return changed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette")
+    parser.add_argument("--timing", type=float, default=0.0, help="replay delay as a fraction of the recorded time")
+    parser.add_argument("--tasks", nargs="+", default=None, help="only replay these tasks")
+    parser.add_argument("--save", help="write every case's output to this JSON file")
+    parser.add_argument("--compare", help="diff outputs against a file written by --save")
+    args = parser.parse_args(argv)
+
+    server = load_server(args)
+    fallbacks_before = counter_totals(server.FALLBACKS, "endpoint")
+    start = time.perf_counter()
+    results = asyncio.run(replay(server, set(args.tasks or [])))
+    elapsed = time.perf_counter() - start
+    fallbacks_after = counter_totals(server.FALLBACKS, "endpoint")
+    fallbacks = {k: fallbacks_after[k] - fallbacks_before.get(k, 0) for k in fallbacks_after}
+
+    print(f"{len(results)} case(s) from {args.cassette} in {elapsed:.2f}s (timing={args.timing})")
+    print(f"cassette: {server.ollama_cassette.stats()}")
+    report(results, fallbacks)
+    if args.save:
+        with open(args.save, "w") as handle:
+            json.dump({"cassette": args.cassette, "results": results}, handle, indent=2, default=str)
+    if args.compare:
+        return 1 if compare(results, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
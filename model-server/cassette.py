@@ -0,0 +1,156 @@
+"""
+ResuMate Ollama Cassettes
+─────────────────────────
+Record/replay for upstream Ollama generations. In record mode every call's
+request, output text, token stats and timing (or the error it ended with)
+is appended to a JSON-lines cassette file. In replay mode those results
+are served in place of Ollama, offline and deterministically, optionally
+with the original timing. Everything above the upstream call (JSON
+extraction, schema checks, retries, post-processing, metrics) runs as
+usual, so it can be benchmarked and regression-tested against real model
+outputs.
+
+Cassettes hold the prompts, and therefore the resumes sent to the model:
+treat them as user data.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger("model-server")
+
+MODES = ("off", "record", "replay")
+
+
+class CassetteMissError(Exception):
+    """A replayed call has no recording."""
+
+
+def describe_error(exc: Exception) -> Dict[str, Any]:
+    """JSON form of an upstream error, enough to raise an equivalent one on replay."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return {"type": "http", "status": exc.response.status_code, "body": exc.response.text[:2000]}
+    if isinstance(exc, httpx.TimeoutException):
+        return {"type": "timeout", "message": str(exc)}
+    if isinstance(exc, httpx.ConnectError):
+        return {"type": "connect", "message": str(exc)}
+    return {"type": "error", "message": str(exc)}
+
+
+def raise_error(error: Dict[str, Any]) -> None:
+    request = httpx.Request("POST", "http://cassette/api/generate")
+    message = error.get("message") or "recorded error"
+    if error["type"] == "http":
+        response = httpx.Response(error["status"], text=error.get("body", ""), request=request)
+        raise httpx.HTTPStatusError(f"HTTP {error['status']}", request=request, response=response)
+    if error["type"] == "timeout":
+        raise httpx.ReadTimeout(message, request=request)
+    if error["type"] == "connect":
+        raise httpx.ConnectError(message, request=request)
+    raise Exception(message)
+
+
+class Cassette:
+    """Records generations to, or replays them from, a JSON-lines file.
+
+    Entries are matched by key (model, prompt, system, temperature, output
+    format). A key recorded several times (e.g. a failed call and its retry)
+    is replayed in recorded order, starting over once exhausted.
+    timing scales the recorded durations on replay: 0 answers at once,
+    1 takes as long as the original call.
+    """
+
+    def __init__(self, path: str, mode: str = "off", timing: float = 0.0):
+        self.path = path
+        self.mode = mode if mode in MODES else "off"
+        self.timing = max(0.0, float(timing))
+        self.models: List[str] = []
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        if self.replaying:
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                lines = handle.readlines()
+        except FileNotFoundError:
+            logger.warning(f"Cassette {self.path} not found; every replayed call will miss")
+            return
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Cassette {self.path}:{number} is not valid JSON, skipped")
+                continue
+            self._entries.setdefault(entry["key"], []).append(entry)
+            model = entry.get("request", {}).get("model")
+            if model and model not in self.models:
+                self.models.append(model)
+        logger.info(f"Loaded {sum(map(len, self._entries.values()))} recorded call(s) from {self.path}")
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All loaded entries in recorded order."""
+        return sorted((e for group in self._entries.values() for e in group), key=lambda e: e["recorded_at"])
+
+    def record(
+        self, key: str, request: Dict[str, Any], elapsed: float, response: Optional[str] = None,
+        stats: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None,
+    ) -> None:
+        entry = {
+            "key": key,
+            "recorded_at": time.time(),
+            "request": request,
+            "elapsed_s": round(elapsed, 4),
+            "response": response,
+            "stats": stats or {},
+            "error": describe_error(error) if error is not None else None,
+        }
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+            self._stats["recorded"] += 1
+
+    async def replay(self, key: str) -> Dict[str, Any]:
+        """The next recording for key (raising its recorded error, if any)."""
+        group = self._entries.get(key)
+        if not group:
+            self._stats["misses"] += 1
+            raise CassetteMissError(f"No recorded Ollama call matches this request in {self.path}")
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = (index + 1) % len(group)
+        entry = group[index]
+        self._stats["replayed"] += 1
+        if self.timing:
+            await asyncio.sleep(entry.get("elapsed_s", 0.0) * self.timing)
+        if entry.get("error"):
+            raise_error(entry["error"])
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "path": self.path if self.mode != "off" else None,
+            "timing": self.timing,
+            "entries": sum(map(len, self._entries.values())),
+            **self._stats,
+        }
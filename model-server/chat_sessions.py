@@ -0,0 +1,332 @@
+"""
+ResuMate Chat Sessions
+──────────────────────
+Server-side chat history with a fixed prompt budget. The user's resume is
+reduced once, when the session starts, to a compact summary; recent turns
+are kept verbatim up to a token budget, and older turns are folded into a
+rolling summary (extractively at once, then refined by the model in the
+background). Every message is therefore sent with roughly the same prompt
+size, however long the conversation runs. The user's message itself is
+never cut; a message too long for the model's context is rejected upstream.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from token_budget import estimate_tokens, truncate_tokens
+
+logger = logging.getLogger("model-server")
+
+# (previous summary, folded turns) -> new summary
+Summarizer = Callable[[str, List[Dict[str, str]]], Awaitable[str]]
+
+
+def summarize_resume(resume: Any, max_tokens: int = 300) -> str:
+    """Compact text summary of parsed resume data (as returned by /parse-resume)."""
+    if not isinstance(resume, dict):
+        return truncate_tokens(str(resume or ""), max_tokens)
+    data = resume.get("data") if isinstance(resume.get("data"), dict) else resume
+
+    lines = []
+    for key, label in (("fullName", "Name"), ("location", "Location"), ("summary", "Summary")):
+        value = data.get(key)
+        if isinstance(value, str) and value.strip():
+            lines.append(f"{label}: {truncate_tokens(value.strip(), 60)}")
+    skills = [str(s) for s in data.get("skills") or [] if s]
+    if skills:
+        lines.append(f"Skills: {', '.join(skills[:25])}")
+    roles = []
+    for entry in data.get("experience") or []:
+        if isinstance(entry, dict):
+            role = " at ".join(
+                str(entry[k]) for k in ("jobTitle", "company") if entry.get(k)
+            )
+            if entry.get("duration"):
+                role += f" ({entry['duration']})"
+            if role:
+                roles.append(role)
+        elif entry:
+            roles.append(truncate_tokens(str(entry), 30))
+    if roles:
+        lines.append(f"Experience: {'; '.join(roles[:6])}")
+    schools = []
+    for entry in data.get("education") or []:
+        if isinstance(entry, dict):
+            school = ", ".join(str(entry[k]) for k in ("degree", "field", "school") if entry.get(k))
+            if school:
+                schools.append(school)
+        elif entry:
+            schools.append(truncate_tokens(str(entry), 30))
+    if schools:
+        lines.append(f"Education: {'; '.join(schools[:3])}")
+    for key, label in (("projects", "Projects"), ("certifications", "Certifications")):
+        items = [truncate_tokens(str(item), 20) for item in data.get(key) or [] if item]
+        if items:
+            lines.append(f"{label}: {'; '.join(items[:5])}")
+    if not lines:
+        lines.append(json.dumps(data, default=str))
+    return truncate_tokens("\n".join(lines), max_tokens)
+
+
+def format_turns(turns: List[Dict[str, str]]) -> str:
+    names = {"user": "User", "assistant": "Advisor"}
+    return "\n".join(f"{names.get(t['role'], t['role'])}: {t['text']}" for t in turns)
+
+
+class ChatSession:
+    def __init__(self, session_id: str, resume_summary: str = "", summary: str = ""):
+        self.id = session_id
+        self.resume_summary = resume_summary
+        self.summary = summary
+        self.turns: List[Dict[str, str]] = []
+        self.folded_turns = 0
+        self.summary_version = 0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "resume_summary": self.resume_summary,
+            "summary": self.summary,
+            "turns": self.turns,
+            "folded_turns": self.folded_turns,
+            "summary_version": self.summary_version,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChatSession":
+        session = cls(data["id"], data.get("resume_summary", ""), data.get("summary", ""))
+        session.turns = list(data.get("turns") or [])
+        session.folded_turns = int(data.get("folded_turns", 0))
+        session.summary_version = int(data.get("summary_version", 0))
+        session.created_at = float(data.get("created_at", session.created_at))
+        session.updated_at = float(data.get("updated_at", session.updated_at))
+        return session
+
+
+class ChatSessionStore:
+    """LRU + TTL store of chat sessions with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 7200.0,
+        resume_tokens: int = 300,
+        summary_tokens: int = 250,
+        history_tokens: int = 600,
+        summarizer: Optional[Summarizer] = None,
+        sqlite_path: Optional[str] = None,
+        shared: bool = False,
+    ):
+        self.max_sessions = max(1, int(max_sessions))
+        self.ttl_seconds = float(ttl_seconds)
+        self.resume_tokens = int(resume_tokens)
+        self.summary_tokens = int(summary_tokens)
+        self.history_tokens = int(history_tokens)
+        self.summarizer = summarizer
+        # Several processes share the SQLite tier: always read sessions from it.
+        self.shared = bool(shared and sqlite_path)
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tasks: set = set()
+        self._stats = {"created": 0, "expired": 0, "evicted": 0, "folds": 0, "summaries": 0,
+                       "summary_failures": 0}
+        self.sqlite_path = sqlite_path
+        self._db = None
+        if sqlite_path:
+            self._connect()
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=self._connect)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS chat_sessions ("
+                "id TEXT PRIMARY KEY, record TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    # ── Storage ──
+
+    def _connect(self) -> None:
+        # Called again in forked workers, which must not reuse the parent's connection.
+        self._db = sqlite3.connect(self.sqlite_path, timeout=10.0, check_same_thread=False)
+
+    def _expired(self, session: ChatSession, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - session.updated_at > self.ttl_seconds
+
+    def _remember(self, session: ChatSession) -> None:
+        self._sessions[session.id] = session
+        self._sessions.move_to_end(session.id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self._stats["evicted"] += 1
+
+    def save(self, session: ChatSession) -> None:
+        session.updated_at = time.time()
+        with self._lock:
+            self._remember(session)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO chat_sessions (id, record, updated_at) VALUES (?, ?, ?)",
+                    (session.id, json.dumps(session.to_dict()), session.updated_at),
+                )
+                self._db.commit()
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        now = time.time()
+        with self._lock:
+            session = None if self.shared else self._sessions.get(session_id)
+            if session is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT record FROM chat_sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+                if row:
+                    session = ChatSession.from_dict(json.loads(row[0]))
+                    self._remember(session)
+            if session is None:
+                return None
+            if self._expired(session, now):
+                self._sessions.pop(session_id, None)
+                if self._db is not None:
+                    self._db.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
+                    self._db.commit()
+                self._stats["expired"] += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            found = self._sessions.pop(session_id, None) is not None
+            if self._db is not None:
+                found = self._db.execute(
+                    "DELETE FROM chat_sessions WHERE id = ?", (session_id,)
+                ).rowcount > 0 or found
+                self._db.commit()
+            return found
+
+    def open(
+        self, session_id: Optional[str] = None, resume: Any = None, context: Optional[str] = None
+    ) -> ChatSession:
+        """Return the session, creating it (with a resume summary) when new or expired.
+
+        Without a session_id the session is a one-off: it is not counted or
+        stored, and the caller must not record() it. Resume data sent with a
+        later message replaces the stored summary; a legacy free-form context
+        string seeds the rolling summary.
+        """
+        session = self.get(session_id) if session_id else None
+        if session is None:
+            session = ChatSession(session_id or "")
+            if session_id:
+                self._stats["created"] += 1
+            if context:
+                session.summary = truncate_tokens(context.strip(), self.summary_tokens, keep_tail=True)
+        if resume:
+            session.resume_summary = summarize_resume(resume, self.resume_tokens)
+        return session
+
+    # ── Prompt building ──
+
+    def render(self, session: ChatSession, message: str) -> str:
+        """User prompt for the next message: rolling summary, recent turns, the whole message."""
+        parts = []
+        if session.summary:
+            parts.append(f"Summary of the earlier conversation:\n{session.summary}")
+        if session.turns:
+            parts.append(f"Recent conversation:\n{format_turns(self.recent(session))}")
+        parts.append(f"User's message: {message}")
+        return "\n\n".join(parts)
+
+    def recent(self, session: ChatSession, budget: Optional[int] = None) -> List[Dict[str, str]]:
+        """Newest turns that fit the history budget (each clipped to half of it)."""
+        budget = self.history_tokens if budget is None else budget
+        kept: List[Dict[str, str]] = []
+        used = 0
+        for turn in reversed(session.turns):
+            text = truncate_tokens(turn["text"], self.history_tokens // 2)
+            cost = estimate_tokens(text) + 2
+            if kept and used + cost > budget:
+                break
+            kept.append({"role": turn["role"], "text": text})
+            used += cost
+        kept.reverse()
+        return kept
+
+    def system_prompt(self, session: ChatSession, base: str) -> str:
+        """Fixed per-session system prompt: instructions plus the resume summary."""
+        if not session.resume_summary:
+            return base
+        return f"{base}\n\nThe user's resume:\n{session.resume_summary}"
+
+    # ── Compaction ──
+
+    def record(self, session: ChatSession, message: str, reply: str) -> None:
+        """Append a finished exchange, folding turns that fell out of the history budget."""
+        session.turns.append({"role": "user", "text": message})
+        session.turns.append({"role": "assistant", "text": reply})
+        folded: List[Dict[str, str]] = []
+        if len(self.recent(session)) < len(session.turns):
+            # Fold down to half the budget so a summary is written every few exchanges, not every one.
+            keep = len(self.recent(session, self.history_tokens // 2))
+            folded = session.turns[:-keep]
+        if folded:
+            session.turns = session.turns[len(folded):]
+            session.folded_turns += len(folded)
+            previous = session.summary
+            session.summary = self._extractive_summary(previous, folded)
+            session.summary_version += 1
+            self._stats["folds"] += 1
+            if self.summarizer is not None:
+                self._refine(session, previous, folded)
+        self.save(session)
+
+    def _extractive_summary(self, previous: str, turns: List[Dict[str, str]]) -> str:
+        lines = [previous] if previous else []
+        for turn in turns:
+            text = truncate_tokens(" ".join(turn["text"].split()), 40)
+            lines.append(f"{'User asked' if turn['role'] == 'user' else 'Advisor said'}: {text}")
+        return truncate_tokens("\n".join(lines), self.summary_tokens, keep_tail=True)
+
+    def _refine(self, session: ChatSession, previous: str, folded: List[Dict[str, str]]) -> None:
+        """Replace the extractive fold with a model-written summary, off the request path."""
+        version = session.summary_version
+
+        async def run():
+            try:
+                summary = (await self.summarizer(previous, folded)).strip()
+            except Exception as exc:
+                self._stats["summary_failures"] += 1
+                logger.warning(f"Chat summary for session {session.id} failed: {exc}")
+                return
+            # Another process may have moved the session on meanwhile.
+            current = (self.get(session.id) if self.shared else session) or session
+            if summary and current.summary_version == version:
+                current.summary = truncate_tokens(summary, self.summary_tokens, keep_tail=True)
+                self._stats["summaries"] += 1
+                self.save(current)
+
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "sessions": len(self._sessions),
+            "persistent": self._db is not None,
+            "summaries_pending": len(self._tasks),
+            "budget_tokens": {
+                "resume": self.resume_tokens,
+                "summary": self.summary_tokens,
+                "history": self.history_tokens,
+            },
+        }
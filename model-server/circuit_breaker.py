@@ -0,0 +1,91 @@
+"""
+ResuMate Circuit Breaker
+────────────────────────
+Stops sending requests to Ollama after repeated failures so callers fall
+back to local parsing/heuristics immediately instead of waiting for a
+connect attempt or timeout. After a cool-down one probe request is let
+through (half-open); its outcome closes or re-opens the circuit.
+"""
+
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Ollama while the circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, enabled: bool = True):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.enabled = enabled
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_started_at = 0.0
+        return self._state
+
+    def check(self, probe: bool = True) -> None:
+        """Raise CircuitOpenError unless a request may go upstream now.
+
+        Call it once per upstream call. With probe=False (checks ahead of
+        the call, e.g. model discovery) a half-open circuit's probe slot is
+        left for the call itself.
+        """
+        if not self.enabled:
+            return
+        state = self.state
+        if state == CLOSED:
+            return
+        now = time.monotonic()
+        # Half-open: let a single probe through (and another if it never reported back).
+        if state == HALF_OPEN and (
+            not self._probe_started_at or now - self._probe_started_at >= self.reset_timeout
+        ):
+            if probe:
+                self._probe_started_at = now
+            return
+        self.rejected += 1
+        retry_in = max(0, round(self.reset_timeout - (now - self._opened_at)))
+        raise CircuitOpenError(
+            f"Ollama is unavailable (circuit open after {self._failures} consecutive failures); "
+            f"retrying upstream in ~{retry_in}s"
+        )
+
+    def record_success(self) -> None:
+        self._state = CLOSED
+        self._failures = 0
+        self._probe_started_at = 0.0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.times_opened += 1
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_s": self.reset_timeout,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
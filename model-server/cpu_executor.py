@@ -0,0 +1,120 @@
+"""
+ResuMate CPU Executor
+─────────────────────
+Keeps CPU-bound work (regex resume parsing, skill/experience
+post-processing) off the asyncio event loop by running it in a thread or
+process pool, and measures event-loop lag so any remaining blocking shows
+up in metrics.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+KINDS = ("thread", "process", "inline")
+
+
+class CPUExecutor:
+    """Run blocking functions in a pool; kind "inline" runs them on the loop (no pool)."""
+
+    def __init__(self, kind: str = "thread", workers: int = 2):
+        self.kind = kind if kind in KINDS else "thread"
+        self.workers = max(1, int(workers))
+        self._pool: Optional[Executor] = None
+        self.calls = 0
+        self.busy = 0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    def _executor(self) -> Executor:
+        # Created on first use, so importing the server never forks worker processes.
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cpu")
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) off the event loop and return its result.
+
+        With kind "process", fn and its arguments must be picklable
+        (module-level functions and plain data).
+        """
+        self.calls += 1
+        self.busy += 1
+        start_time = time.perf_counter()
+        try:
+            if self.kind == "inline":
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor(), functools.partial(fn, *args))
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.busy -= 1
+            self.run_total += elapsed
+            self.run_max = max(self.run_max, elapsed)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "calls": self.calls,
+            "busy": self.busy,
+            "avg_run_s": round(self.run_total / self.calls, 4) if self.calls else 0.0,
+            "max_run_s": round(self.run_max, 4),
+        }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task (its scheduling lag)."""
+
+    def __init__(self, interval: float = 0.25, on_sample: Optional[Callable[[float], None]] = None):
+        self.interval = float(interval)
+        self.on_sample = on_sample
+        self.last = 0.0
+        self.max = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.last = lag
+            self.max = max(self.max, lag)
+            self.samples += 1
+            if self.on_sample is not None:
+                self.on_sample(lag)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval_s": self.interval,
+            "last_s": round(self.last, 4),
+            "max_s": round(self.max, 4),
+            "samples": self.samples,
+        }
+
+
+def default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
@@ -0,0 +1,151 @@
+"""
+ResuMate Request Hedging
+────────────────────────
+Cuts tail latency for interactive tasks. A call that has not finished by
+the task's observed latency percentile is duplicated to a second target
+(the fallback model or another backend); the first valid result wins and
+the other call is cancelled. Because the hedge only fires for the slowest
+few percent of calls, and a rolling cap limits how many calls may be
+hedged, the extra upstream cost stays small.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+OUTCOMES = ("not_hedged", "primary_won", "hedge_won", "failed", "skipped")
+
+
+class Hedger:
+    """Per-task hedging delays learned from primary-call latencies."""
+
+    def __init__(
+        self,
+        percentile: float = 90.0,
+        default_delay: float = 10.0,
+        min_delay: float = 1.0,
+        max_rate: float = 0.25,
+        window: int = 200,
+        min_samples: int = 10,
+    ):
+        self.percentile = float(percentile)
+        self.default_delay = float(default_delay)
+        self.min_delay = float(min_delay)
+        # Upper bound on the fraction of recent calls that may be hedged.
+        self.max_rate = float(max_rate)
+        self.window = int(window)
+        self.min_samples = int(min_samples)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._recent: Deque[bool] = deque(maxlen=self.window)
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, task: str, seconds: float) -> None:
+        self._latencies.setdefault(task, deque(maxlen=self.window)).append(seconds)
+
+    def delay(self, task: str) -> float:
+        """Seconds to wait for the primary before hedging."""
+        samples = self._latencies.get(task)
+        if not samples or len(samples) < self.min_samples:
+            return max(self.min_delay, self.default_delay)
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, max(0, math.ceil(self.percentile / 100.0 * len(ordered)) - 1))
+        return max(self.min_delay, ordered[idx])
+
+    def _rate_exceeded(self) -> bool:
+        return bool(self._recent) and sum(self._recent) / len(self._recent) >= self.max_rate
+
+    def _count(self, task: str, outcome: str) -> None:
+        self._stats.setdefault(task, {name: 0 for name in OUTCOMES})[outcome] += 1
+        self._recent.append(outcome in ("primary_won", "hedge_won", "failed"))
+
+    async def run(
+        self,
+        task: str,
+        primary: Callable[[], Awaitable[Any]],
+        make_hedge: Callable[[], Optional[Callable[[], Awaitable[Any]]]],
+        valid: Callable[[Any], bool],
+        on_outcome: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Any, str]:
+        """Run primary(), hedging with make_hedge()'s call once the delay has passed.
+
+        make_hedge is asked only when a hedge is due and may return None when
+        there is nothing to hedge to. Returns (result, winner) where winner is
+        "primary" or "hedge". When neither result is valid the primary's
+        result (or error) is returned so the caller's retry logic applies.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        primary_task = asyncio.ensure_future(primary())
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self.delay(task))
+        except asyncio.CancelledError:
+            primary_task.cancel()
+            raise
+
+        def finish(outcome: str) -> None:
+            self._count(task, outcome)
+            if on_outcome is not None:
+                on_outcome(outcome)
+
+        hedge = None
+        if not done:
+            if self._rate_exceeded():
+                finish("skipped")
+            else:
+                hedge = make_hedge()
+                if hedge is None:
+                    finish("skipped")
+        if hedge is None:
+            result = await primary_task
+            self.record(task, loop.time() - started)
+            if done:
+                finish("not_hedged")
+            return result, "primary"
+
+        hedge_task = asyncio.ensure_future(hedge())
+        pending = {primary_task, hedge_task}
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    if future.cancelled() or future.exception() is not None:
+                        continue
+                    if not valid(future.result()):
+                        continue
+                    if future is primary_task:
+                        self.record(task, loop.time() - started)
+                        finish("primary_won")
+                        return future.result(), "primary"
+                    finish("hedge_won")
+                    return future.result(), "hedge"
+        finally:
+            for future in (primary_task, hedge_task):
+                if not future.done():
+                    future.cancel()
+            await asyncio.gather(primary_task, hedge_task, return_exceptions=True)
+
+        finish("failed")
+        for future, winner in ((primary_task, "primary"), (hedge_task, "hedge")):
+            if not future.cancelled() and future.exception() is None:
+                return future.result(), winner
+        return await primary_task
+
+    def stats(self) -> Dict[str, Any]:
+        tasks = {}
+        for task, counts in self._stats.items():
+            calls = sum(counts.values())
+            hedged = counts["primary_won"] + counts["hedge_won"] + counts["failed"]
+            tasks[task] = {
+                **counts,
+                "calls": calls,
+                "hedge_rate": round(hedged / calls, 4) if calls else 0.0,
+                "hedge_win_rate": round(counts["hedge_won"] / hedged, 4) if hedged else None,
+                "delay_s": round(self.delay(task), 3),
+            }
+        return {
+            "percentile": self.percentile,
+            "max_rate": self.max_rate,
+            "recent_hedge_rate": round(sum(self._recent) / len(self._recent), 4) if self._recent else 0.0,
+            "tasks": tasks,
+        }
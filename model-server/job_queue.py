@@ -0,0 +1,425 @@
+"""
+ResuMate Job Queue
+──────────────────
+Asynchronous execution of AI tasks: a job is accepted into a bounded queue
+and answered with an id straight away, a fixed pool of workers runs it, and
+the result is fetched with GET (optionally long-polling) or pushed to a
+webhook. With a SQLite path, jobs are persisted so queued and interrupted
+jobs are picked up again after a restart, and several server processes
+sharing the file can answer for each other's jobs.
+"""
+
+import asyncio
+import ipaddress
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from scheduler import QueueFullError
+
+logger = logging.getLogger("model-server")
+
+FINISHED = ("succeeded", "failed")
+
+
+def is_internal_address(address: str) -> bool:
+    """True for loopback, private (RFC 1918), link-local (incl. cloud metadata),
+    shared, reserved, multicast and unspecified addresses."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return not ip.is_global or ip.is_multicast
+
+
+def resolve_host(host: str) -> List[str]:
+    """Every address host resolves to (just host itself for an IP literal)."""
+    try:
+        return [str(ipaddress.ip_address(host.strip("[]")))]
+    except ValueError:
+        pass
+    try:
+        return sorted({info[4][0] for info in socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)})
+    except (socket.gaierror, UnicodeError) as exc:
+        raise ValueError(f"webhookUrl host {host} cannot be resolved") from exc
+
+
+class JobQueue:
+    """Bounded in-process job queue with optional SQLite persistence."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[dict], Awaitable[Any]]],
+        workers: int = 1,
+        max_queued: int = 100,
+        retention_seconds: float = 3600.0,
+        sqlite_path: Optional[str] = None,
+        webhook_hosts: Optional[List[str]] = None,
+        webhook_timeout: float = 10.0,
+        webhook_attempts: int = 3,
+        busy_retries: int = 20,
+    ):
+        self.handlers = handlers
+        self.workers = max(1, int(workers))
+        self.max_queued = max(1, int(max_queued))
+        self.retention_seconds = float(retention_seconds)
+        # Webhooks may only target these hostnames. Empty = any host that resolves
+        # to public addresses only (no loopback, private or link-local targets).
+        self.webhook_hosts = {host.lower() for host in webhook_hosts or []}
+        self.webhook_timeout = float(webhook_timeout)
+        self.webhook_attempts = max(1, int(webhook_attempts))
+        # How often a job waits out a 429 from the upstream scheduler before failing.
+        self.busy_retries = max(0, int(busy_retries))
+
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._pending: deque = deque()
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._webhook_tasks: set = set()
+        self._stats = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "recovered": 0,
+                       "run_total": 0.0, "webhooks_delivered": 0, "webhooks_failed": 0}
+
+        self.sqlite_path = sqlite_path
+        self._db = None
+        if sqlite_path:
+            self._connect()
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=self._connect)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, task TEXT NOT NULL, status TEXT NOT NULL, "
+                "record TEXT NOT NULL, created_at REAL NOT NULL, owner INTEGER)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+            self._db.commit()
+
+    # ── Persistence ──
+
+    def _connect(self) -> None:
+        # Called again in forked workers, which must not reuse the parent's connection.
+        self._db = sqlite3.connect(self.sqlite_path, timeout=10.0, check_same_thread=False)
+
+    def _save(self, job: Dict[str, Any]) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs (id, task, status, record, created_at, owner) VALUES (?, ?, ?, ?, ?, ?)",
+            (job["id"], job["task"], job["status"], json.dumps(job, default=str), job["created_at"], os.getpid()),
+        )
+        self._db.commit()
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job another process owns, read from the shared store."""
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT record FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _alive(pid: Optional[int]) -> bool:
+        if not pid or pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _restore(self) -> None:
+        """Re-queue unfinished jobs whose owning process is gone.
+
+        Jobs are claimed with a conditional UPDATE, so when several worker
+        processes start together each orphaned job is taken by exactly one.
+        """
+        if self._db is None:
+            return
+        cutoff = time.time() - self.retention_seconds
+        self._db.execute("DELETE FROM jobs WHERE status IN (?, ?) AND created_at < ?", (*FINISHED, cutoff))
+        rows = self._db.execute(
+            "SELECT id, record, owner FROM jobs WHERE status NOT IN (?, ?) ORDER BY created_at", FINISHED
+        ).fetchall()
+        for job_id, record, owner in rows:
+            if self._alive(owner):
+                continue
+            claimed = self._db.execute(
+                "UPDATE jobs SET owner = ? WHERE id = ? AND owner IS ?", (os.getpid(), job_id, owner)
+            ).rowcount
+            if not claimed:
+                continue
+            job = json.loads(record)
+            if job["status"] == "running":
+                self._stats["recovered"] += 1
+            job.update(status="queued", started_at=None)
+            self.jobs[job_id] = job
+            self._pending.append(job_id)
+        self._db.commit()
+        if self._pending:
+            logger.info(f"Restored {len(self._pending)} unfinished job(s) from the job store")
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job["status"] in FINISHED and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+            self._done_events.pop(job_id, None)
+        if expired and self._db is not None:
+            self._db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in expired])
+            self._db.commit()
+
+    # ── Submission and lookup ──
+
+    def queued(self) -> int:
+        return len(self._pending)
+
+    def running(self) -> int:
+        return sum(1 for job in self.jobs.values() if job["status"] == "running")
+
+    def _retry_after(self) -> int:
+        finished = self._stats["succeeded"] + self._stats["failed"]
+        avg_run = self._stats["run_total"] / finished if finished else 30.0
+        return max(1, math.ceil(avg_run * (self.queued() + self.running()) / self.workers))
+
+    def validate_webhook(self, url: str, resolve: bool = True) -> None:
+        """Raise ValueError unless url is an http(s) URL to an allowed host.
+
+        Without an allow-list the host must not be (or, with resolve, resolve
+        to) an internal address, so jobs cannot be used to reach the metadata
+        service or other hosts on the server's network. resolve=False skips
+        the DNS lookup and only checks IP literals.
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError("webhookUrl must be an absolute http(s) URL")
+        host = parsed.hostname.lower()
+        if self.webhook_hosts:
+            if host not in self.webhook_hosts:
+                raise ValueError(f"webhookUrl host {parsed.hostname} is not allowed")
+            return
+        try:
+            addresses = [str(ipaddress.ip_address(host))]
+        except ValueError:
+            if not resolve:
+                return
+            addresses = resolve_host(host)
+        if any(is_internal_address(address) for address in addresses):
+            raise ValueError(
+                f"webhookUrl host {parsed.hostname} is an internal address; "
+                "list trusted internal hosts in JOBS_WEBHOOK_HOSTS"
+            )
+
+    async def check_webhook(self, url: Optional[str]) -> None:
+        """validate_webhook with the DNS lookup run off the event loop."""
+        if url:
+            await asyncio.get_running_loop().run_in_executor(None, self.validate_webhook, url)
+
+    def submit(self, task: str, payload: dict, webhook_url: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a job and return its record. Raises KeyError for unknown tasks,
+        ValueError for a bad webhook and QueueFullError when the queue is full."""
+        if task not in self.handlers:
+            raise KeyError(task)
+        if webhook_url:
+            # Hostnames are resolved by check_webhook (before submit) and again at delivery.
+            self.validate_webhook(webhook_url, resolve=False)
+        self._prune()
+        if self.queued() >= self.max_queued:
+            self._stats["rejected"] += 1
+            raise QueueFullError("jobs", self._retry_after())
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "task": task,
+            "status": "queued",
+            "payload": payload,
+            "webhook_url": webhook_url,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "attempts": 0,
+            "result": None,
+            "error": None,
+            "webhook": None,
+        }
+        self.jobs[job["id"]] = job
+        self._save(job)
+        self._pending.append(job["id"])
+        self._stats["submitted"] += 1
+        self._notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.get(job_id) or self._load(job_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based place in the queue, or None when the job is not waiting."""
+        try:
+            return self._pending.index(job_id) + 1
+        except ValueError:
+            return None
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Long-poll: return the job once it finishes or timeout seconds pass."""
+        job = self.get(job_id)
+        if job is None or job["status"] in FINISHED or timeout <= 0:
+            return job
+        if job_id not in self.jobs:
+            # Owned by another process: poll the shared store.
+            deadline = time.monotonic() + timeout
+            while job is not None and job["status"] not in FINISHED and time.monotonic() < deadline:
+                await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+                job = self._load(job_id)
+            return job
+        event = self._done_events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.get(job_id)
+
+    # ── Workers ──
+
+    def _notify(self) -> None:
+        if self._wakeup is None:
+            return
+
+        async def wake():
+            async with self._wakeup:
+                self._wakeup.notify()
+
+        asyncio.ensure_future(wake())
+
+    async def _next_job(self) -> Dict[str, Any]:
+        async with self._wakeup:
+            while not self._pending:
+                await self._wakeup.wait()
+            return self.jobs[self._pending.popleft()]
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        handler = self.handlers[job["task"]]
+        job.update(status="running", started_at=time.time())
+        self._save(job)
+        start_time = time.perf_counter()
+        try:
+            while True:
+                job["attempts"] += 1
+                try:
+                    job["result"] = await handler(job["payload"])
+                    job["status"] = "succeeded"
+                    break
+                except Exception as exc:
+                    status_code = getattr(exc, "status_code", 500)
+                    if status_code == 429 and job["attempts"] <= self.busy_retries:
+                        # Upstream lanes are full: the job queue is the buffer, so wait and retry.
+                        retry_after = (getattr(exc, "headers", None) or {}).get("Retry-After", "5")
+                        await asyncio.sleep(float(retry_after))
+                        continue
+                    job["status"] = "failed"
+                    job["error"] = {"status_code": status_code, "detail": getattr(exc, "detail", None) or str(exc)}
+                    logger.warning(f"Job {job['id']} ({job['task']}) failed: {job['error']['detail']}")
+                    break
+        finally:
+            if job["status"] == "running":  # cancelled during shutdown: rerun after restart
+                job["status"] = "queued"
+            else:
+                job["finished_at"] = time.time()
+                self._stats[job["status"]] += 1
+                self._stats["run_total"] += time.perf_counter() - start_time
+            self._save(job)
+
+        event = self._done_events.pop(job["id"], None)
+        if event is not None:
+            event.set()
+        if job["webhook_url"]:
+            task = asyncio.ensure_future(self._deliver(job))
+            self._webhook_tasks.add(task)
+            task.add_done_callback(self._webhook_tasks.discard)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._next_job()
+            await self._execute(job)
+
+    async def _deliver(self, job: Dict[str, Any]) -> None:
+        """POST the finished job to its webhook, retrying with backoff."""
+        body = self.view(job)
+        error = None
+        try:
+            # Re-checked at delivery: the host's DNS may have changed since submit.
+            await self.check_webhook(job["webhook_url"])
+            attempts = self.webhook_attempts
+        except ValueError as exc:
+            error, attempts = str(exc), 0
+        for attempt in range(1, attempts + 1):
+            try:
+                async with httpx.AsyncClient(timeout=self.webhook_timeout) as client:
+                    resp = await client.post(job["webhook_url"], json=body)
+                    resp.raise_for_status()
+                job["webhook"] = {"delivered": True, "attempts": attempt, "status_code": resp.status_code}
+                self._stats["webhooks_delivered"] += 1
+                break
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+                if attempt < self.webhook_attempts:
+                    await asyncio.sleep(2 ** attempt)
+        else:
+            job["webhook"] = {"delivered": False, "attempts": attempts, "error": error}
+            self._stats["webhooks_failed"] += 1
+            logger.warning(f"Webhook for job {job['id']} failed: {error}")
+        self._save(job)
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Condition()
+        self._restore()
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.ensure_future(self._worker()))
+
+    async def stop(self) -> None:
+        for task in [*self._tasks, *self._webhook_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._webhook_tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # ── Reporting ──
+
+    def view(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Client-facing job record (without the request payload)."""
+        view = {key: value for key, value in job.items() if key not in ("payload", "webhook_url")}
+        if job["status"] == "queued":
+            view["queue_position"] = self.position(job["id"])
+        if job["started_at"] and job["finished_at"]:
+            view["run_s"] = round(job["finished_at"] - job["started_at"], 3)
+        return view
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {key: value for key, value in self._stats.items() if key != "run_total"}
+        finished = self._stats["succeeded"] + self._stats["failed"]
+        return {
+            **stats,
+            "queued": self.queued(),
+            "running": self.running(),
+            "retained": len(self.jobs),
+            "max_queued": self.max_queued,
+            "workers": self.workers,
+            "persistent": self._db is not None,
+            "avg_run_s": round(self._stats["run_total"] / finished, 3) if finished else None,
+        }
@@ -0,0 +1,179 @@
+"""
+ResuMate JSON Extraction
+────────────────────────
+Pulls the first JSON value out of free-form model output in a single pass:
+a string-aware bracket scanner finds each candidate span and
+JSONDecoder.raw_decode parses it. Spans that don't decode get a
+string-aware cleanup (trailing commas, comments, single-quoted strings,
+Python literals), and objects cut off mid-generation can be salvaged down
+to their complete top-level members.
+"""
+
+import json
+from typing import Any, NamedTuple, Optional, Tuple
+
+from streaming_json import StreamingJSONParser
+
+_decoder = json.JSONDecoder()
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+# Upper bound on candidate spans examined, so adversarial text stays linear.
+MAX_CANDIDATES = 16
+
+
+class Extraction(NamedTuple):
+    value: Any
+    text: str
+    method: str  # "direct", "scan", "repaired" or "salvaged"
+
+
+def _scan_span(text: str, start: int) -> Tuple[int, bool]:
+    """From an opening bracket, return (end index, closed) of its balanced span."""
+    depth = 0
+    in_string = False
+    quote = ""
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == quote:
+                in_string = False
+        elif ch in "\"'":
+            # Single quotes only open a string at a value/key position (not in prose like "don't").
+            if ch == '"' or text[i - 1] in "{[,: \n\t":
+                in_string = True
+                quote = ch
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1, True
+    return len(text), False
+
+
+def normalize_json(span: str) -> str:
+    """String-aware cleanup of common small-model JSON mistakes.
+
+    Drops trailing commas and // or # comments, turns single-quoted strings
+    into double-quoted ones and True/False/None into JSON literals, without
+    touching the contents of strings.
+    """
+    out = []
+    last = ""  # last non-whitespace character emitted
+    i = 0
+    n = len(span)
+    while i < n:
+        ch = span[i]
+        if ch == '"' or (ch == "'" and last in ("", "{", "[", ",", ":")):
+            quote = ch
+            j = i + 1
+            buf = ['"']
+            while j < n and span[j] != quote:
+                if span[j] == "\\" and j + 1 < n:
+                    # \' is not a valid JSON escape
+                    buf.append("'" if span[j + 1] == "'" else span[j:j + 2])
+                    j += 2
+                    continue
+                buf.append('\\"' if span[j] == '"' and quote == "'" else span[j])
+                j += 1
+            buf.append('"')
+            out.append("".join(buf))
+            last = '"'
+            i = j + 1
+        elif ch == "/" and span.startswith("//", i) or ch == "#":
+            newline = span.find("\n", i)
+            i = n if newline < 0 else newline
+        elif ch == ",":
+            j = i + 1
+            while j < n and span[j] in " \t\r\n":
+                j += 1
+            if j < n and span[j] in "}]":
+                i = j
+            else:
+                out.append(ch)
+                last = ch
+                i += 1
+        elif ch.isalpha():
+            j = i
+            while j < n and (span[j].isalnum() or span[j] == "_"):
+                j += 1
+            word = span[i:j]
+            out.append(_PY_LITERALS.get(word, word))
+            last = word[-1]
+            i = j
+        else:
+            out.append(ch)
+            if not ch.isspace():
+                last = ch
+            i += 1
+    return "".join(out)
+
+
+def _decode(span: str) -> Optional[Any]:
+    try:
+        value, end = _decoder.raw_decode(span)
+    except ValueError:
+        return None
+    return value if not span[end:].strip() else None
+
+
+def salvage_object(span: str) -> Optional[dict]:
+    """Recover the complete top-level members of a truncated JSON object."""
+    parser = StreamingJSONParser()
+    parser.feed(span)
+    if not parser.fields:
+        parser = StreamingJSONParser()
+        parser.feed(normalize_json(span))
+    return dict(parser.fields) or None
+
+
+def extract_json(text: str, salvage: bool = True) -> Optional[Extraction]:
+    """Find the first complete top-level JSON object or array in text."""
+    if not text:
+        return None
+    stripped = text.strip()
+    try:
+        value, end = _decoder.raw_decode(stripped)
+        if not stripped[end:].strip():
+            return Extraction(value, stripped, "direct")
+    except ValueError:
+        pass
+
+    pos = 0
+    salvage_tried = not salvage
+    for _ in range(MAX_CANDIDATES):
+        starts = [idx for idx in (text.find("{", pos), text.find("[", pos)) if idx >= 0]
+        if not starts:
+            break
+        start = min(starts)
+        end, closed = _scan_span(text, start)
+        span = text[start:end]
+        if closed:
+            try:
+                value, _ = _decoder.raw_decode(span)
+                return Extraction(value, span, "scan")
+            except ValueError:
+                pass
+            repaired = normalize_json(span)
+            value = _decode(repaired)
+            if value is not None:
+                return Extraction(value, repaired, "repaired")
+            # Not JSON (e.g. "{name}" in prose): look inside it, then past it.
+            pos = start + 1
+        else:
+            # Runs to the end of the text: most likely cut off mid-generation.
+            # Later candidates lie inside this span, so salvage only the outermost.
+            if not salvage_tried and text[start] == "{":
+                salvage_tried = True
+                fields = salvage_object(span)
+                if fields:
+                    return Extraction(fields, json.dumps(fields), "salvaged")
+            if span[1:].lstrip()[:1] in ('"', "'"):
+                # A truncated object, not a stray brace: its nested values are not the answer.
+                return None
+            pos = start + 1
+    return None
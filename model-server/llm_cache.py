@@ -0,0 +1,151 @@
+"""
+ResuMate LLM Response Cache
+───────────────────────────
+In-memory LRU + TTL cache for deterministic (low-temperature) Ollama tasks,
+with an optional on-disk SQLite tier so entries survive restarts.
+
+Keys are derived from (model, normalized prompt, temperature, options), so
+the same resume scored against the same job twice never reaches Ollama twice.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so cosmetic prompt differences share a cache entry."""
+    return re.sub(r"\s+", " ", prompt or "").strip()
+
+
+def make_cache_key(model: str, prompt: str, temperature: float, options: Optional[dict] = None) -> str:
+    """Build a stable hash key for a model call."""
+    payload = json.dumps(
+        [model, normalize_prompt(prompt), round(float(temperature), 4), options or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LRU + TTL cache with an optional SQLite second tier."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0, sqlite_path: Optional[str] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        self.sqlite_path = sqlite_path
+        if sqlite_path:
+            self._connect()
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=self._connect)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created_at)")
+            self._db.commit()
+
+    def _connect(self) -> None:
+        # Called again in forked workers, which must not reuse the parent's connection.
+        self._db = sqlite3.connect(self.sqlite_path, timeout=10.0, check_same_thread=False)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, raw_value: str, created_at: float) -> None:
+        # Values are kept serialized so callers can mutate what they get back.
+        self._entries[key] = (raw_value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                raw_value, created_at = entry
+                if not self._is_expired(created_at, now):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return json.loads(raw_value)
+                del self._entries[key]
+                self._stats["expirations"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    raw_value, created_at = row
+                    if not self._is_expired(created_at, now):
+                        self._remember(key, raw_value, created_at)
+                        self._stats["hits"] += 1
+                        self._stats["disk_hits"] += 1
+                        return json.loads(raw_value)
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._stats["expirations"] += 1
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in both tiers."""
+        now = time.time()
+        raw_value = json.dumps(value, default=str)
+        with self._lock:
+            self._remember(key, raw_value, now)
+            self._stats["sets"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, raw_value, now),
+                )
+                if self.ttl_seconds > 0:
+                    self._db.execute(
+                        "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                    )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss counters and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": self._db is not None,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,188 @@
+"""
+ResuMate Model Residency
+────────────────────────
+Keeps the Ollama model loaded and avoids needless model swaps. At startup
+the chosen model is preloaded on every backend with a one-token
+generation (the server reports not-ready until that finishes), an optional
+pinger keeps it warm while traffic is idle, and when two models cannot
+share memory the resident one is kept for a minimum dwell time instead of
+alternating with every change in model discovery. Two models are only
+loaded side by side when they are known to fit: with no memory budget
+configured, the "auto" policy treats them as exclusive.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from ollama_pool import OllamaPool
+
+logger = logging.getLogger("model-server")
+
+POLICIES = ("auto", "single", "multi")
+
+
+class ModelResidency:
+    def __init__(
+        self,
+        pool: OllamaPool,
+        policy: str = "auto",
+        memory_budget_gb: float = 0.0,
+        min_residency_seconds: float = 300.0,
+        keep_alive: Union[str, int] = "30m",
+        warm_num_ctx: int = 2048,
+    ):
+        self.pool = pool
+        self.policy = policy if policy in POLICIES else "auto"
+        self.memory_budget_bytes = int(float(memory_budget_gb) * 1024 ** 3)
+        self.min_residency_seconds = float(min_residency_seconds)
+        self.keep_alive = keep_alive
+        # Warm with the num_ctx real calls start with; a different value would reload the model.
+        self.warm_num_ctx = warm_num_ctx
+
+        self.resident: Optional[str] = None
+        self.resident_since = 0.0
+        self.last_used: Dict[str, float] = {}
+        self.switches = 0
+        self.held = 0
+        self.pings = 0
+
+        self.ready = False
+        self.warming = False
+        self.warmup_error: Optional[str] = None
+        self.warmed: Dict[str, Dict[str, Any]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    # ── Residency policy ──
+
+    def _size(self, model: str) -> int:
+        return max((b.model_size(model) for b in self.pool.backends), default=0)
+
+    def exclusive(self, a: str, b: str) -> bool:
+        """True when models a and b should not be loaded at the same time."""
+        if self.policy == "multi":
+            return False
+        if self.policy == "single" or not self.memory_budget_bytes:
+            return True
+        # Co-load only when both sizes are known and fit the budget together.
+        size_a, size_b = self._size(a), self._size(b)
+        return not (size_a and size_b) or size_a + size_b > self.memory_budget_bytes
+
+    def choose(self, preferred: str) -> str:
+        """Model to use now: preferred, unless that means evicting a recently loaded model."""
+        now = time.monotonic()
+        resident = self.resident
+        if resident and preferred != resident and self.exclusive(preferred, resident):
+            still_available = any(b.healthy and b.has_model(resident) for b in self.pool.backends)
+            if still_available and now - self.resident_since < self.min_residency_seconds:
+                self.held += 1
+                return resident
+        if preferred != resident:
+            if resident:
+                self.switches += 1
+                logger.info(f"Resident model switching {resident} -> {preferred}")
+            self.resident = preferred
+            self.resident_since = now
+        return preferred
+
+    def allows(self, model: str) -> bool:
+        """Whether a call to model may run without evicting the resident model."""
+        return not self.resident or model == self.resident or not self.exclusive(model, self.resident)
+
+    def touch(self, model: str) -> None:
+        self.last_used[model] = time.monotonic()
+
+    # ── Warmup and keep-warm ──
+
+    async def _load(self, backend, model: str, timeout: float) -> float:
+        """One-token generation on a backend; returns Ollama's reported load time."""
+        async with self.pool.http() as client:
+            resp = await client.post(
+                f"{backend.url}/api/generate",
+                headers=backend.headers,
+                timeout=timeout,
+                json={
+                    "model": model,
+                    "prompt": "Hi",
+                    "stream": False,
+                    "keep_alive": self.keep_alive,
+                    "options": {"num_predict": 1, "num_ctx": self.warm_num_ctx},
+                },
+            )
+            resp.raise_for_status()
+            return round(int(resp.json().get("load_duration") or 0) / 1e9, 3)
+
+    async def warm_model(self, model: str, timeout: float = 300.0) -> None:
+        backends = [b for b in self.pool.backends if b.healthy and b.has_model(model)]
+        if not backends:
+            raise RuntimeError(f"No healthy Ollama backend has model {model}")
+        start_time = time.perf_counter()
+        loads = await asyncio.gather(*(self._load(b, model, timeout) for b in backends))
+        self.warmed[model] = {
+            "backends": [b.url for b in backends],
+            "load_s": max(loads),
+            "elapsed_s": round(time.perf_counter() - start_time, 3),
+            "at": time.time(),
+        }
+        self.touch(model)
+        logger.info(f"Warmed {model} on {len(backends)} backend(s) in {self.warmed[model]['elapsed_s']}s")
+
+    async def warmup(self, resolve_models, retry_interval: float = 15.0) -> None:
+        """Preload models, retrying until it succeeds; marks the server ready when done.
+
+        resolve_models is an async callable returning the models to load
+        (it runs model discovery, so it is retried along with the loads).
+        """
+        self.warming = True
+        while True:
+            try:
+                for model in await resolve_models():
+                    await self.warm_model(model)
+                self.ready = True
+                self.warmup_error = None
+                break
+            except Exception as exc:
+                self.warmup_error = str(exc) or type(exc).__name__
+                logger.warning(f"Model warmup failed ({self.warmup_error}); retrying in {retry_interval}s")
+                await asyncio.sleep(retry_interval)
+        self.warming = False
+
+    async def keep_warm(self, interval: float) -> None:
+        """Re-load the resident model whenever it has been idle for `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            model = self.resident
+            if not model or time.monotonic() - self.last_used.get(model, 0.0) < interval:
+                continue
+            try:
+                await self.pool.refresh()
+                await self.warm_model(model, timeout=60.0)
+                self.pings += 1
+            except Exception as exc:
+                logger.warning(f"Keep-warm ping for {model} failed: {exc}")
+
+    def start(self, resolve_models, keep_warm_interval: float = 0.0) -> None:
+        self._tasks.append(asyncio.ensure_future(self.warmup(resolve_models)))
+        if keep_warm_interval > 0:
+            self._tasks.append(asyncio.ensure_future(self.keep_warm(keep_warm_interval)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warming": self.warming,
+            "warmup_error": self.warmup_error,
+            "warmed": self.warmed,
+            "policy": self.policy,
+            "resident": self.resident,
+            "resident_for_s": round(time.monotonic() - self.resident_since, 1) if self.resident else 0,
+            "switches": self.switches,
+            "switches_held": self.held,
+            "keep_warm_pings": self.pings,
+        }
@@ -0,0 +1,188 @@
+"""
+ResuMate Ollama Backend Pool
+────────────────────────────
+Tracks several Ollama instances (Colab tunnels, on-prem boxes), each with
+its own installed-model list, health state and in-flight count. Requests
+are routed to the least-loaded healthy backend that has the model, stay
+sticky to one backend per prompt template when load allows (so Ollama's
+prompt cache is reused), and fail over when a backend stops answering.
+HTTP connections are pooled once open() has been called (per worker
+process, inside its event loop).
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+
+class OllamaBackend:
+    def __init__(self, url: str):
+        self.url = url
+        self.models: List[str] = []
+        self.model_sizes: Dict[str, int] = {}
+        self.healthy = True
+        self.in_flight = 0
+        self.failures = 0
+        self.requests = 0
+        self.last_checked = 0.0
+        self.unhealthy_since = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Accept": "application/json"}
+        if "ngrok" in self.url.lower():
+            # Avoid ngrok browser warning/interstitial responses for API calls.
+            headers["ngrok-skip-browser-warning"] = "1"
+        return headers
+
+    def has_model(self, model: str) -> bool:
+        return model in self.models or f"{model}:latest" in self.models
+
+    def model_size(self, model: str) -> int:
+        """Size in bytes reported by /api/tags (0 if unknown)."""
+        return self.model_sizes.get(model) or self.model_sizes.get(f"{model}:latest", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "models": self.models,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "consecutive_failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class OllamaPool:
+    """Health-checked set of Ollama backends with least-loaded, sticky routing."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        health_ttl: float = 15.0,
+        unhealthy_cooldown: float = 10.0,
+        sticky_slack: int = 1,
+        describe_error: Optional[Callable[[Exception], str]] = None,
+    ):
+        self.backends = [OllamaBackend(url) for url in urls]
+        self.describe_error = describe_error or (lambda exc: str(exc) or type(exc).__name__)
+        self.health_ttl = health_ttl
+        self.unhealthy_cooldown = unhealthy_cooldown
+        # A sticky backend is kept while it has at most this many more in-flight calls than the least loaded.
+        self.sticky_slack = sticky_slack
+        self.failovers = 0
+        self.client: Optional[httpx.AsyncClient] = None
+
+    def open(self, max_connections: int = 32) -> None:
+        """Create the shared, keep-alive HTTP client (call from the serving event loop)."""
+        if self.client is None:
+            # Loading the CA bundle is most of a client's creation time (~0.1s
+            # of a cold start); plain-http backends, like a local Ollama, never use it.
+            tls = any(backend.url.startswith("https://") for backend in self.backends)
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                verify=tls,
+            )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    @contextlib.asynccontextmanager
+    async def http(self) -> AsyncIterator[httpx.AsyncClient]:
+        """The pooled client, or a one-off client when the pool has not been opened.
+
+        Pass timeouts per request, since the pooled client is shared.
+        """
+        if self.client is not None:
+            yield self.client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+
+    async def _check(self, backend: OllamaBackend, timeout: float) -> None:
+        try:
+            async with self.http() as client:
+                resp = await client.get(f"{backend.url}/api/tags", headers=backend.headers, timeout=timeout)
+                resp.raise_for_status()
+                installed = resp.json().get("models", [])
+                backend.models = [m["name"] for m in installed]
+                backend.model_sizes = {m["name"]: int(m.get("size") or 0) for m in installed}
+            self.mark_success(backend)
+        except Exception as exc:
+            self.mark_failure(backend, exc)
+        finally:
+            backend.last_checked = time.time()
+
+    async def refresh(self, force: bool = False, timeout: float = 10.0) -> None:
+        """Re-read /api/tags from every backend whose health info is stale."""
+        now = time.time()
+        due = [b for b in self.backends if force or now - b.last_checked >= self.health_ttl]
+        if due:
+            await asyncio.gather(*(self._check(b, timeout) for b in due))
+
+    def installed_models(self) -> List[str]:
+        """Models available on at least one healthy backend, in backend order."""
+        seen = []
+        for backend in self.backends:
+            if backend.healthy:
+                seen.extend(m for m in backend.models if m not in seen)
+        return seen
+
+    def _affinity(self, backend: OllamaBackend, affinity_key: str) -> str:
+        return hashlib.sha1(f"{affinity_key}|{backend.url}".encode("utf-8")).hexdigest()
+
+    def candidates(self, model: str, affinity_key: Optional[str] = None) -> List[OllamaBackend]:
+        """Backends to try for a model, best first.
+
+        Healthy backends with the model come first, least loaded first, with
+        the affinity-preferred backend promoted while its load is close to
+        the minimum. Unhealthy backends past their cooldown follow as probes.
+        """
+        now = time.time()
+        healthy = [b for b in self.backends if b.healthy and (b.has_model(model) or not b.models)]
+        healthy.sort(key=lambda b: b.in_flight)
+
+        if affinity_key and len(healthy) > 1:
+            preferred = max(healthy, key=lambda b: self._affinity(b, affinity_key))
+            if preferred.in_flight <= healthy[0].in_flight + self.sticky_slack:
+                healthy.remove(preferred)
+                healthy.insert(0, preferred)
+
+        probes = [
+            b for b in self.backends
+            if not b.healthy and now - b.unhealthy_since >= self.unhealthy_cooldown
+        ]
+        return healthy + probes
+
+    def acquire(self, backend: OllamaBackend) -> None:
+        backend.in_flight += 1
+        backend.requests += 1
+
+    def release(self, backend: OllamaBackend) -> None:
+        backend.in_flight = max(0, backend.in_flight - 1)
+
+    def mark_success(self, backend: OllamaBackend) -> None:
+        backend.healthy = True
+        backend.failures = 0
+        backend.last_error = None
+
+    def mark_failure(self, backend: OllamaBackend, error: Exception) -> None:
+        backend.failures += 1
+        backend.last_error = self.describe_error(error)
+        backend.unhealthy_since = time.time()
+        backend.healthy = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backends": [b.stats() for b in self.backends],
+            "healthy": sum(1 for b in self.backends if b.healthy),
+            "failovers": self.failovers,
+        }
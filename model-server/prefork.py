@@ -0,0 +1,141 @@
+"""
+ResuMate Pre-fork Server
+────────────────────────
+Serves the model server from N worker processes sharing one listening
+socket. The server module is imported and its read-only tables (task JSON
+schemas, the resume parser's compiled patterns) are built once in the
+master before forking, so workers start instantly and share that memory
+copy-on-write. Each worker then opens its own pooled Ollama clients in the
+FastAPI startup hooks.
+
+    python prefork.py --workers 4 --port 8000
+
+Per-process limits (OLLAMA_MAX_CONCURRENCY) are divided across the workers.
+Set CHAT_SESSIONS_SQLITE_PATH and JOBS_SQLITE_PATH so chat sessions and jobs
+are visible from every worker; the LLM cache and metrics stay per process.
+
+Where os.fork is unavailable (Windows) this falls back to uvicorn's own
+multi-process mode, which re-imports the server in every worker.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger("model-server")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the ResuMate model server with pre-forked workers")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SERVER_WORKERS", "") or os.cpu_count() or 1))
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(index: int, sock: socket.socket, log_level: str) -> None:
+    """Body of a forked worker: serve the preloaded app on the shared socket."""
+    import uvicorn
+    import server
+
+    os.environ["SERVER_WORKER_INDEX"] = str(index)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+    config = uvicorn.Config(server.app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(index: int, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(index, sock, log_level)
+        except BaseException:
+            logger.exception(f"Worker {index} crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve_forked(args: argparse.Namespace) -> None:
+    import server
+
+    started = time.perf_counter()
+    server.preload()
+    sock = bind_socket(args.host, args.port)
+    # Keep the preloaded objects out of the collector's reach so its bookkeeping
+    # writes do not un-share their pages in the workers.
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        f"Preloaded in {time.perf_counter() - started:.2f}s; "
+        f"starting {args.workers} worker(s) on {args.host}:{args.port}"
+    )
+
+    workers = {spawn(index, sock, args.log_level): index for index in range(args.workers)}
+    stopping = False
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = workers.pop(pid, None)
+        if index is None or stopping:
+            continue
+        logger.warning(f"Worker {index} (pid {pid}) exited with status {status}; restarting")
+        time.sleep(1.0)
+        workers[spawn(index, sock, args.log_level)] = index
+    sock.close()
+
+
+def serve_spawned(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    uvicorn.run("server:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    args.workers = max(1, args.workers)
+    # Read by server.py at import to divide per-process limits.
+    os.environ["SERVER_WORKERS"] = str(args.workers)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if hasattr(os, "fork"):
+        serve_forked(args)
+    else:
+        serve_spawned(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -102,6 +102,13 @@ SKILLS_DB = {
 
 SKILLS_LOWER = {s.lower() for s in SKILLS_DB}
 
+# Word-boundary matchers for the full-text scan, compiled once at import.
+# Short acronyms match case-sensitively against the original text.
+SKILL_PATTERNS = [
+    (skill, len(skill) <= 2, re.compile(r'\b' + re.escape(skill if len(skill) <= 2 else skill.lower()) + r'\b'))
+    for skill in sorted(SKILLS_DB)
+]
+
 # Uppercase-preferred acronyms
 UPPERCASE_SKILLS = {
     "html", "css", "sql", "aws", "gcp", "api", "jwt", "ci/cd", "rest",
@@ -530,15 +537,12 @@ def extract_skills(text: str, sections: dict) -> list:
 
     # Strategy 2: Scan entire text for known skills
     text_lower = text.lower()
-    for skill in SKILLS_DB:
-        if len(skill) <= 2:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text):
+    for skill, acronym, pattern in SKILL_PATTERNS:
+        if acronym:
+            if pattern.search(text):
                 found_skills.add(skill.upper())
-        else:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.add(skill)
+        elif pattern.search(text_lower):
+            found_skills.add(skill)
 
     # Normalize casing and deduplicate (case-insensitive)
     seen_lower = {}
@@ -0,0 +1,158 @@
+"""
+ResuMate Upstream Scheduler
+───────────────────────────
+Admission control in front of Ollama: a bounded number of concurrent
+upstream calls, strict-priority lanes (interactive before batch), bounded
+per-lane queues that reject immediately when full, and queue-wait /
+service-time accounting per lane.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when a lane's queue is full; carries a Retry-After hint in seconds."""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"Model server is busy ({lane} queue full). Retry in {retry_after}s.")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class PriorityScheduler:
+    """Bounded-concurrency scheduler with strict-priority lanes."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        lanes: List[str],
+        queue_limits: Optional[Dict[str, int]] = None,
+        reserved_slots: int = 0,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        # Slots only the highest-priority lane may use, so batch work never fills every slot.
+        self.reserved_slots = max(0, min(int(reserved_slots), self.max_concurrency - 1))
+        self.lanes = list(lanes)
+        self._priority = {lane: idx for idx, lane in enumerate(self.lanes)}
+        self._queue_limits = dict(queue_limits or {})
+        self._active = 0
+        self._waiters: list = []
+        self._queued = {lane: 0 for lane in self.lanes}
+        self._seq = itertools.count()
+        self._stats = {
+            lane: {
+                "completed": 0,
+                "rejected": 0,
+                "wait_total": 0.0,
+                "wait_max": 0.0,
+                "service_total": 0.0,
+                "service_max": 0.0,
+            }
+            for lane in self.lanes
+        }
+
+    def _lane(self, lane: str) -> str:
+        return lane if lane in self._priority else self.lanes[-1]
+
+    def _slot_limit(self, lane: str) -> int:
+        if self._priority[lane] == 0:
+            return self.max_concurrency
+        return self.max_concurrency - self.reserved_slots
+
+    def _avg_service(self) -> float:
+        completed = sum(s["completed"] for s in self._stats.values())
+        total = sum(s["service_total"] for s in self._stats.values())
+        return total / completed if completed else 10.0
+
+    def _retry_after(self) -> int:
+        backlog = sum(self._queued.values()) + self._active
+        return max(1, math.ceil(self._avg_service() * backlog / self.max_concurrency))
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            _, _, lane, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self._slot_limit(lane):
+                return
+            heapq.heappop(self._waiters)
+            self._queued[lane] -= 1
+            self._active += 1
+            future.set_result(None)
+
+    async def _acquire(self, lane: str) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (self._priority[lane], next(self._seq), lane, future))
+        self._queued[lane] += 1
+        self._wake_next()
+        if future.done():
+            return
+
+        limit = self._queue_limits.get(lane)
+        if limit is not None and self._queued[lane] > limit:
+            future.cancel()
+            self._queued[lane] -= 1
+            self._stats[lane]["rejected"] += 1
+            raise QueueFullError(lane, self._retry_after())
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed to us just as we were cancelled; pass it on.
+                self._release()
+            else:
+                self._queued[lane] -= 1
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake_next()
+
+    async def run(self, lane: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Wait for an upstream slot in the given lane, then run fn()."""
+        lane = self._lane(lane)
+        queued_at = time.perf_counter()
+        await self._acquire(lane)
+        started_at = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            finished_at = time.perf_counter()
+            self._release()
+            self._record(lane, started_at - queued_at, finished_at - started_at)
+
+    def _record(self, lane: str, wait: float, service: float) -> None:
+        stats = self._stats[lane]
+        stats["completed"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+        stats["service_total"] += service
+        stats["service_max"] = max(stats["service_max"], service)
+
+    def stats(self) -> Dict[str, Any]:
+        lanes = {}
+        for lane, s in self._stats.items():
+            done = s["completed"]
+            lanes[lane] = {
+                "queued": self._queued[lane],
+                "queue_limit": self._queue_limits.get(lane),
+                "completed": done,
+                "rejected": s["rejected"],
+                "avg_wait_s": round(s["wait_total"] / done, 4) if done else 0.0,
+                "max_wait_s": round(s["wait_max"], 4),
+                "avg_service_s": round(s["service_total"] / done, 4) if done else 0.0,
+                "max_service_s": round(s["service_max"], 4),
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "reserved_slots": self.reserved_slots,
+            "active": self._active,
+            "lanes": lanes,
+        }
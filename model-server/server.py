@@ -13,16 +13,32 @@ All AI tasks powered by Ollama LLM (runs on Google Colab for performance):
 Fallback: regex-based resume parsing when Ollama is unavailable
 """
 
-from fastapi import FastAPI, HTTPException
+# Imported first so the startup timings cover the framework imports below.
+# STARTUP_PROFILE_IMPORTS is read before .env is loaded: set it in the real
+# environment.
+import os
+from startup_profile import StartupProfile
+
+startup_profile = StartupProfile(
+    profile_imports=os.getenv("STARTUP_PROFILE_IMPORTS", "").strip().lower() in ("1", "true", "yes", "on")
+)
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List, Dict
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, Callable, Optional, List, Dict, FrozenSet, Tuple, Type
+from contextvars import ContextVar
 import httpx
+import asyncio
+import functools
+import importlib.util
 import json
 import re
 import logging
 import time
-import os
+import sys
 
 # Load .env file if present (for OLLAMA_URL, PRIMARY_MODEL, etc.)
 try:
@@ -31,14 +47,39 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, using system env vars
 
-# Fallback rule-based resume parser (used only when Ollama is unavailable)
-from resume_parser import parse_resume as regex_parse_resume
+from llm_cache import ResponseCache, make_cache_key
+from singleflight import SingleFlight
+from scheduler import PriorityScheduler, QueueFullError
+from batcher import MicroBatcher
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, SIZE_BUCKETS, MetricsRegistry
+from ollama_pool import OllamaBackend, OllamaPool
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from model_residency import ModelResidency
+from job_queue import JobQueue
+from chat_sessions import ChatSessionStore, format_turns
+from hedging import Hedger
+from cpu_executor import CPUExecutor, LoopLagMonitor, default_workers
+from cassette import Cassette
+from token_budget import ContextPlanner, OutputLengthTracker, PromptTooLargeError, estimate_tokens
+from json_extract import extract_json
+from streaming_json import StreamingJSONParser
+from task_schemas import (
+    TASK_SCHEMAS, ResumeAnalysis, ResumeAnalysisWithMatch, ResumeScoreAnalysis, ResumeScoreAnalysisWithMatch,
+    ollama_json_schema, schema_errors,
+)
+import wire_format
+from wire_format import NegotiatedResponse, NegotiatedRoute
+
+startup_profile.mark("imports")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("model-server")
 
-app = FastAPI(title="ResuMate Model Server")
+# Responses are JSON (orjson when installed) or MessagePack, by Accept header;
+# request bodies may be either. See wire_format.py.
+app = FastAPI(title="ResuMate Model Server", default_response_class=NegotiatedResponse)
+app.router.route_class = NegotiatedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -48,6 +89,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Gzip responses of at least RESPONSE_GZIP_MIN_BYTES (0 = off) for clients
+# that accept it (the backend's axios client does). RESPONSE_GZIP_LEVEL
+# trades CPU for size, 1-9; SSE streams are never compressed. Added before
+# the middleware below so it sees whole response bodies, not the re-streamed
+# ones call_next produces (which it would compress regardless of size).
+RESPONSE_GZIP_MIN_BYTES = int(os.getenv("RESPONSE_GZIP_MIN_BYTES", "").strip() or 4096)
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "").strip() or 5)
+if RESPONSE_GZIP_MIN_BYTES > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=RESPONSE_GZIP_MIN_BYTES, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start_time = time.perf_counter()
+    include_ollama_stats.set(request.query_params.get("stats", "").lower() in ("1", "true", "yes"))
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        startup_profile.mark("first_response")
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", None) or "unmatched"
+        HTTP_LATENCY.observe(
+            time.perf_counter() - start_time,
+            endpoint=endpoint, method=request.method, status=str(status),
+        )
+
 
 def normalize_ollama_url(raw_url: str) -> str:
     """Extract a usable URL even if env value contains extra pasted text."""
@@ -71,20 +141,323 @@ FALLBACK_MODEL = os.getenv("FALLBACK_MODEL", "qwen2.5:7b")
 RESUME_PARSER_MODE = os.getenv("RESUME_PARSER_MODE", "ollama").strip().lower()
 MAX_RETRIES = 2
 REQUEST_TIMEOUT = 300.0  # seconds — needs to be generous for 8GB RAM systems
+MODEL_DISCOVERY_TTL = float(os.getenv("MODEL_DISCOVERY_TTL_SECONDS", "30"))
+discovered_model = {"name": None, "expires_at": 0.0}
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean env var ("1", "true", "yes", "on")."""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name: str, default: str) -> List[str]:
+    """Read a comma-separated env var into a list of non-empty items."""
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# Ollama backends (see ollama_pool.py). OLLAMA_URLS lists several instances
+# separated by commas; when unset, the single OLLAMA_URL is used.
+OLLAMA_URLS = [normalize_ollama_url(url) for url in env_list("OLLAMA_URLS", "")] or [OLLAMA_URL]
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "1"))
+OLLAMA_STICKY_PREFIX_CHARS = int(os.getenv("OLLAMA_STICKY_PREFIX_CHARS", "400"))
+
+
+def describe_ollama_error(exc: Exception) -> str:
+    """Human-readable reason an Ollama backend failed a health check or call."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return format_ollama_http_error(exc.response)
+    if isinstance(exc, (json.JSONDecodeError, ValueError)):
+        return "Ollama endpoint returned non-JSON data. Verify OLLAMA_URL points to a live Ollama tunnel."
+    if isinstance(exc, httpx.ConnectError):
+        return "Cannot connect to Ollama. Is it running?"
+    return str(exc) or type(exc).__name__
+
+
+ollama_pool = OllamaPool(
+    OLLAMA_URLS,
+    health_ttl=float(os.getenv("OLLAMA_HEALTH_TTL_SECONDS", "15")),
+    unhealthy_cooldown=float(os.getenv("OLLAMA_UNHEALTHY_COOLDOWN_SECONDS", "10")),
+    describe_error=describe_ollama_error,
+)
+
+# Fail fast to local fallbacks while Ollama is down (see circuit_breaker.py)
+ollama_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("OLLAMA_BREAKER_FAILURE_THRESHOLD", "3")),
+    reset_timeout=float(os.getenv("OLLAMA_BREAKER_RESET_SECONDS", "30")),
+    enabled=env_flag("OLLAMA_BREAKER_ENABLED", True),
+)
+
+# Response cache for deterministic JSON tasks (see llm_cache.py)
+LLM_CACHE_ENABLED = env_flag("LLM_CACHE_ENABLED", True)
+LLM_CACHE_TASKS = set(env_list(
+    "LLM_CACHE_TASKS",
+    "parse-resume-ollama,score-resume,match-resume,analyze-resume,compare-models,generate-interview",
+))
+llm_cache = ResponseCache(
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+    sqlite_path=os.getenv("LLM_CACHE_SQLITE_PATH", "").strip() or None,
+)
+
+# Share one upstream generation between identical concurrent calls
+LLM_SINGLEFLIGHT_ENABLED = env_flag("LLM_SINGLEFLIGHT_ENABLED", True)
+ollama_singleflight = SingleFlight()
+
+# Admission control in front of Ollama (see scheduler.py). Size the
+# concurrency to the backend's parallel slots (OLLAMA_NUM_PARALLEL).
+SCHEDULER_LANES = ["interactive", "standard", "batch"]
+TASK_LANES = {
+    "chat": "interactive",
+    "chat-summary": "batch",
+    "evaluate-answer": "interactive",
+    "evaluate-answers": "interactive",
+    "generate": "interactive",
+    "generate-interview": "standard",
+    "interview-feedback": "standard",
+    "parse-resume-ollama": "standard",
+    "analyze-resume": "standard",
+    "score-resume": "batch",
+    "match-resume": "batch",
+    "compare-models": "batch",
+    "evaluate-accuracy": "batch",
+}
+# Serving processes (set by prefork.py). Per-process limits below are split
+# across them so N workers together do not oversubscribe Ollama.
+SERVER_WORKERS = max(1, int(os.getenv("SERVER_WORKERS", "1")))
+OLLAMA_MAX_CONCURRENCY = int(
+    os.getenv("OLLAMA_MAX_CONCURRENCY", "").strip()
+    or max(1, -(-OLLAMA_NUM_PARALLEL * len(OLLAMA_URLS) // SERVER_WORKERS))
+)
+ollama_scheduler = PriorityScheduler(
+    max_concurrency=OLLAMA_MAX_CONCURRENCY,
+    lanes=SCHEDULER_LANES,
+    queue_limits={
+        lane: int(limit)
+        for lane, _, limit in (
+            item.partition("=") for item in env_list(
+                "SCHEDULER_QUEUE_LIMITS", "interactive=32,standard=16,batch=8"
+            )
+        )
+    },
+    reserved_slots=int(os.getenv("SCHEDULER_INTERACTIVE_RESERVED_SLOTS", "1")),
+)
+
+# Per-request num_ctx / num_predict sizing (see token_budget.py). Keep the
+# bucket list short: Ollama reloads the model whenever num_ctx changes.
+# OLLAMA_TASK_NUM_CTX pins tasks to a bucket (task=size,...).
+context_planner = ContextPlanner(
+    ctx_buckets=[int(size) for size in env_list("OLLAMA_CTX_BUCKETS", "2048,4096,8192")],
+    task_ctx={
+        task.strip(): int(size)
+        for task, _, size in (item.partition("=") for item in env_list("OLLAMA_TASK_NUM_CTX", ""))
+    },
+    max_predict=int(os.getenv("OLLAMA_MAX_PREDICT", "1024")),
+    percentile=float(os.getenv("OUTPUT_BUDGET_PERCENTILE", "95")),
+    tracker=OutputLengthTracker(min_samples=int(os.getenv("OUTPUT_BUDGET_MIN_SAMPLES", "8"))),
+)
+
+# Micro-batching for /evaluate-answer requests that share a sessionId: an
+# answer is sent at once unless one from its session is being graded; those
+# that arrive meanwhile are graded together (waiting at most the window).
+EVALUATE_BATCH_ENABLED = env_flag("EVALUATE_BATCH_ENABLED", True)
+EVALUATE_BATCH_WINDOW_MS = int(os.getenv("EVALUATE_BATCH_WINDOW_MS", "300"))
+EVALUATE_BATCH_MAX_SIZE = max(1, int(os.getenv("EVALUATE_BATCH_MAX_SIZE", "4")))
+
+# Constrain JSON tasks to their output schema via Ollama's `format` option
+# (see task_schemas.py). Turn off to compare retry rates without it.
+OLLAMA_STRUCTURED_OUTPUT = env_flag("OLLAMA_STRUCTURED_OUTPUT", True)
+
+# Send prompts through Ollama's /api/chat as a fixed system message plus the
+# variable user input, so the shared prefix is evaluated once and reused.
+OLLAMA_CHAT_API = env_flag("OLLAMA_CHAT_API", True)
+# How long Ollama keeps the model loaded after a call: a duration ("30m") or
+# seconds (-1 = keep loaded forever, 0 = unload right away).
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m").strip()
+if re.fullmatch(r"-?\d+", OLLAMA_KEEP_ALIVE):
+    OLLAMA_KEEP_ALIVE = int(OLLAMA_KEEP_ALIVE)
+
+# Stream JSON task generations and hang up if the model keeps writing after
+# the top-level object closes (see streaming_json.py). Streaming endpoints register a listener
+# here to receive each top-level field as it completes.
+OLLAMA_STREAM_JSON = env_flag("OLLAMA_STREAM_JSON", True)
+# After the object closes, keep reading (through whitespace only) this many
+# chunks / seconds for Ollama's final chunk with the token and timing stats.
+OLLAMA_STREAM_JSON_GRACE_TOKENS = int(os.getenv("OLLAMA_STREAM_JSON_GRACE_TOKENS", "").strip() or 16)
+OLLAMA_STREAM_JSON_GRACE_SECONDS = float(os.getenv("OLLAMA_STREAM_JSON_GRACE_SECONDS", "").strip() or 1.0)
+json_field_listener: ContextVar[Optional[Callable[[str, Any], None]]] = ContextVar(
+    "json_field_listener", default=None
+)
+
+# Ollama cassettes (see cassette.py): "record" appends every upstream
+# generation to OLLAMA_CASSETTE_PATH; "replay" answers from that file
+# instead of Ollama (OLLAMA_CASSETTE_TIMING 0 = at once, 1 = original timing).
+ollama_cassette = Cassette(
+    os.getenv("OLLAMA_CASSETTE_PATH", "").strip() or "ollama_cassette.jsonl",
+    mode=os.getenv("OLLAMA_CASSETTE_MODE", "off").strip().lower(),
+    timing=float(os.getenv("OLLAMA_CASSETTE_TIMING", "").strip() or 0),
+)
+
+# Startup warmup and model residency (see model_residency.py). With policy
+# "auto", PRIMARY_MODEL and FALLBACK_MODEL are only loaded together when
+# both sizes are known to fit OLLAMA_MEMORY_BUDGET_GB (0 = unknown: never).
+OLLAMA_WARMUP_ENABLED = env_flag("OLLAMA_WARMUP_ENABLED", True)
+OLLAMA_KEEP_WARM_INTERVAL = float(os.getenv("OLLAMA_KEEP_WARM_INTERVAL_SECONDS", "0"))
+model_residency = ModelResidency(
+    ollama_pool,
+    policy=os.getenv("OLLAMA_RESIDENCY_POLICY", "auto").strip().lower(),
+    memory_budget_gb=float(os.getenv("OLLAMA_MEMORY_BUDGET_GB", "0")),
+    min_residency_seconds=float(os.getenv("OLLAMA_MIN_RESIDENCY_SECONDS", "300")),
+    keep_alive=OLLAMA_KEEP_ALIVE,
+    warm_num_ctx=context_planner.ctx_buckets[0],
+)
+
+# Asynchronous jobs (see job_queue.py): POST /jobs returns an id at once and
+# JOBS_WORKERS run the tasks. With JOBS_SQLITE_PATH jobs survive restarts.
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "").strip() or OLLAMA_MAX_CONCURRENCY)
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "100"))
+JOBS_RETENTION_SECONDS = float(os.getenv("JOBS_RETENTION_SECONDS", "3600"))
+JOBS_SQLITE_PATH = os.getenv("JOBS_SQLITE_PATH", "").strip() or None
+JOBS_MAX_WAIT_SECONDS = float(os.getenv("JOBS_MAX_WAIT_SECONDS", "60"))
+JOBS_WEBHOOK_HOSTS = env_list("JOBS_WEBHOOK_HOSTS", "")
+
+# Hedged requests (see hedging.py): a HEDGE_TASKS call still running at the
+# task's HEDGE_PERCENTILE latency is also sent to FALLBACK_MODEL (or the same
+# model on another backend); the first valid answer wins, the other is cancelled.
+HEDGE_ENABLED = env_flag("HEDGE_ENABLED", False)
+HEDGE_TASKS = set(env_list("HEDGE_TASKS", "chat,evaluate-answer,evaluate-answers"))
+hedger = Hedger(
+    percentile=float(os.getenv("HEDGE_PERCENTILE", "90")),
+    default_delay=float(os.getenv("HEDGE_DELAY_SECONDS", "10")),
+    min_delay=float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "1")),
+    max_rate=float(os.getenv("HEDGE_MAX_RATE", "0.25")),
+)
+# Backends a generation must not use (set for same-model hedges), and a list
+# that records the backends a call was sent to.
+ollama_avoid_backends: ContextVar[FrozenSet[str]] = ContextVar("ollama_avoid_backends", default=frozenset())
+ollama_backend_trace: ContextVar[Optional[List[str]]] = ContextVar("ollama_backend_trace", default=None)
+
+# CPU-bound parsing / post-processing runs in this executor instead of on the
+# event loop: thread (default), process (true parallelism; more memory) or
+# inline. EVENT_LOOP_LAG_INTERVAL_SECONDS sets the lag probe period (0 = off).
+cpu_executor = CPUExecutor(
+    kind=os.getenv("CPU_EXECUTOR", "thread").strip().lower(),
+    workers=int(os.getenv("CPU_EXECUTOR_WORKERS", "").strip() or default_workers()),
+)
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.25"))
+
+# Load the rule-based parser in the background right after startup instead
+# of on the first parse (it is never imported during startup itself).
+PARSER_WARMUP_ENABLED = env_flag("PARSER_WARMUP_ENABLED", True)
+
+# Progressive /parse-resume: answer with the regex parse immediately and
+# deliver the LLM parse later (job id / webhook / SSE).
+PARSE_RESUME_PROGRESSIVE = env_flag("PARSE_RESUME_PROGRESSIVE", False)
+
+# Server-side /chat sessions (see chat_sessions.py). Token budgets for the
+# parts of each chat prompt; turns beyond CHAT_HISTORY_TOKENS are folded into
+# a rolling summary (model-written when CHAT_LLM_SUMMARIES is on).
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "1000"))
+CHAT_SESSION_TTL_SECONDS = float(os.getenv("CHAT_SESSION_TTL_SECONDS", "7200"))
+CHAT_RESUME_TOKENS = int(os.getenv("CHAT_RESUME_TOKENS", "300"))
+CHAT_SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", "250"))
+CHAT_HISTORY_TOKENS = int(os.getenv("CHAT_HISTORY_TOKENS", "600"))
+CHAT_LLM_SUMMARIES = env_flag("CHAT_LLM_SUMMARIES", True)
+CHAT_SESSIONS_SQLITE_PATH = os.getenv("CHAT_SESSIONS_SQLITE_PATH", "").strip() or None
+
+# Include Ollama token/timing stats in every API response (otherwise only with ?stats=1)
+OLLAMA_STATS_IN_RESPONSES = env_flag("OLLAMA_STATS_IN_RESPONSES", False)
+include_ollama_stats: ContextVar[bool] = ContextVar("include_ollama_stats", default=False)
+
+# ── Prometheus metrics (served at /metrics) ──
+metrics = MetricsRegistry()
+HTTP_LATENCY = metrics.histogram(
+    "resumate_http_request_duration_seconds", "HTTP request latency by endpoint.",
+    ("endpoint", "method", "status"),
+)
+TASK_LATENCY = metrics.histogram(
+    "resumate_task_duration_seconds", "End-to-end LLM task latency including retries.",
+    ("task", "outcome"),
+)
+OLLAMA_CALLS = metrics.counter(
+    "resumate_ollama_calls_total", "Upstream Ollama calls by outcome.", ("task", "outcome"),
+)
+OLLAMA_LATENCY = metrics.histogram(
+    "resumate_ollama_call_duration_seconds", "Upstream Ollama call latency.", ("task", "outcome"),
+)
+OLLAMA_RETRIES = metrics.counter(
+    "resumate_ollama_retries_total", "Retried Ollama generations.", ("task",),
+)
+JSON_EXTRACTIONS = metrics.counter(
+    "resumate_json_extractions_total",
+    "JSON extraction results on model output (direct, scan, repaired, salvaged, failed).", ("task", "result"),
+)
+JSON_TASK_RUNS = metrics.counter(
+    "resumate_json_task_runs_total", "JSON tasks sent to Ollama, by output format (schema or free).",
+    ("task", "format"),
+)
+JSON_TASK_RETRIES = metrics.counter(
+    "resumate_json_task_retries_total", "JSON task generations repeated after invalid or off-schema output.",
+    ("task", "format"),
+)
+JSON_SCHEMA_ERRORS = metrics.counter(
+    "resumate_json_schema_errors_total", "Outputs that parsed as JSON but failed schema validation.",
+    ("task", "format"),
+)
+OLLAMA_EARLY_STOPS = metrics.counter(
+    "resumate_ollama_early_stops_total", "Streamed generations cut off once the JSON object closed.", ("task",),
+)
+HEDGES = metrics.counter(
+    "resumate_hedged_calls_total", "Hedging outcomes per task (not_hedged, primary_won, hedge_won, failed, skipped).",
+    ("task", "outcome"),
+)
+EVENT_LOOP_LAG = metrics.histogram(
+    "resumate_event_loop_lag_seconds", "How late the event loop ran a timer that was due (blocking work).",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+FALLBACKS = metrics.counter(
+    "resumate_fallback_activations_total", "Local fallbacks used instead of the LLM.", ("endpoint", "fallback"),
+)
+PROMPT_SIZE = metrics.histogram(
+    "resumate_prompt_chars", "Prompt size sent to Ollama.", ("task",), buckets=SIZE_BUCKETS,
+)
+RESPONSE_SIZE = metrics.histogram(
+    "resumate_response_chars", "Response size received from Ollama.", ("task",), buckets=SIZE_BUCKETS,
+)
+OLLAMA_PROMPT_TOKENS = metrics.counter(
+    "resumate_ollama_prompt_tokens_total", "Prompt tokens evaluated by Ollama.", ("model", "task"),
+)
+OLLAMA_EVAL_TOKENS = metrics.counter(
+    "resumate_ollama_eval_tokens_total", "Tokens generated by Ollama.", ("model", "task"),
+)
+OLLAMA_PROMPT_EVAL_SECONDS = metrics.counter(
+    "resumate_ollama_prompt_eval_seconds_total", "Time Ollama spent processing prompts.", ("model", "task"),
+)
+OLLAMA_EVAL_SECONDS = metrics.counter(
+    "resumate_ollama_eval_seconds_total", "Time Ollama spent generating tokens.", ("model", "task"),
+)
+OLLAMA_PROMPT_EVAL_LATENCY = metrics.histogram(
+    "resumate_ollama_prompt_eval_duration_seconds",
+    "Prompt processing time per call (time to first token for streams cut off early); "
+    "drops when the prompt prefix is cached.", ("task", "api"),
+)
+OLLAMA_LOAD_SECONDS = metrics.histogram(
+    "resumate_ollama_load_duration_seconds", "Model load time reported by Ollama per call.", ("model",),
+)
 
 
-def get_ollama_headers() -> Dict[str, str]:
-    """Build headers for Ollama requests, including ngrok compatibility."""
-    headers = {"Accept": "application/json"}
-    if "ngrok" in OLLAMA_URL.lower():
-        # Avoid ngrok browser warning/interstitial responses for API calls.
-        headers["ngrok-skip-browser-warning"] = "1"
-    return headers
+def is_ngrok_response(response: httpx.Response) -> bool:
+    try:
+        return "ngrok" in str(response.request.url).lower()
+    except RuntimeError:
+        return "ngrok" in OLLAMA_URL.lower()
 
 
 def format_ollama_http_error(response: httpx.Response) -> str:
     """Create actionable Ollama upstream error messages."""
-    if "ngrok" in OLLAMA_URL.lower() and response.status_code == 403:
+    if is_ngrok_response(response) and response.status_code == 403:
         return (
             "Ollama tunnel returned 403 Forbidden. The ngrok URL may be expired or blocked. "
             "Re-run Colab Cell 3 to create a fresh tunnel and update model-server/.env with the new OLLAMA_URL."
@@ -110,6 +483,14 @@ class HealthResponse(BaseModel):
 # ── Task-specific request models ──
 class ParseResumeRequest(BaseModel):
     resumeText: str
+    # Ollama mode: return the regex parse at once and refine it as a job
+    # (default PARSE_RESUME_PROGRESSIVE); webhookUrl receives the refined job.
+    progressive: Optional[bool] = None
+    webhookUrl: Optional[str] = None
+
+class RefineParsedResumeRequest(BaseModel):
+    resumeText: str
+    fallbackSkills: Optional[List[str]] = None  # default: regex skills from resumeText
 
 class ScoreResumeRequest(BaseModel):
     resumeText: str
@@ -126,6 +507,10 @@ class EvaluateAnswerRequest(BaseModel):
     question: str
     userAnswer: str
     expectedKeywords: Optional[List[str]] = []
+    sessionId: Optional[str] = None  # answers sharing a session may be graded in one batch
+
+class EvaluateAnswersRequest(BaseModel):
+    answers: List[EvaluateAnswerRequest]
 
 class InterviewFeedbackRequest(BaseModel):
     allAnswers: list
@@ -133,8 +518,9 @@ class InterviewFeedbackRequest(BaseModel):
 
 class ChatRequest(BaseModel):
     message: str
-    context: Optional[str] = None
-    resumeData: Optional[dict] = None
+    sessionId: Optional[str] = None  # omitted: a one-off message, no history kept; new ids start a session
+    context: Optional[str] = None  # legacy free-form context; seeds a new session's summary
+    resumeData: Optional[dict] = None  # summarized once per session (resend to replace)
 
 class MatchResumeRequest(BaseModel):
     resumeText: str
@@ -149,52 +535,17 @@ class EvaluateAccuracyRequest(BaseModel):
 class CompareModelsRequest(BaseModel):
     resumeText: str
 
+class AnalyzeResumeRequest(BaseModel):
+    resumeText: str
+    jobTitle: Optional[str] = None
+    jobDescription: Optional[str] = None
+    requiredSkills: Optional[List[str]] = []
+    mode: Optional[str] = "auto"  # "concurrent", "merged", or "auto"
 
-def extract_json_from_response(text: str) -> Optional[str]:
-    """Try to extract valid JSON from model response, even if surrounded by text."""
-    # Try parsing the whole response first
-    try:
-        json.loads(text)
-        return text
-    except json.JSONDecodeError:
-        pass
-
-    # Try to find JSON block in markdown code fences
-    patterns = [
-        r'```json\s*([\s\S]*?)\s*```',
-        r'```\s*([\s\S]*?)\s*```',
-        r'(\{[\s\S]*\})',
-        r'(\[[\s\S]*\])',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            candidate = match.group(1).strip()
-            try:
-                json.loads(candidate)
-                return candidate
-            except json.JSONDecodeError:
-                # Try to repair common issues
-                repaired = repair_json(candidate)
-                if repaired:
-                    return repaired
-    return None
-
-
-def repair_json(text: str) -> Optional[str]:
-    """Attempt to fix common JSON issues from small models."""
-    try:
-        # Remove trailing commas before } or ]
-        text = re.sub(r',\s*([}\]])', r'\1', text)
-        # Remove comments
-        text = re.sub(r'//.*?$', '', text, flags=re.MULTILINE)
-        # Fix single quotes to double quotes
-        text = text.replace("'", '"')
-        # Try parsing
-        json.loads(text)
-        return text
-    except json.JSONDecodeError:
-        return None
+class JobRequest(BaseModel):
+    task: str  # a task endpoint name, e.g. "score-resume"
+    input: dict  # that endpoint's request body
+    webhookUrl: Optional[str] = None  # POSTed the finished job
 
 
 def get_temperature_for_task(task_type: str, user_temp: Optional[float]) -> float:
@@ -387,66 +738,577 @@ def generate_interview_questions_fallback(
 
 
 async def get_available_model() -> str:
-    """Check which model is available, pull if needed."""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(f"{OLLAMA_URL}/api/tags", headers=get_ollama_headers())
-            resp.raise_for_status()
-            models = [m["name"] for m in resp.json().get("models", [])]
-
-            if PRIMARY_MODEL in models or f"{PRIMARY_MODEL}:latest" in models:
-                return PRIMARY_MODEL
-            # Check without tag suffix
-            for m in models:
-                if m.startswith(PRIMARY_MODEL.split(":")[0]):
-                    return m
-
-            if FALLBACK_MODEL in models:
-                logger.warning(f"{PRIMARY_MODEL} not found, using {FALLBACK_MODEL}")
-                return FALLBACK_MODEL
-            for m in models:
-                if m.startswith(FALLBACK_MODEL.split(":")[0]):
-                    return m
-
-            # No suitable model found
-            if models:
-                logger.warning(f"Using first available model: {models[0]}")
-                return models[0]
-
-            raise Exception("No models installed in Ollama")
-        except httpx.HTTPStatusError as exc:
-            raise Exception(format_ollama_http_error(exc.response))
-        except json.JSONDecodeError:
-            raise Exception(
-                "Ollama endpoint returned non-JSON data. Verify OLLAMA_URL points to a live Ollama tunnel."
+    """Return the model to use, re-checking Ollama at most every MODEL_DISCOVERY_TTL_SECONDS.
+
+    Fails fast while the circuit is open, without taking a half-open probe
+    slot (call_ollama_with_stats checks for the generation itself). A
+    successful discovery does not close the circuit: /api/tags can answer
+    while generations time out, so only a generation result does.
+    """
+    ollama_breaker.check(probe=False)
+    now = time.time()
+    if discovered_model["name"] and now < discovered_model["expires_at"]:
+        return discovered_model["name"]
+    try:
+        model = model_residency.choose(await discover_available_model())
+    except Exception:
+        ollama_breaker.record_failure()
+        raise
+    discovered_model.update(name=model, expires_at=now + MODEL_DISCOVERY_TTL)
+    return model
+
+
+async def warmup_models() -> List[str]:
+    """Models to preload at startup: the active model, plus the fallback if both fit."""
+    await ollama_pool.refresh(force=True)
+    model = await get_available_model()
+    models = [model]
+    fallback_installed = any(b.healthy and b.has_model(FALLBACK_MODEL) for b in ollama_pool.backends)
+    if FALLBACK_MODEL != model and fallback_installed and model_residency.allows(FALLBACK_MODEL):
+        models.append(FALLBACK_MODEL)
+    return models
+
+
+PRELOAD_SAMPLE_RESUME = """Jane Doe
+jane@example.com | +1 555 010 0000 | San Francisco, CA
+
+SUMMARY
+Backend engineer building Python and Go services.
+
+EXPERIENCE
+Senior Software Engineer, Acme Corp
+Jan 2020 - Present
+- Built REST APIs with FastAPI, PostgreSQL and Redis on AWS
+
+EDUCATION
+B.S. Computer Science, State University, 2016
+
+SKILLS
+Python, Go, Docker, Kubernetes, SQL
+"""
+
+
+def preload_parser() -> None:
+    """Import the rule-based parser and run one parse, which also fills the
+    regex cache for the patterns the parser compiles on demand."""
+    postprocess_parsed_resume(regex_parse_resume(PRELOAD_SAMPLE_RESUME), [])
+
+
+def preload() -> None:
+    """Build read-only tables before prefork.py forks, so workers share them copy-on-write.
+
+    Inlines every task's JSON schema and loads the rule-based parser.
+    """
+    for schema in TASK_SCHEMAS.values():
+        ollama_json_schema(schema)
+    preload_parser()
+
+
+@app.on_event("startup")
+async def warm_rule_parser():
+    """Load the rule-based parser in the background once the server is up.
+
+    It is not imported at startup (see regex_parse_resume), so /health
+    answers sooner; warming it here keeps that cost off the first parse too.
+    """
+    if PARSER_WARMUP_ENABLED:
+        asyncio.get_running_loop().run_in_executor(None, preload_parser)
+
+
+@app.on_event("startup")
+async def open_ollama_clients():
+    """Per-worker startup: pooled keep-alive connections to the Ollama backends."""
+    ollama_pool.open(max_connections=max(8, OLLAMA_MAX_CONCURRENCY * 2))
+
+
+@app.on_event("startup")
+async def start_model_warmup():
+    if OLLAMA_WARMUP_ENABLED and not ollama_cassette.replaying:
+        model_residency.start(warmup_models, keep_warm_interval=OLLAMA_KEEP_WARM_INTERVAL)
+    else:
+        model_residency.ready = True
+
+
+@app.on_event("shutdown")
+async def stop_model_warmup():
+    await model_residency.stop()
+
+
+loop_lag_monitor = LoopLagMonitor(EVENT_LOOP_LAG_INTERVAL, on_sample=EVENT_LOOP_LAG.observe)
+
+
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    loop_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_cpu_work():
+    await loop_lag_monitor.stop()
+    cpu_executor.shutdown()
+
+
+def choose_model(models: List[str]) -> str:
+    """Pick PRIMARY_MODEL, then FALLBACK_MODEL, then anything installed."""
+    if PRIMARY_MODEL in models or f"{PRIMARY_MODEL}:latest" in models:
+        return PRIMARY_MODEL
+    # Check without tag suffix
+    for m in models:
+        if m.startswith(PRIMARY_MODEL.split(":")[0]):
+            return m
+
+    if FALLBACK_MODEL in models:
+        logger.warning(f"{PRIMARY_MODEL} not found, using {FALLBACK_MODEL}")
+        return FALLBACK_MODEL
+    for m in models:
+        if m.startswith(FALLBACK_MODEL.split(":")[0]):
+            return m
+
+    # No suitable model found
+    if models:
+        logger.warning(f"Using first available model: {models[0]}")
+        return models[0]
+
+    raise Exception("No models installed in Ollama")
+
+
+async def discover_available_model() -> str:
+    """Check which model is available across the healthy Ollama backends."""
+    if ollama_cassette.replaying and ollama_cassette.models:
+        return choose_model(ollama_cassette.models)
+    await ollama_pool.refresh()
+    if not any(b.healthy for b in ollama_pool.backends):
+        errors = [b.last_error for b in ollama_pool.backends if b.last_error]
+        raise Exception(errors[0] if errors else "Cannot connect to Ollama. Is it running?")
+    return choose_model(ollama_pool.installed_models())
+
+
+async def call_ollama(
+    prompt: str, temperature: float, max_tokens: int, model: str, task_name: str = "generate"
+) -> str:
+    """Make a single call to Ollama and return only the generated text."""
+    raw_response, _ = await call_ollama_with_stats(prompt, temperature, max_tokens, model, task_name)
+    return raw_response
+
+
+async def call_ollama_with_stats(
+    prompt: str, temperature: float, max_tokens: int, model: str, task_name: str = "generate",
+    response_format: Optional[dict] = None, stream_json: bool = False, system: Optional[str] = None,
+) -> Tuple[str, dict]:
+    """Make a single call to Ollama, joining an identical in-flight call if one exists.
+
+    system carries the task's fixed instructions; prompt only the variable
+    input, so Ollama can reuse the cached prefix across calls.
+
+    The context window and output budget are sized to the prompt and the
+    task's observed output lengths; max_tokens is an upper bound.
+    response_format (a JSON Schema) constrains decoding to that shape, and
+    stream_json stops generation if the model writes on past the JSON object. New
+    upstream calls wait for a scheduler slot in the task's priority lane.
+    Returns the generated text and Ollama's token/timing stats. Raises
+    CircuitOpenError without queueing while Ollama is known to be down and
+    PromptTooLargeError for prompts that cannot fit the largest context.
+    """
+    ollama_breaker.check()
+    prompt, num_ctx, num_predict = context_planner.plan(
+        prompt, task_name, max_tokens, prefix_tokens=estimate_tokens(system) if system else 0
+    )
+    lane = TASK_LANES.get(task_name, "standard")
+
+    def schedule():
+        return ollama_scheduler.run(
+            lane, lambda: post_ollama_generate(
+                prompt, temperature, num_predict, model, task_name, num_ctx, response_format, stream_json,
+                system=system,
             )
-        except httpx.ConnectError:
-            raise Exception("Cannot connect to Ollama. Is it running?")
+        )
 
+    if not LLM_SINGLEFLIGHT_ENABLED or json_field_listener.get() is not None:
+        # Field events go to this caller's listener only; a joiner would get none.
+        return await schedule()
+    options = {
+        "num_predict": num_predict, "num_ctx": num_ctx, "format": response_format, "system": system,
+        "stream_json": stream_json,
+    }
+    avoid = ollama_avoid_backends.get()
+    if avoid:
+        # A same-model hedge must not join the call it is hedging.
+        options["avoid"] = sorted(avoid)
+    key = make_cache_key(model, prompt, temperature, options)
+    return await ollama_singleflight.do(key, schedule)
+
+
+def hedge_model(model: str) -> Optional[str]:
+    """Model to hedge a slow call to model with, or None when a hedge would not help."""
+    if ollama_scheduler.stats()["active"] >= ollama_scheduler.max_concurrency:
+        return None  # no free upstream slot: a hedge would only queue behind the primary
+    if (
+        FALLBACK_MODEL != model
+        and model_residency.allows(FALLBACK_MODEL)
+        and any(b.healthy and b.has_model(FALLBACK_MODEL) for b in ollama_pool.backends)
+    ):
+        return FALLBACK_MODEL
+    return model
+
+
+async def call_ollama_hedged(
+    prompt: str, temperature: float, max_tokens: int, model: str, task_name: str,
+    valid: Callable[[str], bool], response_format: Optional[dict] = None, stream_json: bool = False,
+    system: Optional[str] = None,
+) -> Tuple[str, dict, str]:
+    """call_ollama_with_stats, hedged for HEDGE_TASKS; also returns the model that answered.
+
+    valid decides whether a finished answer can win the race (an invalid one
+    keeps waiting for the other call).
+    """
+    if not HEDGE_ENABLED or task_name not in HEDGE_TASKS or json_field_listener.get() is not None:
+        raw_response, stats = await call_ollama_with_stats(
+            prompt, temperature, max_tokens, model, task_name, response_format, stream_json, system=system
+        )
+        return raw_response, stats, model
 
-async def call_ollama(prompt: str, temperature: float, max_tokens: int, model: str) -> str:
-    """Make a single call to Ollama."""
-    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+    trace: List[str] = []
+
+    async def primary():
+        ollama_backend_trace.set(trace)
+        raw_response, stats = await call_ollama_with_stats(
+            prompt, temperature, max_tokens, model, task_name, response_format, stream_json, system=system
+        )
+        return raw_response, stats, model
+
+    def make_hedge():
+        target = hedge_model(model)
+        avoid: FrozenSet[str] = frozenset()
+        if target == model:
+            # Same model: only useful on a backend other than the one the primary is running on.
+            avoid = frozenset(trace)
+            if not avoid or not any(
+                b.healthy and b.has_model(model) and b.url not in avoid for b in ollama_pool.backends
+            ):
+                return None
+        elif target is None:
+            return None
+
+        async def hedge():
+            ollama_avoid_backends.set(avoid)
+            raw_response, stats = await call_ollama_with_stats(
+                prompt, temperature, max_tokens, target, task_name, response_format, stream_json,
+                system=system,
+            )
+            return raw_response, stats, target
+
+        logger.info(f"{task_name}: hedging slow {model} call with {target}")
+        return hedge
+
+    (raw_response, stats, answered_by), winner = await hedger.run(
+        task_name, primary, make_hedge, lambda result: valid(result[0]),
+        on_outcome=lambda outcome: HEDGES.inc(task=task_name, outcome=outcome),
+    )
+    if winner == "hedge":
+        stats = {**stats, "hedged": True}
+    return raw_response, stats, answered_by
+
+
+def queue_full_http_error(exc: QueueFullError) -> HTTPException:
+    """Turn a scheduler rejection into a fast 429 with a Retry-After hint."""
+    return HTTPException(
+        status_code=429,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def post_ollama_generate(
+    prompt: str, temperature: float, max_tokens: int, model: str,
+    task_name: str = "generate", num_ctx: int = 2048, response_format: Optional[dict] = None,
+    stream_json: bool = False, system: Optional[str] = None,
+) -> Tuple[str, dict]:
+    """Send one generation request to Ollama, recording outcome, size and token metrics."""
+    PROMPT_SIZE.observe(len(prompt) + len(system or ""), task=task_name)
+    start_time = time.perf_counter()
+    outcome = "error"
+    try:
+        raw_response, stats = await send_or_replay_generate(
+            prompt, temperature, max_tokens, model, task_name, num_ctx, response_format, stream_json, system
+        )
+        outcome = "success"
+        model_residency.touch(model)
+        RESPONSE_SIZE.observe(len(raw_response or ""), task=task_name)
+        record_token_stats(model, task_name, stats)
+        prompt_eval_s = stats.get("prompt_eval_duration_s", stats.get("first_token_s"))
+        if prompt_eval_s is not None:
+            OLLAMA_PROMPT_EVAL_LATENCY.observe(
+                prompt_eval_s, task=task_name, api="chat" if OLLAMA_CHAT_API else "generate"
+            )
+        if stats.get("stopped_early"):
+            OLLAMA_EARLY_STOPS.inc(task=task_name)
+            # Ollama sends no counts for a cut-off stream; learn from an estimate.
+            context_planner.tracker.record(task_name, estimate_tokens(raw_response))
+        elif "eval_count" in stats:
+            context_planner.tracker.record(
+                task_name, stats["eval_count"], truncated=stats.get("done_reason") == "length"
+            )
+        stats = {**stats, "num_ctx": num_ctx, "num_predict": max_tokens}
+        ollama_breaker.record_success()
+        return raw_response, stats
+    except httpx.TimeoutException:
+        outcome = "timeout"
+        ollama_breaker.record_failure()
+        raise
+    except httpx.ConnectError:
+        outcome = "connect_error"
+        ollama_breaker.record_failure()
+        raise
+    except httpx.HTTPStatusError as exc:
+        outcome = "http_error"
+        if is_backend_failure(exc):
+            ollama_breaker.record_failure()
+        raise
+    finally:
+        OLLAMA_CALLS.inc(task=task_name, outcome=outcome)
+        OLLAMA_LATENCY.observe(time.perf_counter() - start_time, task=task_name, outcome=outcome)
+
+
+def extract_ollama_stats(body: dict) -> dict:
+    """Pull token counts and timings out of an Ollama response (durations ns -> s)."""
+    stats = {}
+    for key in ("prompt_eval_count", "eval_count"):
+        if body.get(key) is not None:
+            stats[key] = int(body[key])
+    for key in ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration"):
+        if body.get(key) is not None:
+            stats[f"{key}_s"] = round(int(body[key]) / 1e9, 4)
+    if body.get("done_reason"):
+        stats["done_reason"] = body["done_reason"]
+
+    if stats.get("prompt_eval_duration_s") and "prompt_eval_count" in stats:
+        stats["prompt_tokens_per_s"] = round(stats["prompt_eval_count"] / stats["prompt_eval_duration_s"], 2)
+    if stats.get("eval_duration_s") and "eval_count" in stats:
+        stats["eval_tokens_per_s"] = round(stats["eval_count"] / stats["eval_duration_s"], 2)
+    return stats
+
+
+def record_token_stats(model: str, task_name: str, stats: dict) -> None:
+    """Aggregate Ollama token/timing stats per model and task."""
+    OLLAMA_PROMPT_TOKENS.inc(stats.get("prompt_eval_count", 0), model=model, task=task_name)
+    OLLAMA_EVAL_TOKENS.inc(stats.get("eval_count", 0), model=model, task=task_name)
+    OLLAMA_PROMPT_EVAL_SECONDS.inc(stats.get("prompt_eval_duration_s", 0.0), model=model, task=task_name)
+    OLLAMA_EVAL_SECONDS.inc(stats.get("eval_duration_s", 0.0), model=model, task=task_name)
+    if "load_duration_s" in stats:
+        OLLAMA_LOAD_SECONDS.observe(stats["load_duration_s"], model=model)
+
+
+def with_ollama_stats(response: dict, result: dict) -> dict:
+    """Attach Ollama token/timing stats when enabled globally or requested with ?stats=1."""
+    if result.get("ollama_stats") and (OLLAMA_STATS_IN_RESPONSES or include_ollama_stats.get()):
+        response["ollama_stats"] = result["ollama_stats"]
+    return response
+
+
+def build_generate_payload(
+    prompt: str, temperature: float, max_tokens: int, model: str,
+    num_ctx: int = 2048, response_format: Optional[dict] = None, system: Optional[str] = None,
+) -> dict:
+    """Request body for /api/chat (OLLAMA_CHAT_API) or /api/generate."""
+    payload = {
+        "model": model,
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {
+            "temperature": temperature,
+            "num_predict": max_tokens,
+            "num_ctx": num_ctx,    # Sized per request by context_planner
+            "num_thread": 4,       # Use 4 CPU threads
+        }
+    }
+    if OLLAMA_CHAT_API:
+        # Fixed system message first, variable input last: the rendered prefix
+        # stays identical across calls, so Ollama reuses its KV cache for it.
+        payload["messages"] = ([{"role": "system", "content": system}] if system else []) + [
+            {"role": "user", "content": prompt}
+        ]
+    else:
+        payload["prompt"] = prompt
+        if system:
+            payload["system"] = system
+    if response_format is not None:
+        payload["format"] = response_format
+    return payload
+
+
+def ollama_api_path(payload: dict) -> str:
+    return "/api/chat" if "messages" in payload else "/api/generate"
+
+
+def response_text(body: dict) -> str:
+    """Generated text from an /api/chat or /api/generate response (or stream chunk)."""
+    if "message" in body:
+        return (body.get("message") or {}).get("content", "")
+    return body.get("response", "")
+
+
+def is_backend_failure(exc: Exception) -> bool:
+    """Errors that mean the backend itself is down, so another one should be tried."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or (status == 403 and is_ngrok_response(exc.response))
+    return False
+
+
+async def post_generate_to_backend(backend: OllamaBackend, payload: dict) -> Tuple[str, dict]:
+    async with ollama_pool.http() as client:
         response = await client.post(
-            f"{OLLAMA_URL}/api/generate",
-            headers=get_ollama_headers(),
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": min(max_tokens, 1024),
-                    "num_ctx": 2048,      # Smaller context = faster on low RAM
-                    "num_thread": 4,       # Use 4 CPU threads
-                }
-            }
+            f"{backend.url}{ollama_api_path(payload)}",
+            headers=backend.headers,
+            json=payload,
+            timeout=REQUEST_TIMEOUT,
         )
         response.raise_for_status()
         try:
-            return response.json().get("response", "")
+            body = response.json()
         except json.JSONDecodeError as exc:
-            raise Exception("Ollama returned non-JSON output from /api/generate") from exc
+            raise Exception(f"Ollama returned non-JSON output from {ollama_api_path(payload)}") from exc
+        return response_text(body), extract_ollama_stats(body)
+
+
+async def stream_generate_from_backend(backend: OllamaBackend, payload: dict) -> Tuple[str, dict]:
+    """Stream a generation, hanging up if the model keeps writing after the JSON object.
+
+    The object's closing brace always arrives before Ollama's final "done"
+    chunk, which carries the token counts and timings (and keeps the pooled
+    connection reusable). So once the object closes, reading continues
+    through whitespace for OLLAMA_STREAM_JSON_GRACE_TOKENS chunks /
+    OLLAMA_STREAM_JSON_GRACE_SECONDS. Only text after the object, or a model
+    that outlasts the grace period, makes it hang up; closing the connection
+    makes Ollama abort the generation. Completed top-level fields are passed
+    to the current json_field_listener, if any.
+    """
+    parser = StreamingJSONParser()
+    listener = json_field_listener.get()
+    start_time = time.perf_counter()
+    first_token_s = None
+    completed_at = None
+    chunks_after = 0
+    async with ollama_pool.http() as client:
+        async with client.stream(
+            "POST",
+            f"{backend.url}{ollama_api_path(payload)}",
+            headers=backend.headers,
+            json={**payload, "stream": True},
+            timeout=REQUEST_TIMEOUT,
+        ) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    body = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise Exception(f"Ollama returned non-JSON output from {ollama_api_path(payload)}") from exc
+                if body.get("error"):
+                    raise Exception(f"Ollama generation failed: {body['error']}")
+
+                chunk = response_text(body)
+                if chunk and first_token_s is None:
+                    first_token_s = round(time.perf_counter() - start_time, 4)
+                if completed_at is not None and chunk:
+                    chunks_after += 1
+                for key, value in parser.feed(chunk):
+                    if listener:
+                        listener(key, value)
+                if body.get("done"):
+                    return parser.json_text or parser.text, extract_ollama_stats(body)
+                if parser.complete:
+                    if completed_at is None:
+                        completed_at = time.perf_counter()
+                    if (
+                        parser.trailing_text.strip()
+                        or chunks_after > OLLAMA_STREAM_JSON_GRACE_TOKENS
+                        or time.perf_counter() - completed_at > OLLAMA_STREAM_JSON_GRACE_SECONDS
+                    ):
+                        return parser.json_text, {"stopped_early": True, "first_token_s": first_token_s}
+    return parser.text, {}
+
+
+async def send_ollama_generate(
+    prompt: str, temperature: float, max_tokens: int, model: str,
+    num_ctx: int = 2048, response_format: Optional[dict] = None, stream_json: bool = False,
+    system: Optional[str] = None,
+) -> Tuple[str, dict]:
+    """Send one generation request, failing over across Ollama backends."""
+    payload = build_generate_payload(prompt, temperature, max_tokens, model, num_ctx, response_format, system)
+    post = stream_generate_from_backend if stream_json else post_generate_to_backend
+    # Stick to the backend that already has this template's prefix cached.
+    prefix = (system or prompt)[:OLLAMA_STICKY_PREFIX_CHARS]
+    candidates = ollama_pool.candidates(model, affinity_key=f"{model}|{prefix}")
+    avoid = ollama_avoid_backends.get()
+    if avoid:
+        candidates = [b for b in candidates if b.url not in avoid]
+    if not candidates:
+        raise httpx.ConnectError(f"No healthy Ollama backend has model {model}")
+    trace = ollama_backend_trace.get()
+
+    last_exc = None
+    for idx, backend in enumerate(candidates):
+        if idx > 0:
+            ollama_pool.failovers += 1
+            logger.warning(f"Failing over to Ollama backend {backend.url}")
+        if trace is not None:
+            trace.append(backend.url)
+        ollama_pool.acquire(backend)
+        try:
+            result = await post(backend, payload)
+            ollama_pool.mark_success(backend)
+            return result
+        except Exception as exc:
+            if not is_backend_failure(exc):
+                raise
+            ollama_pool.mark_failure(backend, exc)
+            logger.error(f"Ollama backend {backend.url} failed: {describe_ollama_error(exc)}")
+            last_exc = exc
+        finally:
+            ollama_pool.release(backend)
+    raise last_exc
+
+
+async def send_or_replay_generate(
+    prompt: str, temperature: float, max_tokens: int, model: str, task_name: str,
+    num_ctx: int, response_format: Optional[dict], stream_json: bool, system: Optional[str],
+) -> Tuple[str, dict]:
+    """send_ollama_generate, recorded to or replayed from the Ollama cassette when one is active."""
+    if not (ollama_cassette.recording or ollama_cassette.replaying):
+        return await send_ollama_generate(
+            prompt, temperature, max_tokens, model, num_ctx, response_format, stream_json, system=system
+        )
+    key = make_cache_key(model, prompt, temperature, {"system": system, "format": response_format})
+    if ollama_cassette.replaying:
+        entry = await ollama_cassette.replay(key)
+        raw_response = entry.get("response") or ""
+        listener = json_field_listener.get()
+        if stream_json and listener:
+            for field, value in StreamingJSONParser().feed(raw_response):
+                listener(field, value)
+        return raw_response, dict(entry.get("stats") or {})
+
+    request = {
+        "model": model, "task": task_name, "system": system, "prompt": prompt, "temperature": temperature,
+        "num_predict": max_tokens, "num_ctx": num_ctx, "structured": response_format is not None,
+        "stream_json": stream_json,
+    }
+    start_time = time.perf_counter()
+    try:
+        raw_response, stats = await send_ollama_generate(
+            prompt, temperature, max_tokens, model, num_ctx, response_format, stream_json, system=system
+        )
+    except Exception as exc:
+        ollama_cassette.record(key, request, time.perf_counter() - start_time, error=exc)
+        raise
+    ollama_cassette.record(key, request, time.perf_counter() - start_time, raw_response, stats)
+    return raw_response, stats
 
 
 @app.post("/generate")
@@ -459,53 +1321,52 @@ async def generate(req: PromptRequest):
 
         last_error = None
         for attempt in range(1, MAX_RETRIES + 1):
+            if attempt > 1:
+                OLLAMA_RETRIES.inc(task="generate")
             try:
                 start_time = time.time()
-                raw_response = await call_ollama(
-                    req.prompt, temperature, req.max_tokens, model
+                raw_response, ollama_stats = await call_ollama_with_stats(
+                    req.prompt, temperature, req.max_tokens, model, "generate"
                 )
                 elapsed = round(time.time() - start_time, 2)
                 logger.info(f"Attempt {attempt} succeeded in {elapsed}s")
 
                 # If task expects JSON, validate it
                 if req.task_type in ("json", "scoring", "parsing"):
-                    extracted = extract_json_from_response(raw_response)
-                    if extracted:
-                        return {
-                            "response": extracted,
+                    extraction = extract_json(raw_response, salvage=False)
+                    JSON_EXTRACTIONS.inc(task="generate", result=extraction.method if extraction else "failed")
+                    if extraction:
+                        return with_ollama_stats({
+                            "response": extraction.text,
                             "model": model,
                             "attempts": attempt,
                             "time": elapsed,
-                        }
+                        }, {"ollama_stats": ollama_stats})
                     else:
                         logger.warning(
                             f"Attempt {attempt}: Invalid JSON response, retrying..."
                         )
                         # Add explicit instruction on retry
                         if attempt < MAX_RETRIES:
-                            req.prompt = (
-                                req.prompt
-                                + "\n\nIMPORTANT: You MUST respond with valid JSON only. "
-                                "No explanations, no markdown, just the JSON object."
-                            )
+                            req.prompt = req.prompt + JSON_RETRY_HINT
                             temperature = max(0.0, temperature - 0.05)
                             continue
                         else:
                             # Last attempt — return raw response anyway
-                            return {
+                            return with_ollama_stats({
                                 "response": raw_response,
                                 "model": model,
                                 "attempts": attempt,
                                 "time": elapsed,
                                 "warning": "Could not extract valid JSON",
-                            }
+                            }, {"ollama_stats": ollama_stats})
                 else:
-                    return {
+                    return with_ollama_stats({
                         "response": raw_response,
                         "model": model,
                         "attempts": attempt,
                         "time": elapsed,
-                    }
+                    }, {"ollama_stats": ollama_stats})
 
             except httpx.ReadTimeout:
                 last_error = "Model timed out — your system may be low on RAM"
@@ -518,19 +1379,78 @@ async def generate(req: PromptRequest):
                 last_error = format_ollama_http_error(exc.response)
                 logger.error(f"Attempt {attempt}: Upstream HTTP error: {last_error}")
                 break
+            except QueueFullError as exc:
+                raise queue_full_http_error(exc)
+            except CircuitOpenError as exc:
+                raise HTTPException(status_code=503, detail=str(exc))
+            except PromptTooLargeError as exc:
+                raise HTTPException(status_code=413, detail=str(exc))
 
         raise HTTPException(status_code=504, detail=last_error or "All retries failed")
 
     except HTTPException:
         raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Generate error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def observe_task(fn):
+    """Record end-to-end latency and outcome of a run_*_task helper."""
+    @functools.wraps(fn)
+    async def wrapper(prompt: str, task_name: str, *args, **kwargs):
+        start_time = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await fn(prompt, task_name, *args, **kwargs)
+            if result.get("cached"):
+                outcome = "cached"
+            elif result.get("salvaged"):
+                outcome = "salvaged"
+            elif result.get("warning"):
+                outcome = "invalid_json"
+            else:
+                outcome = "success"
+            return result
+        except HTTPException as exc:
+            outcome = f"http_{exc.status_code}"
+            raise
+        finally:
+            TASK_LATENCY.observe(time.perf_counter() - start_time, task=task_name, outcome=outcome)
+    return wrapper
+
+
+def json_output_valid(text: str, schema: Optional[Type[BaseModel]]) -> bool:
+    """Whether a JSON task's raw output is complete and matches its schema."""
+    extraction = extract_json(text)
+    if extraction is None or extraction.method == "salvaged":
+        return False
+    return not (schema and schema_errors(schema, extraction.value))
+
+
 ## ── Helper: run a prompt through the model and get parsed JSON ──
-async def run_json_task(prompt: str, task_name: str, max_tokens: int = 2048) -> dict:
-    """Run a prompt expecting JSON output, with retries."""
+# Appended to the prompt when a JSON task is retried after invalid output.
+JSON_RETRY_HINT = (
+    "\n\nIMPORTANT: You MUST respond with valid JSON only. "
+    "No explanations, no markdown, just the JSON object."
+)
+
+
+@observe_task
+async def run_json_task(
+    prompt: str, task_name: str, max_tokens: int = 2048, schema: Optional[Type[BaseModel]] = None,
+    system: Optional[str] = None,
+) -> dict:
+    """Run a prompt expecting JSON output, with retries.
+
+    system holds the task's fixed instructions and prompt its variable input.
+
+    The output must match schema (default: the task's entry in TASK_SCHEMAS).
+    With OLLAMA_STRUCTURED_OUTPUT the schema also constrains decoding, so a
+    retry is only needed when the model ignores it.
+    """
     try:
         model = await get_available_model()
     except Exception as exc:
@@ -539,37 +1459,84 @@ async def run_json_task(prompt: str, task_name: str, max_tokens: int = 2048) ->
     temperature = get_temperature_for_task("json", None)
     logger.info(f"Task: {task_name} | Model: {model} | Temp: {temperature}")
 
+    cache_key = None
+    if LLM_CACHE_ENABLED and task_name in LLM_CACHE_TASKS:
+        cache_key = make_cache_key(model, prompt, temperature, {"max_tokens": max_tokens, "system": system})
+        lookup_start = time.time()
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            elapsed = round(time.time() - lookup_start, 4)
+            logger.info(f"{task_name} served from cache in {elapsed}s")
+            return {**cached, "inference_time": elapsed, "cached": True}
+
+    schema = schema or TASK_SCHEMAS.get(task_name)
+    response_format = ollama_json_schema(schema) if schema and OLLAMA_STRUCTURED_OUTPUT else None
+    output_format = "schema" if response_format else "free"
+    JSON_TASK_RUNS.inc(task=task_name, format=output_format)
+
     last_error = None
     current_prompt = prompt
     current_temp = temperature
     for attempt in range(1, MAX_RETRIES + 1):
+        if attempt > 1:
+            OLLAMA_RETRIES.inc(task=task_name)
+            JSON_TASK_RETRIES.inc(task=task_name, format=output_format)
         try:
             start_time = time.time()
-            raw_response = await call_ollama(current_prompt, current_temp, max_tokens, model)
+            raw_response, ollama_stats, answered_by = await call_ollama_hedged(
+                current_prompt, current_temp, max_tokens, model, task_name,
+                lambda text: json_output_valid(text, schema), response_format,
+                stream_json=OLLAMA_STREAM_JSON, system=system,
+            )
             elapsed = round(time.time() - start_time, 2)
             logger.info(f"{task_name} attempt {attempt} succeeded in {elapsed}s")
 
-            extracted = extract_json_from_response(raw_response)
-            if extracted:
-                parsed = json.loads(extracted)
-                return {"data": parsed, "model": model, "inference_time": elapsed}
+            extraction = extract_json(raw_response)
+            JSON_EXTRACTIONS.inc(task=task_name, result=extraction.method if extraction else "failed")
+            parsed = extraction.value if extraction else None
+            if extraction and extraction.method == "salvaged":
+                # Cut off mid-object: a retry with the same budget would be cut off too.
+                logger.warning(f"{task_name} attempt {attempt}: Truncated JSON, salvaged {len(parsed)} fields")
+                return {
+                    "data": parsed,
+                    "model": answered_by,
+                    "inference_time": elapsed,
+                    "ollama_stats": ollama_stats,
+                    "warning": f"Model output was truncated; recovered {len(parsed)} top-level fields",
+                    "salvaged": True,
+                }
+            schema_error = schema_errors(schema, parsed) if extraction and schema else None
+            if extraction and not schema_error:
+                if cache_key:
+                    llm_cache.set(cache_key, {"data": parsed, "model": answered_by})
+                return {"data": parsed, "model": answered_by, "inference_time": elapsed, "ollama_stats": ollama_stats}
+
+            if schema_error:
+                JSON_SCHEMA_ERRORS.inc(task=task_name, format=output_format)
+                logger.warning(f"{task_name} attempt {attempt}: Output does not match schema ({schema_error}), retrying...")
             else:
                 logger.warning(f"{task_name} attempt {attempt}: Invalid JSON, retrying...")
-                if attempt < MAX_RETRIES:
-                    current_prompt = (
-                        prompt
-                        + "\n\nIMPORTANT: You MUST respond with valid JSON only. "
-                        "No explanations, no markdown, just the JSON object."
-                    )
-                    current_temp = max(0.0, current_temp - 0.05)
-                else:
-                    # Last attempt — return raw response wrapped
-                    return {
-                        "data": raw_response,
-                        "model": model,
-                        "inference_time": elapsed,
-                        "warning": "Could not extract valid JSON",
-                    }
+            if attempt < MAX_RETRIES:
+                current_prompt = prompt + JSON_RETRY_HINT
+                current_temp = max(0.0, current_temp - 0.05)
+            elif schema_error:
+                # Last attempt — return the JSON we got, flagged
+                return {
+                    "data": parsed,
+                    "model": answered_by,
+                    "inference_time": elapsed,
+                    "ollama_stats": ollama_stats,
+                    "warning": f"Output does not match the expected schema: {schema_error}",
+                }
+            else:
+                # Last attempt — return raw response wrapped
+                return {
+                    "data": raw_response,
+                    "model": answered_by,
+                    "inference_time": elapsed,
+                    "ollama_stats": ollama_stats,
+                    "warning": "Could not extract valid JSON",
+                }
         except httpx.ReadTimeout:
             last_error = "Model timed out"
             logger.warning(f"{task_name} attempt {attempt}: Timeout")
@@ -581,11 +1548,20 @@ async def run_json_task(prompt: str, task_name: str, max_tokens: int = 2048) ->
             last_error = format_ollama_http_error(exc.response)
             logger.error(f"{task_name} attempt {attempt}: Upstream HTTP error: {last_error}")
             break
+        except QueueFullError as exc:
+            raise queue_full_http_error(exc)
+        except CircuitOpenError as exc:
+            raise HTTPException(status_code=503, detail=str(exc))
+        except PromptTooLargeError as exc:
+            raise HTTPException(status_code=413, detail=str(exc))
 
     raise HTTPException(status_code=504, detail=last_error or "All retries failed")
 
 
-async def run_text_task(prompt: str, task_name: str, max_tokens: int = 2048) -> dict:
+@observe_task
+async def run_text_task(
+    prompt: str, task_name: str, max_tokens: int = 2048, system: Optional[str] = None
+) -> dict:
     """Run a prompt expecting free-text output."""
     try:
         model = await get_available_model()
@@ -594,227 +1570,358 @@ async def run_text_task(prompt: str, task_name: str, max_tokens: int = 2048) ->
 
     temperature = get_temperature_for_task("text", None)
     start_time = time.time()
-    raw_response = await call_ollama(prompt, temperature, max_tokens, model)
+    try:
+        raw_response, ollama_stats, answered_by = await call_ollama_hedged(
+            prompt, temperature, max_tokens, model, task_name, lambda text: bool(text.strip()), system=system
+        )
+    except QueueFullError as exc:
+        raise queue_full_http_error(exc)
+    except CircuitOpenError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except PromptTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
     elapsed = round(time.time() - start_time, 2)
     logger.info(f"{task_name} completed in {elapsed}s")
-    return {"response": raw_response, "model": model, "inference_time": elapsed}
+    return {"response": raw_response, "model": answered_by, "inference_time": elapsed, "ollama_stats": ollama_stats}
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode("utf-8")
+
+
+def ndjson_line(event: dict) -> bytes:
+    return (json.dumps(event, default=str) + "\n").encode("utf-8")
+
+
+def stream_json_task(
+    prompt: str, task_name: str, max_tokens: int = 2048, system: Optional[str] = None
+) -> StreamingResponse:
+    """Run a JSON task, streaming NDJSON events to the client.
+
+    Emits {"event": "field", "key", "value"} for each top-level field as the
+    model completes it, then one {"event": "result", ...} with the validated
+    data (or {"event": "error", ...}). Fields may repeat if a retry was
+    needed; the result event is authoritative.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        json_field_listener.set(lambda key, value: queue.put_nowait({"event": "field", "key": key, "value": value}))
+        try:
+            result = await run_json_task(prompt, task_name, max_tokens, system=system)
+            event = {
+                "event": "result",
+                "data": result.get("data", {}),
+                "model": result.get("model"),
+                "inference_time": result.get("inference_time"),
+            }
+            for key in ("cached", "warning"):
+                if result.get(key):
+                    event[key] = result[key]
+            queue.put_nowait(with_ollama_stats(event, result))
+        except HTTPException as exc:
+            queue.put_nowait({"event": "error", "status": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            logger.error(f"{task_name} stream error: {str(exc)}")
+            queue.put_nowait({"event": "error", "status": 500, "detail": str(exc)})
+        finally:
+            queue.put_nowait(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while (event := await queue.get()) is not None:
+                yield ndjson_line(event)
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 
 # ══════════════════════════════════════════════════════
 #  TASK-SPECIFIC ENDPOINTS
 # ══════════════════════════════════════════════════════
 
-@app.post("/parse-resume")
-async def parse_resume(req: ParseResumeRequest):
-    """Parse resume either with regex (fast) or via Ollama (LLM), based on RESUME_PARSER_MODE."""
-    try:
-        start_time = time.time()
-        parser_warning = None
+# ── Resume parsing helpers (shared by /parse-resume and /analyze-resume) ──
 
-        if RESUME_PARSER_MODE in ("ollama", "llm"):
-            # LLMs are slower and more token-limited; keep input shorter.
-            text = req.resumeText[:6000]
-            prompt = f"""You are an expert resume parser.
+# Task prompts are split into a fixed system message (role, schema, rules)
+# and a user message holding only the variable input, so every call of a
+# task shares the same prefix and Ollama can reuse its evaluated KV cache.
+
+PARSE_SYSTEM_PROMPT = """You are an expert resume parser.
 
 Extract structured data from the resume text.
 
 Return ONLY a valid JSON object with EXACTLY these keys:
-{{
-  \"fullName\": \"\",
-  \"email\": \"\",
-  \"phone\": \"\",
-  \"location\": \"\",
-  \"summary\": \"\",
-  \"skills\": [\"\"],
-  \"experience\": [{{\"jobTitle\": \"\", \"company\": \"\", \"duration\": \"\", \"description\": \"\"}}],
-  \"education\": [{{\"degree\": \"\", \"school\": \"\", \"field\": \"\", \"year\": \"\"}}],
-  \"projects\": [\"\"],
-  \"certifications\": [\"\"],
-  \"score\": 0,
-  \"scoreBreakdown\": {{}},
-  \"strengths\": [\"\"],
-  \"improvements\": [\"\"]
-}}
+{
+  "fullName": "",
+  "email": "",
+  "phone": "",
+  "location": "",
+  "summary": "",
+  "skills": [""],
+  "experience": [{"jobTitle": "", "company": "", "duration": "", "description": ""}],
+  "education": [{"degree": "", "school": "", "field": "", "year": ""}],
+  "projects": [""],
+  "certifications": [""],
+  "score": 0,
+  "scoreBreakdown": {},
+  "strengths": [""],
+  "improvements": [""]
+}
 
 Rules:
 - If unknown, use empty string, empty list, empty object, or 0.
 - Do NOT include markdown or explanations.
 - "skills" must contain ONLY 5 to 6 technical skills.
 - Exclude project names, company names, job titles, degree names, and section headers from "skills".
-- Each skill should be short (1 to 4 words).
+- Each skill should be short (1 to 4 words)."""
+
+
+def build_parse_prompt(text: str) -> Tuple[str, str]:
+    """(system, user) messages for an LLM resume parse."""
+    return PARSE_SYSTEM_PROMPT, f"RESUME TEXT:\n{text}"
+
+
+def build_blocked_terms(parsed):
+    blocked = set()
+
+    for project in parsed.get("projects") or []:
+        p = str(project).strip().lower()
+        if p:
+            blocked.add(p)
+
+    for exp in parsed.get("experience") or []:
+        if isinstance(exp, dict):
+            title = str(exp.get("jobTitle", "")).strip().lower()
+            company = str(exp.get("company", "")).strip().lower()
+            if title:
+                blocked.add(title)
+            if company:
+                blocked.add(company)
+
+    for edu in parsed.get("education") or []:
+        if isinstance(edu, dict):
+            degree = str(edu.get("degree", "")).strip().lower()
+            school = str(edu.get("school", "")).strip().lower()
+            field = str(edu.get("field", "")).strip().lower()
+            if degree:
+                blocked.add(degree)
+            if school:
+                blocked.add(school)
+            if field:
+                blocked.add(field)
+
+    return blocked
+
+
+def split_skill_candidates(raw_skill):
+    text_skill = str(raw_skill or "").strip()
+    if not text_skill:
+        return []
+
+    text_skill = re.sub(r"^[\-\*\s]+", "", text_skill)
+    parts = [p.strip() for p in re.split(r"[,\n|;/]+", text_skill) if p.strip()]
+
+    expanded = []
+    for part in parts:
+        if " and " in part and len(part.split()) <= 6:
+            expanded.extend([x.strip() for x in part.split(" and ") if x.strip()])
+        else:
+            expanded.append(part)
+    return expanded
+
+
+def normalize_skill(skill):
+    cleaned = re.sub(r"^[\s\-.,:;]+|[\s\-.,:;]+$", "", str(skill))
+    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    return cleaned
+
+
+def is_noise_skill(skill, blocked_terms):
+    s = str(skill or "").strip().lower()
+    if not s:
+        return True
+    if len(s) < 2 or len(s) > 35:
+        return True
+    if s in blocked_terms:
+        return True
+    if re.search(r"https?://|www\\.|@", s):
+        return True
+    if re.search(r"\b(19|20)\d{2}\b", s):
+        return True
+    if any(k in s for k in (
+        "project", "experience", "intern", "objective", "summary",
+        "education", "university", "college", "responsible",
+        "developed", "designed", "implemented", "achievement",
+        "certification", "award"
+    )):
+        return True
+    token_count = len(re.findall(r"[a-z0-9+#./-]+", s))
+    if token_count == 0 or token_count > 4:
+        return True
+    return False
+
+
+def sanitize_skills(skills, fallback_skills, parsed):
+    blocked_terms = build_blocked_terms(parsed)
+    chosen = []
+    seen = set()
+
+    def add_candidates(raw):
+        for candidate in split_skill_candidates(raw):
+            normalized = normalize_skill(candidate)
+            lowered = normalized.lower()
+            if not normalized or lowered in seen:
+                continue
+            if is_noise_skill(normalized, blocked_terms):
+                continue
+            seen.add(lowered)
+            chosen.append(normalized)
+            if len(chosen) >= 6:
+                return True
+        return False
+
+    for skill in skills or []:
+        if add_candidates(skill):
+            break
 
-RESUME TEXT:
-{text}
-"""
+    if len(chosen) < 5:
+        for skill in fallback_skills or []:
+            if add_candidates(skill):
+                break
 
-            try:
-                result = await run_json_task(prompt, "parse-resume-ollama", max_tokens=1536)
-                elapsed = result.get("inference_time")
-                data = result.get("data", {})
-                if not isinstance(data, dict):
-                    data = {}
-
-                # --- POST-PROCESSING: Ensure sections are not mixed and cap skills ---
-                def build_blocked_terms(parsed):
-                    blocked = set()
-
-                    for project in parsed.get("projects") or []:
-                        p = str(project).strip().lower()
-                        if p:
-                            blocked.add(p)
-
-                    for exp in parsed.get("experience") or []:
-                        if isinstance(exp, dict):
-                            title = str(exp.get("jobTitle", "")).strip().lower()
-                            company = str(exp.get("company", "")).strip().lower()
-                            if title:
-                                blocked.add(title)
-                            if company:
-                                blocked.add(company)
-
-                    for edu in parsed.get("education") or []:
-                        if isinstance(edu, dict):
-                            degree = str(edu.get("degree", "")).strip().lower()
-                            school = str(edu.get("school", "")).strip().lower()
-                            field = str(edu.get("field", "")).strip().lower()
-                            if degree:
-                                blocked.add(degree)
-                            if school:
-                                blocked.add(school)
-                            if field:
-                                blocked.add(field)
-
-                    return blocked
-
-                def split_skill_candidates(raw_skill):
-                    text_skill = str(raw_skill or "").strip()
-                    if not text_skill:
-                        return []
-
-                    text_skill = re.sub(r"^[\-\*\s]+", "", text_skill)
-                    parts = [p.strip() for p in re.split(r"[,\n|;/]+", text_skill) if p.strip()]
-
-                    expanded = []
-                    for part in parts:
-                        if " and " in part and len(part.split()) <= 6:
-                            expanded.extend([x.strip() for x in part.split(" and ") if x.strip()])
-                        else:
-                            expanded.append(part)
-                    return expanded
-
-                def normalize_skill(skill):
-                    cleaned = re.sub(r"^[\s\-.,:;]+|[\s\-.,:;]+$", "", str(skill))
-                    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-                    return cleaned
-
-                def is_noise_skill(skill, blocked_terms):
-                    s = str(skill or "").strip().lower()
-                    if not s:
-                        return True
-                    if len(s) < 2 or len(s) > 35:
-                        return True
-                    if s in blocked_terms:
-                        return True
-                    if re.search(r"https?://|www\\.|@", s):
-                        return True
-                    if re.search(r"\b(19|20)\d{2}\b", s):
-                        return True
-                    if any(k in s for k in (
-                        "project", "experience", "intern", "objective", "summary",
-                        "education", "university", "college", "responsible",
-                        "developed", "designed", "implemented", "achievement",
-                        "certification", "award"
-                    )):
-                        return True
-                    token_count = len(re.findall(r"[a-z0-9+#./-]+", s))
-                    if token_count == 0 or token_count > 4:
-                        return True
-                    return False
-
-                def sanitize_skills(skills, fallback_skills, parsed):
-                    blocked_terms = build_blocked_terms(parsed)
-                    chosen = []
-                    seen = set()
-
-                    def add_candidates(raw):
-                        for candidate in split_skill_candidates(raw):
-                            normalized = normalize_skill(candidate)
-                            lowered = normalized.lower()
-                            if not normalized or lowered in seen:
-                                continue
-                            if is_noise_skill(normalized, blocked_terms):
-                                continue
-                            seen.add(lowered)
-                            chosen.append(normalized)
-                            if len(chosen) >= 6:
-                                return True
-                        return False
-
-                    for skill in skills or []:
-                        if add_candidates(skill):
-                            break
-
-                    if len(chosen) < 5:
-                        for skill in fallback_skills or []:
-                            if add_candidates(skill):
-                                break
-
-                    return chosen[:6]
-
-                def filter_experience(experience, skills):
-                    # Remove any experience entry that is just a skill
-                    skill_set = set(str(s).strip().lower() for s in (skills or []))
-                    filtered = []
-                    for exp in experience or []:
-                        if isinstance(exp, dict):
-                            title = str(exp.get("jobTitle", "")).strip().lower()
-                            if title and title not in skill_set:
-                                filtered.append(exp)
-                    return filtered
-
-                fallback_skills = []
-                try:
-                    fallback_data = regex_parse_resume(text)
-                    if isinstance(fallback_data, dict):
-                        fallback_skills = fallback_data.get("skills", [])
-                except Exception:
-                    fallback_skills = []
+    return chosen[:6]
 
-                data["skills"] = sanitize_skills(data.get("skills", []), fallback_skills, data)
 
-                if "experience" in data:
-                    data["experience"] = filter_experience(data.get("experience", []), data["skills"])
+def filter_experience(experience, skills):
+    # Remove any experience entry that is just a skill
+    skill_set = set(str(s).strip().lower() for s in (skills or []))
+    filtered = []
+    for exp in experience or []:
+        if isinstance(exp, dict):
+            title = str(exp.get("jobTitle", "")).strip().lower()
+            if title and title not in skill_set:
+                filtered.append(exp)
+    return filtered
 
-                return {
-                    "data": data,
-                    "model": result.get("model"),
-                    "inference_time": elapsed,
-                }
+
+def postprocess_parsed_resume(data, fallback_skills) -> dict:
+    """Ensure sections are not mixed and cap skills."""
+    data["skills"] = sanitize_skills(data.get("skills", []), fallback_skills, data)
+
+    if "experience" in data:
+        data["experience"] = filter_experience(data.get("experience", []), data["skills"])
+    return data
+
+
+def regex_parse_resume(text: str) -> dict:
+    """Rule-based parse. resume_parser is imported on first use: its skill
+    tables and patterns are a noticeable part of a cold start, and in ollama
+    mode it is only needed to top up skills or as a fallback."""
+    from resume_parser import parse_resume
+    return parse_resume(text)
+
+
+def regex_skills(text: str) -> list:
+    """Skills from the rule-based parser, used to top up sparse LLM skill lists."""
+    try:
+        fallback_data = regex_parse_resume(text)
+        if isinstance(fallback_data, dict):
+            return fallback_data.get("skills", [])
+    except Exception:
+        pass
+    return []
+
+
+async def parse_resume_with_ollama(text: str, fallback_skills: Optional[list] = None) -> dict:
+    """LLM resume parse with post-processing; raises when Ollama cannot deliver."""
+    system, prompt = build_parse_prompt(text)
+    result = await run_json_task(prompt, "parse-resume-ollama", max_tokens=1536, system=system)
+    data = result.get("data", {})
+    if not isinstance(data, dict):
+        data = {}
+
+    if fallback_skills is None:
+        fallback_skills = await cpu_executor.run(regex_skills, text)
+    data = await cpu_executor.run(postprocess_parsed_resume, data, fallback_skills)
+
+    return with_ollama_stats({
+        "data": data,
+        "model": result.get("model"),
+        "inference_time": result.get("inference_time"),
+    }, result)
+
+
+async def parse_resume_with_regex(text: str, start_time: float) -> dict:
+    """Rule-based parse (fast, deterministic), run in the CPU executor."""
+    data = await cpu_executor.run(regex_parse_resume, text)
+    elapsed = round(time.time() - start_time, 3)
+
+    logger.info(
+        f"Regex parse completed in {elapsed}s — "
+        f"skills={len(data.get('skills', []))}, "
+        f"exp={len(data.get('experience', []))}, "
+        f"edu={len(data.get('education', []))}, "
+        f"score={data.get('score', 0)}"
+    )
+
+    return {
+        "data": data,
+        "model": "regex-nlp",
+        "inference_time": elapsed,
+    }
+
+
+def provisional_parse(response: dict, job: Optional[dict] = None, warning: Optional[str] = None) -> dict:
+    """Mark a regex parse as provisional and point at the job refining it."""
+    response["provisional"] = True
+    if job:
+        response["jobId"] = job["id"]
+        response["refinement"] = {"status": f"/jobs/{job['id']}", "events": f"/jobs/{job['id']}/events"}
+    if warning:
+        response["warning"] = warning
+    return response
+
+
+@app.post("/parse-resume")
+async def parse_resume(req: ParseResumeRequest):
+    """Parse resume either with regex (fast) or via Ollama (LLM), based on RESUME_PARSER_MODE.
+
+    With progressive=true (Ollama mode) the regex parse is returned at once,
+    marked provisional, and the LLM parse runs as a job (see /jobs).
+    """
+    try:
+        start_time = time.time()
+        parser_warning = None
+
+        if RESUME_PARSER_MODE in ("ollama", "llm"):
+            # LLMs are slower and more token-limited; keep input shorter.
+            text = req.resumeText[:6000]
+            progressive = PARSE_RESUME_PROGRESSIVE if req.progressive is None else req.progressive
+            if progressive:
+                response = await parse_resume_with_regex(req.resumeText[:15000], start_time)
+                try:
+                    await job_queue.check_webhook(req.webhookUrl)
+                    job = job_queue.submit("parse-resume-refine", {"resumeText": text}, req.webhookUrl)
+                except (QueueFullError, ValueError) as exc:
+                    return provisional_parse(response, warning=f"LLM refinement not queued: {exc}")
+                return provisional_parse(response, job)
+            try:
+                return await parse_resume_with_ollama(text)
             except HTTPException as exc:
                 parser_warning = str(exc.detail)
                 logger.warning("parse-resume fallback activated: %s", parser_warning)
             except Exception as exc:
                 parser_warning = str(exc)
                 logger.warning("parse-resume fallback activated: %s", parser_warning)
+            FALLBACKS.inc(endpoint="parse-resume", fallback="regex-nlp")
 
         # Default: Rule-based parser (instant, deterministic)
         text = req.resumeText[:15000]  # Regex can handle more text than LLM
-        data = regex_parse_resume(text)
-        elapsed = round(time.time() - start_time, 3)
-
-        logger.info(
-            f"Regex parse completed in {elapsed}s — "
-            f"skills={len(data.get('skills', []))}, "
-            f"exp={len(data.get('experience', []))}, "
-            f"edu={len(data.get('education', []))}, "
-            f"score={data.get('score', 0)}"
-        )
-
-        response = {
-            "data": data,
-            "model": "regex-nlp",
-            "inference_time": elapsed,
-        }
+        response = await parse_resume_with_regex(text, start_time)
         if parser_warning:
             response["warning"] = parser_warning
 
@@ -824,47 +1931,80 @@ RESUME TEXT:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/score-resume")
-async def score_resume(req: ScoreResumeRequest):
-    """Score a resume, optionally against a specific job."""
-    try:
-        text = req.resumeText[:6000]
-        job_context = ""
-        if req.jobTitle:
-            job_context = f"\nTarget Job Title: {req.jobTitle}"
-        if req.jobSkills:
-            job_context += f"\nRequired Skills: {', '.join(req.jobSkills)}"
+async def refine_parsed_resume(req: RefineParsedResumeRequest) -> dict:
+    """LLM parse for a progressive /parse-resume (runs as a job)."""
+    return await parse_resume_with_ollama(req.resumeText, req.fallbackSkills)
 
-        prompt = f"""You are a resume evaluator. Score the following resume.{job_context}
+
+@app.post("/parse-resume/stream")
+async def parse_resume_stream(req: ParseResumeRequest):
+    """Server-sent events: "provisional" (regex parse) at once, then "refined"
+    (LLM parse) or "error" when the model cannot deliver."""
+    provisional = provisional_parse(await parse_resume_with_regex(req.resumeText[:15000], time.time()))
+    text = req.resumeText[:6000]
+
+    async def events():
+        yield sse_event("provisional", provisional)
+        if RESUME_PARSER_MODE not in ("ollama", "llm"):
+            return
+        try:
+            refined = await parse_resume_with_ollama(text)
+            yield sse_event("refined", refined)
+        except HTTPException as exc:
+            yield sse_event("error", {"status": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            logger.error(f"parse-resume stream error: {str(exc)}")
+            yield sse_event("error", {"status": 500, "detail": str(exc)})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+SCORE_SYSTEM_PROMPT = """You are a resume evaluator. Score the resume you are given, against the target job when one is provided.
 
 Return ONLY a valid JSON object:
-{{
+{
   "overallScore": 75,
-  "categoryScores": {{
+  "categoryScores": {
     "experience": 80,
     "education": 70,
     "skills": 75,
     "formatting": 65,
     "impact": 70
-  }},
+  },
   "strengths": ["strength1", "strength2"],
   "improvements": ["area to improve 1", "area to improve 2"],
   "summary": "brief evaluation summary"
-}}
+}
 
 All scores should be 0-100.
+Respond with ONLY the JSON object."""
 
-RESUME TEXT:
-{text}
 
-Respond with ONLY the JSON object."""
+def build_score_prompt(
+    text: str, job_title: Optional[str] = None, job_skills: Optional[List[str]] = None
+) -> Tuple[str, str]:
+    job_context = ""
+    if job_title:
+        job_context = f"Target Job Title: {job_title}\n"
+    if job_skills:
+        job_context += f"Required Skills: {', '.join(job_skills)}\n"
 
-        result = await run_json_task(prompt, "score-resume")
-        return {
+    return SCORE_SYSTEM_PROMPT, f"{job_context}\nRESUME TEXT:\n{text}".lstrip()
+
+
+@app.post("/score-resume")
+async def score_resume(req: ScoreResumeRequest):
+    """Score a resume, optionally against a specific job."""
+    try:
+        text = req.resumeText[:6000]
+        system, prompt = build_score_prompt(text, req.jobTitle, req.jobSkills)
+
+        result = await run_json_task(prompt, "score-resume", system=system)
+        return with_ollama_stats({
             "data": result.get("data", {}),
             "model": result.get("model"),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
     except HTTPException:
         raise
     except Exception as e:
@@ -872,48 +2012,60 @@ Respond with ONLY the JSON object."""
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/generate-interview")
-async def generate_interview(req: GenerateInterviewRequest):
-    """Generate interview questions for a job role."""
-    try:
-        skills_str = ", ".join(req.skills) if req.skills else "general"
-        prompt = f"""You are an interview coach. Generate {req.count} interview questions for a {req.jobRole} position.
-Skills to focus on: {skills_str}
-Difficulty: {req.difficulty}
+@app.post("/score-resume/stream")
+async def score_resume_stream(req: ScoreResumeRequest):
+    """Like /score-resume, streaming each score field as soon as it is generated."""
+    system, prompt = build_score_prompt(req.resumeText[:6000], req.jobTitle, req.jobSkills)
+    return stream_json_task(prompt, "score-resume", system=system)
+
+
+INTERVIEW_SYSTEM_PROMPT = """You are an interview coach. Generate interview questions for the position described by the user.
 
 Important constraints:
 - This is for PRACTICE preparation, so make questions realistic and job-focused.
-- Questions MUST be tailored to the role, tech stack, and difficulty above.
+- Questions MUST be tailored to the role, tech stack, and difficulty given.
 - Avoid generic questions unless explicitly adapted to the role context.
 - Prefer scenario-based and technical depth checks over generic textbook prompts.
 - Keep each question concise and interview-ready.
 
 Return ONLY a valid JSON object:
-{{
+{
   "questions": [
-    {{
+    {
       "id": 1,
       "question": "the interview question",
       "type": "technical|behavioral|situational",
       "difficulty": "easy|medium|hard",
       "expectedKeywords": ["keyword1", "keyword2"],
       "sampleAnswer": "brief ideal answer outline"
-    }}
+    }
   ]
-}}
+}
 
-Generate exactly {req.count} questions.
 Respond with ONLY the JSON object."""
 
-        result = await run_json_task(prompt, "generate-interview")
-        return {
+
+@app.post("/generate-interview")
+async def generate_interview(req: GenerateInterviewRequest):
+    """Generate interview questions for a job role."""
+    try:
+        skills_str = ", ".join(req.skills) if req.skills else "general"
+        prompt = f"""Generate {req.count} interview questions for a {req.jobRole} position.
+Skills to focus on: {skills_str}
+Difficulty: {req.difficulty}
+
+Generate exactly {req.count} questions."""
+
+        result = await run_json_task(prompt, "generate-interview", system=INTERVIEW_SYSTEM_PROMPT)
+        return with_ollama_stats({
             "data": result.get("data", {}),
             "model": result.get("model"),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
     except HTTPException as exc:
         if exc.status_code in (503, 504):
             logger.warning("generate-interview fallback activated: %s", exc.detail)
+            FALLBACKS.inc(endpoint="generate-interview", fallback="fallback-heuristic")
             start_time = time.time()
             fallback_data = generate_interview_questions_fallback(
                 job_role=req.jobRole,
@@ -934,84 +2086,219 @@ Respond with ONLY the JSON object."""
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/evaluate-answer")
-async def evaluate_answer(req: EvaluateAnswerRequest):
-    """Evaluate a single interview answer."""
-    try:
-        keywords_str = ", ".join(req.expectedKeywords) if req.expectedKeywords else "none specified"
-        prompt = f"""You are an interview evaluator. Evaluate the candidate's answer.
-
-Question: {req.question}
-Candidate's Answer: {req.userAnswer}
-Expected Keywords: {keywords_str}
+EVALUATE_SYSTEM_PROMPT = """You are an interview evaluator. Evaluate the candidate's answer.
 
 Return ONLY a valid JSON object:
-{{
+{
   "score": 75,
   "feedback": "detailed feedback on the answer",
   "strengths": ["what was good"],
   "improvements": ["what could be better"],
   "keywordMatches": ["keywords the candidate mentioned"],
   "missedKeywords": ["important keywords that were missed"]
-}}
+}
 
 Score should be 0-100.
 Respond with ONLY the JSON object."""
 
-        result = await run_json_task(prompt, "evaluate-answer")
-        return {
-            "data": result.get("data", {}),
-            "model": result.get("model"),
-            "inference_time": result.get("inference_time"),
-        }
+EVALUATE_BATCH_SYSTEM_PROMPT = """You are an interview evaluator. Evaluate each of the candidate's answers independently.
+
+Return ONLY a valid JSON object:
+{
+  "evaluations": [
+    {
+      "index": 1,
+      "score": 75,
+      "feedback": "one or two sentences of feedback on the answer",
+      "strengths": ["what was good"],
+      "improvements": ["what could be better"],
+      "keywordMatches": ["keywords the candidate mentioned"],
+      "missedKeywords": ["important keywords that were missed"]
+    }
+  ]
+}
+
+Return exactly one evaluation per answer, in order.
+Scores should be 0-100.
+Respond with ONLY the JSON object."""
+
+
+def evaluate_answer_fallback_response(req: EvaluateAnswerRequest, warning: str) -> dict:
+    """Grade an answer with the local heuristic, in the endpoint's response shape."""
+    FALLBACKS.inc(endpoint="evaluate-answer", fallback="fallback-heuristic")
+    start_time = time.time()
+    fallback = evaluate_answer_heuristic(req.question, req.userAnswer, req.expectedKeywords)
+    elapsed = round(time.time() - start_time, 4)
+    return {
+        "data": fallback,
+        "model": "fallback-heuristic",
+        "inference_time": elapsed,
+        "warning": warning,
+    }
+
+
+async def evaluate_single_answer(req: EvaluateAnswerRequest) -> dict:
+    """Grade one answer with its own prompt."""
+    keywords_str = ", ".join(req.expectedKeywords) if req.expectedKeywords else "none specified"
+    prompt = f"""Question: {req.question}
+Candidate's Answer: {req.userAnswer}
+Expected Keywords: {keywords_str}"""
+
+    try:
+        result = await run_json_task(prompt, "evaluate-answer", system=EVALUATE_SYSTEM_PROMPT)
     except HTTPException as exc:
         # Keep interview flow alive when Ollama tunnel is down/blocked.
         if exc.status_code in (503, 504):
             logger.warning("evaluate-answer fallback activated: %s", exc.detail)
-            start_time = time.time()
-            fallback = evaluate_answer_heuristic(req.question, req.userAnswer, req.expectedKeywords)
-            elapsed = round(time.time() - start_time, 4)
-            return {
-                "data": fallback,
-                "model": "fallback-heuristic",
-                "inference_time": elapsed,
-                "warning": str(exc.detail),
-            }
+            return evaluate_answer_fallback_response(req, str(exc.detail))
+        raise
+    return with_ollama_stats({
+        "data": result.get("data", {}),
+        "model": result.get("model"),
+        "inference_time": result.get("inference_time"),
+    }, result)
+
+
+async def evaluate_answers_batch(items: List[EvaluateAnswerRequest]) -> List[dict]:
+    """Grade several answers in one prompt, splitting the JSON back out per answer."""
+    if len(items) == 1:
+        return [await evaluate_single_answer(items[0])]
+
+    blocks = []
+    for idx, item in enumerate(items, start=1):
+        keywords_str = ", ".join(item.expectedKeywords) if item.expectedKeywords else "none specified"
+        blocks.append(
+            f"Answer {idx}\n"
+            f"Question: {item.question}\n"
+            f"Candidate's Answer: {item.userAnswer[:1200]}\n"
+            f"Expected Keywords: {keywords_str}"
+        )
+    answers_block = "\n\n".join(blocks)
+    prompt = f"{answers_block}\n\nReturn exactly {len(items)} evaluations."
+    # The per-answer output budget, once per answer (still capped at OLLAMA_MAX_PREDICT).
+    max_tokens = context_planner.output_budget("evaluate-answer", context_planner.max_predict) * len(items)
+
+    try:
+        result = await run_json_task(
+            prompt, "evaluate-answers", max_tokens=max_tokens, system=EVALUATE_BATCH_SYSTEM_PROMPT
+        )
+    except HTTPException as exc:
+        if exc.status_code in (503, 504):
+            logger.warning("evaluate-answers fallback activated: %s", exc.detail)
+            return [evaluate_answer_fallback_response(item, str(exc.detail)) for item in items]
+        raise
+
+    data = result.get("data")
+    evaluations = data.get("evaluations") if isinstance(data, dict) else data
+    if not isinstance(evaluations, list):
+        evaluations = []
+
+    by_index = {}
+    for position, evaluation in enumerate(evaluations, start=1):
+        if not isinstance(evaluation, dict):
+            continue
+        try:
+            index = int(evaluation.get("index", position))
+        except (TypeError, ValueError):
+            index = position
+        by_index.setdefault(index, evaluation)
+
+    responses = []
+    for idx, item in enumerate(items, start=1):
+        evaluation = by_index.get(idx)
+        if evaluation is None or "score" not in evaluation:
+            logger.warning("evaluate-answers: no evaluation for answer %d, using heuristic", idx)
+            responses.append(
+                evaluate_answer_fallback_response(item, "Batch grading returned no evaluation for this answer")
+            )
+            continue
+        evaluation = {k: v for k, v in evaluation.items() if k != "index"}
+        responses.append(with_ollama_stats({
+            "data": evaluation,
+            "model": result.get("model"),
+            "inference_time": result.get("inference_time"),
+        }, result))
+    return responses
+
+
+answer_batcher = MicroBatcher(
+    evaluate_answers_batch,
+    window_seconds=EVALUATE_BATCH_WINDOW_MS / 1000.0,
+    max_batch_size=EVALUATE_BATCH_MAX_SIZE,
+)
+
+
+@app.post("/evaluate-answer")
+async def evaluate_answer(req: EvaluateAnswerRequest):
+    """Evaluate a single interview answer.
+
+    Answers carrying a sessionId may be graded together with other answers
+    from the same session that arrive within the batching window.
+    """
+    try:
+        if req.sessionId and EVALUATE_BATCH_ENABLED:
+            return await answer_batcher.submit(req.sessionId, req)
+        return await evaluate_single_answer(req)
+    except HTTPException:
         raise
     except Exception as e:
         logger.error(f"evaluate-answer error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/interview-feedback")
-async def interview_feedback(req: InterviewFeedbackRequest):
-    """Generate overall interview feedback."""
+@app.post("/evaluate-answers")
+async def evaluate_answers(req: EvaluateAnswersRequest):
+    """Evaluate a list of interview answers, several per model call."""
     try:
-        answers_summary = json.dumps(req.allAnswers[:10], default=str)[:3000]
-        scores_summary = json.dumps(req.scores[:10], default=str)[:500]
-        prompt = f"""You are an interview coach. Provide overall feedback for a completed interview.
+        start_time = time.time()
+        chunks = [
+            req.answers[i:i + EVALUATE_BATCH_MAX_SIZE]
+            for i in range(0, len(req.answers), EVALUATE_BATCH_MAX_SIZE)
+        ]
+        graded = await asyncio.gather(*(evaluate_answers_batch(chunk) for chunk in chunks))
+        results = [item for chunk in graded for item in chunk]
+        return {
+            "results": results,
+            "count": len(results),
+            "inference_time": round(time.time() - start_time, 2),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"evaluate-answers error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
-Answers given: {answers_summary}
-Scores received: {scores_summary}
+FEEDBACK_SYSTEM_PROMPT = """You are an interview coach. Provide overall feedback for a completed interview.
 
 Return ONLY a valid JSON object:
-{{
+{
   "overallScore": 75,
   "overallFeedback": "comprehensive feedback paragraph",
   "strengths": ["top strength 1", "top strength 2"],
   "areasToImprove": ["improvement area 1", "improvement area 2"],
   "tips": ["actionable tip 1", "actionable tip 2"],
   "recommendation": "hire|consider|needs improvement"
-}}
+}
 
 Respond with ONLY the JSON object."""
 
-        result = await run_json_task(prompt, "interview-feedback")
-        return {
+
+@app.post("/interview-feedback")
+async def interview_feedback(req: InterviewFeedbackRequest):
+    """Generate overall interview feedback."""
+    try:
+        answers_summary = json.dumps(req.allAnswers[:10], default=str)[:3000]
+        scores_summary = json.dumps(req.scores[:10], default=str)[:500]
+        prompt = f"""Answers given: {answers_summary}
+Scores received: {scores_summary}"""
+
+        result = await run_json_task(prompt, "interview-feedback", system=FEEDBACK_SYSTEM_PROMPT)
+        return with_ollama_stats({
             "data": result.get("data", {}),
             "model": result.get("model"),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
     except HTTPException:
         raise
     except Exception as e:
@@ -1019,52 +2306,95 @@ Respond with ONLY the JSON object."""
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/chat")
-async def chat(req: ChatRequest):
-    """AI career advisor chat."""
-    try:
-        context_str = ""
-        if req.context:
-            context_str = f"\nConversation context: {req.context}"
-        if req.resumeData:
-            context_str += f"\nUser's resume data: {json.dumps(req.resumeData, default=str)[:1000]}"
+CHAT_SYSTEM_PROMPT = (
+    "You are ResuMate's AI career advisor. Help the user with career advice, resume tips, "
+    "interview preparation, and job search strategies.\n\n"
+    "Provide a helpful, concise, and actionable response. Be friendly and professional."
+)
+
 
-        prompt = f"""You are ResuMate's AI career advisor. Help the user with career advice, resume tips, interview preparation, and job search strategies.{context_str}
+CHAT_SUMMARY_SYSTEM_PROMPT = (
+    "You maintain the running summary of a career-advice chat. Merge the new exchanges into the "
+    "existing summary. Keep the user's goals, facts they shared, questions asked and advice given; "
+    "drop pleasantries. Reply with the updated summary only, as short plain-text notes."
+)
 
-User's message: {req.message}
 
-Provide a helpful, concise, and actionable response. Be friendly and professional."""
+async def summarize_chat_turns(previous: str, turns: List[Dict[str, str]]) -> str:
+    prompt = f"Existing summary:\n{previous or '(none)'}\n\nNew exchanges:\n{format_turns(turns)}"
+    result = await run_text_task(
+        prompt, "chat-summary", max_tokens=CHAT_SUMMARY_TOKENS, system=CHAT_SUMMARY_SYSTEM_PROMPT
+    )
+    return result.get("response", "")
 
-        result = await run_text_task(prompt, "chat")
-        return {
+
+chat_sessions = ChatSessionStore(
+    max_sessions=CHAT_MAX_SESSIONS,
+    ttl_seconds=CHAT_SESSION_TTL_SECONDS,
+    resume_tokens=CHAT_RESUME_TOKENS,
+    summary_tokens=CHAT_SUMMARY_TOKENS,
+    history_tokens=CHAT_HISTORY_TOKENS,
+    summarizer=summarize_chat_turns if CHAT_LLM_SUMMARIES else None,
+    sqlite_path=CHAT_SESSIONS_SQLITE_PATH,
+    shared=SERVER_WORKERS > 1,
+)
+
+
+@app.post("/chat")
+async def chat(req: ChatRequest):
+    """AI career advisor chat.
+
+    History lives server-side under sessionId; each prompt carries the
+    session's resume summary, a rolling summary of older turns and the most
+    recent turns, all within fixed token budgets, then the whole message.
+    Without a sessionId nothing is stored. A message too long for the
+    largest context is rejected with 413.
+    """
+    try:
+        session = chat_sessions.open(req.sessionId, req.resumeData, req.context)
+        system = chat_sessions.system_prompt(session, CHAT_SYSTEM_PROMPT)
+        prompt = chat_sessions.render(session, req.message)
+
+        result = await run_text_task(prompt, "chat", system=system)
+        if req.sessionId:
+            chat_sessions.record(session, req.message, result.get("response", ""))
+        return with_ollama_stats({
             "response": result.get("response", ""),
+            "sessionId": req.sessionId,
             "model": result.get("model"),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/match-resume")
-async def match_resume(req: MatchResumeRequest):
-    """Match a resume against a job posting."""
-    try:
-        text = req.resumeText[:4000]
-        skills_str = ", ".join(req.requiredSkills) if req.requiredSkills else "not specified"
-        job_desc = (req.jobDescription or "")[:2000]
+@app.get("/chat/sessions/{session_id}")
+async def get_chat_session(session_id: str):
+    """Stored state of a chat session, and the prompt size its next message would use."""
+    session = chat_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Chat session {session_id} not found (or expired)")
+    system = chat_sessions.system_prompt(session, CHAT_SYSTEM_PROMPT)
+    return {
+        **session.to_dict(),
+        "prompt_tokens": estimate_tokens(system) + estimate_tokens(chat_sessions.render(session, "")),
+    }
 
-        prompt = f"""You are a job matching expert. Analyze how well this resume matches the job.
 
-Job Title: {req.jobTitle}
-Job Description: {job_desc}
-Required Skills: {skills_str}
+@app.delete("/chat/sessions/{session_id}")
+async def delete_chat_session(session_id: str):
+    if not chat_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Chat session {session_id} not found")
+    return {"deleted": session_id}
 
-RESUME TEXT:
-{text}
+
+MATCH_SYSTEM_PROMPT = """You are a job matching expert. Analyze how well the resume you are given matches the job.
 
 Return ONLY a valid JSON object:
-{{
+{
   "matchScore": 75,
   "matchedSkills": ["skill1", "skill2"],
   "missingSkills": ["skill3", "skill4"],
@@ -1073,17 +2403,42 @@ Return ONLY a valid JSON object:
   "overallFit": "excellent|good|fair|poor",
   "summary": "brief matching analysis",
   "suggestions": ["suggestion1", "suggestion2"]
-}}
+}
 
 matchScore should be 0-100.
 Respond with ONLY the JSON object."""
 
-        result = await run_json_task(prompt, "match-resume")
-        return {
+
+def build_match_prompt(
+    text: str,
+    job_title: str,
+    job_description: Optional[str] = None,
+    required_skills: Optional[List[str]] = None,
+) -> Tuple[str, str]:
+    skills_str = ", ".join(required_skills) if required_skills else "not specified"
+    job_desc = (job_description or "")[:2000]
+
+    return MATCH_SYSTEM_PROMPT, f"""Job Title: {job_title}
+Job Description: {job_desc}
+Required Skills: {skills_str}
+
+RESUME TEXT:
+{text}"""
+
+
+@app.post("/match-resume")
+async def match_resume(req: MatchResumeRequest):
+    """Match a resume against a job posting."""
+    try:
+        text = req.resumeText[:4000]
+        system, prompt = build_match_prompt(text, req.jobTitle, req.jobDescription, req.requiredSkills)
+
+        result = await run_json_task(prompt, "match-resume", system=system)
+        return with_ollama_stats({
             "data": result.get("data", {}),
             "model": result.get("model"),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
     except HTTPException:
         raise
     except Exception as e:
@@ -1091,33 +2446,236 @@ Respond with ONLY the JSON object."""
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/evaluate")
-async def evaluate_accuracy(req: EvaluateAccuracyRequest):
-    """Academic: evaluate prediction accuracy."""
+@app.post("/match-resume/stream")
+async def match_resume_stream(req: MatchResumeRequest):
+    """Like /match-resume, streaming matchScore etc. before the long lists finish."""
+    system, prompt = build_match_prompt(req.resumeText[:4000], req.jobTitle, req.jobDescription, req.requiredSkills)
+    return stream_json_task(prompt, "match-resume", system=system)
+
+
+ANALYZE_MATCH_SCHEMA = """,
+  "match": {
+    "matchScore": 75,
+    "matchedSkills": ["skill1"],
+    "missingSkills": ["skill2"],
+    "experienceMatch": "strong|moderate|weak",
+    "educationMatch": "strong|moderate|weak",
+    "overallFit": "excellent|good|fair|poor",
+    "summary": "brief matching analysis",
+    "suggestions": ["suggestion1"]
+  }"""
+
+
+ANALYZE_PARSED_SCHEMA = """
+  "parsed": {
+    "fullName": "",
+    "email": "",
+    "phone": "",
+    "location": "",
+    "summary": "",
+    "skills": [""],
+    "experience": [{"jobTitle": "", "company": "", "duration": "", "description": ""}],
+    "education": [{"degree": "", "school": "", "field": "", "year": ""}],
+    "projects": [""],
+    "certifications": [""]
+  },"""
+
+
+def build_analyze_system_prompt(with_match: bool, with_parse: bool = True) -> str:
+    skills_rule = '\n- "skills" must contain ONLY 5 to 6 short technical skills.' if with_parse else ""
+    return f"""You are an expert resume parser, evaluator and job matching analyst.
+
+Return ONLY a valid JSON object:
+{{{ANALYZE_PARSED_SCHEMA if with_parse else ""}
+  "score": {{
+    "overallScore": 75,
+    "categoryScores": {{"experience": 80, "education": 70, "skills": 75, "formatting": 65, "impact": 70}},
+    "strengths": ["strength1"],
+    "improvements": ["area to improve 1"],
+    "summary": "brief evaluation summary"
+  }}{ANALYZE_MATCH_SCHEMA if with_match else ""}
+}}
+
+Rules:
+- If unknown, use empty string, empty list, empty object, or 0.{skills_rule}
+- All scores should be 0-100.
+Respond with ONLY the JSON object."""
+
+
+def build_analyze_prompt(
+    text: str,
+    job_title: Optional[str] = None,
+    job_description: Optional[str] = None,
+    required_skills: Optional[List[str]] = None,
+    with_parse: bool = True,
+) -> Tuple[str, str]:
+    """One prompt covering parse (unless with_parse is off), score and (when a job is given) match."""
+    job_block = ""
+    if job_title:
+        skills_str = ", ".join(required_skills) if required_skills else "not specified"
+        job_block = f"""Job Title: {job_title}
+Job Description: {(job_description or "")[:2000]}
+Required Skills: {skills_str}
+
+"""
+    return build_analyze_system_prompt(bool(job_title), with_parse), f"{job_block}RESUME TEXT:\n{text}"
+
+
+def resolve_analyze_mode(requested: Optional[str]) -> str:
+    mode = (requested or "auto").strip().lower()
+    if mode in ("concurrent", "merged"):
+        return mode
+    # A single upstream slot serializes the stages anyway; one prompt avoids
+    # paying prompt processing three times.
+    return "merged" if ollama_scheduler.max_concurrency == 1 else "concurrent"
+
+
+@app.post("/analyze-resume")
+async def analyze_resume(req: AnalyzeResumeRequest):
+    """Parse, score and optionally match a resume in one round trip.
+
+    Stages run concurrently (or as one merged prompt) and share the truncated
+    text, the discovered model and the rule-based parse.
+    """
     try:
-        prompt = f"""Compare these two data sets and calculate accuracy metrics.
+        start_time = time.time()
+        text = req.resumeText[:6000]
+        use_llm_parse = RESUME_PARSER_MODE in ("ollama", "llm")
+
+        # Rule-based parse is instant: run it once and share it with every stage.
+        regex_result = await parse_resume_with_regex(req.resumeText[:15000], start_time)
+        shared_skills = regex_result["data"].get("skills", [])
 
-Predicted: {json.dumps(req.predicted, default=str)[:2000]}
-Expected: {json.dumps(req.expected, default=str)[:2000]}
+        mode = resolve_analyze_mode(req.mode)
+        stage_results: Dict[str, dict] = {}
+        errors: Dict[str, str] = {}
+        if not use_llm_parse:
+            stage_results["parse"] = regex_result
+
+        if mode == "merged":
+            if use_llm_parse:
+                schema = ResumeAnalysisWithMatch if req.jobTitle else ResumeAnalysis
+            else:
+                schema = ResumeScoreAnalysisWithMatch if req.jobTitle else ResumeScoreAnalysis
+            try:
+                system, prompt = build_analyze_prompt(
+                    text, req.jobTitle, req.jobDescription, req.requiredSkills, with_parse=use_llm_parse
+                )
+                merged = await run_json_task(prompt, "analyze-resume", schema=schema, system=system)
+                merged_data = merged.get("data")
+                if isinstance(merged_data, dict):
+                    meta = with_ollama_stats(
+                        {"model": merged.get("model"), "inference_time": merged.get("inference_time")}, merged
+                    )
+                    if use_llm_parse and isinstance(merged_data.get("parsed"), dict):
+                        parsed = await cpu_executor.run(
+                            postprocess_parsed_resume, merged_data["parsed"], shared_skills
+                        )
+                        stage_results["parse"] = {"data": parsed, **meta}
+                    if isinstance(merged_data.get("score"), dict):
+                        stage_results["score"] = {"data": merged_data["score"], **meta}
+                    if req.jobTitle and isinstance(merged_data.get("match"), dict):
+                        stage_results["match"] = {"data": merged_data["match"], **meta}
+            except HTTPException as exc:
+                logger.warning("analyze-resume merged prompt failed, running stages separately: %s", exc.detail)
+
+        async def parse_stage():
+            try:
+                return await parse_resume_with_ollama(text, fallback_skills=shared_skills)
+            except Exception as exc:
+                warning = str(exc.detail) if isinstance(exc, HTTPException) else str(exc)
+                logger.warning("analyze-resume parse fallback activated: %s", warning)
+                FALLBACKS.inc(endpoint="analyze-resume", fallback="regex-nlp")
+                return {**regex_result, "warning": warning}
+
+        async def score_stage():
+            system, prompt = build_score_prompt(text, req.jobTitle, req.requiredSkills)
+            return await run_json_task(prompt, "score-resume", system=system)
+
+        async def match_stage():
+            system, prompt = build_match_prompt(text[:4000], req.jobTitle, req.jobDescription, req.requiredSkills)
+            return await run_json_task(prompt, "match-resume", system=system)
+
+        pending = {"parse": parse_stage, "score": score_stage}
+        if req.jobTitle:
+            pending["match"] = match_stage
+        pending = {name: fn for name, fn in pending.items() if name not in stage_results}
+        if mode == "merged" and pending:
+            # The merged prompt failed or left sections out; those ran as separate stages.
+            mode = "merged-fallback"
+
+        outcomes = await asyncio.gather(*(fn() for fn in pending.values()), return_exceptions=True)
+        for name, outcome in zip(pending.keys(), outcomes):
+            if isinstance(outcome, HTTPException):
+                errors[name] = str(outcome.detail)
+            elif isinstance(outcome, Exception):
+                errors[name] = str(outcome)
+            else:
+                stage_results[name] = outcome
+
+        response = {
+            "data": {
+                name: (stage_results[name].get("data") if name in stage_results else None)
+                for name in (("parse", "score", "match") if req.jobTitle else ("parse", "score"))
+            },
+            "stages": {
+                name: with_ollama_stats(
+                    {k: v for k, v in result.items() if k in ("model", "inference_time", "warning")}, result
+                )
+                for name, result in stage_results.items()
+            },
+            "mode": mode,
+            "inference_time": round(time.time() - start_time, 2),
+        }
+        if errors:
+            response["errors"] = errors
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"analyze-resume error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+ACCURACY_SYSTEM_PROMPT = """Compare the two data sets you are given and calculate accuracy metrics.
 
 Return ONLY a valid JSON object:
-{{
+{
   "accuracy": 0.85,
   "precision": 0.80,
   "recall": 0.90,
   "f1Score": 0.85,
   "details": "brief explanation of the comparison"
-}}
+}
 
 Respond with ONLY the JSON object."""
 
-        result = await run_json_task(prompt, "evaluate-accuracy")
-        return {
+COMPARE_SYSTEM_PROMPT = """Parse the resume you are given and extract skills, experience, and education.
+
+Return ONLY a valid JSON object:
+{
+  "skills": ["skill1", "skill2"],
+  "experience": [{"title": "job title", "company": "company"}],
+  "education": [{"degree": "degree", "institution": "school"}]
+}
+
+Respond with ONLY the JSON object."""
+
+
+@app.post("/evaluate")
+async def evaluate_accuracy(req: EvaluateAccuracyRequest):
+    """Academic: evaluate prediction accuracy."""
+    try:
+        prompt = f"""Predicted: {json.dumps(req.predicted, default=str)[:2000]}
+Expected: {json.dumps(req.expected, default=str)[:2000]}"""
+
+        result = await run_json_task(prompt, "evaluate-accuracy", system=ACCURACY_SYSTEM_PROMPT)
+        return with_ollama_stats({
             "success": True,
             "data": result.get("data", {}),
             "model": result.get("model"),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
     except HTTPException:
         raise
     except Exception as e:
@@ -1130,27 +2688,15 @@ async def compare_models(req: CompareModelsRequest):
     """Academic: compare model outputs."""
     try:
         text = req.resumeText[:4000]
-        prompt = f"""Parse this resume and extract skills, experience, and education.
+        prompt = f"RESUME TEXT:\n{text}"
 
-RESUME TEXT:
-{text}
-
-Return ONLY a valid JSON object:
-{{
-  "skills": ["skill1", "skill2"],
-  "experience": [{{"title": "job title", "company": "company"}}],
-  "education": [{{"degree": "degree", "institution": "school"}}]
-}}
-
-Respond with ONLY the JSON object."""
-
-        result = await run_json_task(prompt, "compare-models")
-        return {
+        result = await run_json_task(prompt, "compare-models", system=COMPARE_SYSTEM_PROMPT)
+        return with_ollama_stats({
             "success": True,
             "model": result.get("model"),
             "data": result.get("data", {}),
             "inference_time": result.get("inference_time"),
-        }
+        }, result)
     except HTTPException:
         raise
     except Exception as e:
@@ -1158,53 +2704,420 @@ Respond with ONLY the JSON object."""
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ══════════════════════════════════════════════════════
+#  ASYNCHRONOUS JOBS
+# ══════════════════════════════════════════════════════
+
+# Tasks that can run as jobs: name -> (request model, endpoint function)
+JOB_TASKS: Dict[str, Tuple[Type[BaseModel], Callable]] = {
+    "parse-resume": (ParseResumeRequest, parse_resume),
+    "parse-resume-refine": (RefineParsedResumeRequest, refine_parsed_resume),
+    "score-resume": (ScoreResumeRequest, score_resume),
+    "match-resume": (MatchResumeRequest, match_resume),
+    "analyze-resume": (AnalyzeResumeRequest, analyze_resume),
+    "generate-interview": (GenerateInterviewRequest, generate_interview),
+    "evaluate-answer": (EvaluateAnswerRequest, evaluate_answer),
+    "evaluate-answers": (EvaluateAnswersRequest, evaluate_answers),
+    "interview-feedback": (InterviewFeedbackRequest, interview_feedback),
+    "chat": (ChatRequest, chat),
+    "generate": (PromptRequest, generate),
+    "evaluate": (EvaluateAccuracyRequest, evaluate_accuracy),
+    "compare-models": (CompareModelsRequest, compare_models),
+}
+
+
+def job_handler(request_model: Type[BaseModel], endpoint: Callable):
+    async def handle(payload: dict):
+        return await endpoint(request_model.model_validate(payload))
+    return handle
+
+
+job_queue = JobQueue(
+    {task: job_handler(*entry) for task, entry in JOB_TASKS.items()},
+    workers=JOBS_WORKERS,
+    max_queued=JOBS_MAX_QUEUED,
+    retention_seconds=JOBS_RETENTION_SECONDS,
+    sqlite_path=JOBS_SQLITE_PATH,
+    webhook_hosts=JOBS_WEBHOOK_HOSTS,
+)
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_queue.stop()
+
+
+@app.on_event("shutdown")
+async def close_ollama_clients():
+    # Registered after every handler that may still be talking to Ollama.
+    await ollama_pool.close()
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(req: JobRequest):
+    """Queue any AI task and return its job id without waiting for the model."""
+    entry = JOB_TASKS.get(req.task)
+    if entry is None:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown task '{req.task}'. Available: {', '.join(sorted(JOB_TASKS))}"
+        )
+    try:
+        payload = entry[0].model_validate(req.input).model_dump()
+        await job_queue.check_webhook(req.webhookUrl)
+        job = job_queue.submit(req.task, payload, req.webhookUrl)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except QueueFullError as exc:
+        raise queue_full_http_error(exc)
+    return job_queue.view(job)
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events for a job: "status" on each change, then "result" or "error"."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found (or expired)")
+
+    async def events():
+        last_status = None
+        while True:
+            job = await job_queue.wait(job_id, 15.0) if last_status else job_queue.get(job_id)
+            if job is None:
+                yield sse_event("error", {"status": 404, "detail": f"Job {job_id} expired"})
+                return
+            view = job_queue.view(job)
+            if job["status"] == "succeeded":
+                yield sse_event("result", view)
+                return
+            if job["status"] == "failed":
+                yield sse_event("error", view)
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield sse_event("status", view)
+            else:
+                yield b": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0.0):
+    """Job status and, once finished, its result or error.
+
+    wait=N long-polls: the response is held until the job finishes or N
+    seconds (at most JOBS_MAX_WAIT_SECONDS) pass.
+    """
+    job = await job_queue.wait(job_id, min(max(wait, 0.0), JOBS_MAX_WAIT_SECONDS))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found (or expired)")
+    return job_queue.view(job)
+
+
 # ══════════════════════════════════════════════════════
 #  GENERIC & UTILITY ENDPOINTS
 # ══════════════════════════════════════════════════════
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 while the startup warmup is loading the model.
+
+    A server that parses with regex, or whose warmup cannot reach Ollama,
+    is ready at once: it serves (with local fallbacks) while warmup keeps
+    retrying. models_warm tells whether the model is loaded.
+    """
+    status = model_residency.stats()
+    is_ready = (
+        status["ready"]
+        or RESUME_PARSER_MODE not in ("ollama", "llm")
+        or status["warmup_error"] is not None
+    )
+    content = {**status, "ready": is_ready, "models_warm": status["ready"]}
+    if not is_ready:
+        return JSONResponse(status_code=503, content=content)
+    return content
+
+
 @app.get("/health")
 async def health():
     ollama_status = {"running": False, "note": "Not required for resume parsing"}
     active_model = None
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(f"{OLLAMA_URL}/api/tags", headers=get_ollama_headers())
-            resp.raise_for_status()
-            models = [m["name"] for m in resp.json().get("models", [])]
-            ollama_status = {"running": True, "models": models}
+        await ollama_pool.refresh(force=True, timeout=5.0)
+        if any(b.healthy for b in ollama_pool.backends):
+            ollama_status = {"running": True, "models": ollama_pool.installed_models()}
             active_model = await get_available_model()
     except Exception:
         pass  # Ollama is optional — parsing still works
+    ollama_status["backends"] = ollama_pool.stats()["backends"]
 
     return {
         "status": "healthy",
         "parser": f"{RESUME_PARSER_MODE} (regex always available; ollama requires Ollama)",
         "ollama": ollama_status,
         "active_model": active_model,
+        "cache": llm_cache.stats(),
+        "singleflight": ollama_singleflight.stats(),
+        "scheduler": ollama_scheduler.stats(),
+        "circuit_breaker": ollama_breaker.stats(),
+        "answer_batching": answer_batcher.stats(),
+        "token_budget": context_planner.stats(),
+        "residency": model_residency.stats(),
+        "jobs": job_queue.stats(),
+        "chat_sessions": chat_sessions.stats(),
+        "cpu_executor": cpu_executor.stats(),
+        "event_loop_lag": loop_lag_monitor.stats(),
+        "hedging": {"enabled": HEDGE_ENABLED, "tasks": sorted(HEDGE_TASKS), **hedger.stats()},
+        "cassette": ollama_cassette.stats(),
+        "startup": startup_profile.stats(),
+        "wire_format": {**wire_format.stats(), "gzip_min_bytes": RESPONSE_GZIP_MIN_BYTES},
         "ram_note": "Parsing: regex is instant; ollama parsing/generation depends on model + hardware.",
     }
 
 
+def register_component_metrics():
+    """Expose cache, single-flight, scheduler and batching stats at scrape time."""
+    def cache_samples():
+        stats = llm_cache.stats()
+        return [({"tier": "memory"}, stats["memory_hits"]), ({"tier": "disk"}, stats["disk_hits"])]
+
+    metrics.callback("resumate_llm_cache_hits_total", "Response cache hits by tier.", "counter", cache_samples)
+    metrics.callback(
+        "resumate_llm_cache_misses_total", "Response cache misses.", "counter",
+        lambda: [({}, llm_cache.stats()["misses"])],
+    )
+    metrics.callback(
+        "resumate_llm_cache_entries", "Entries in the in-memory response cache.", "gauge",
+        lambda: [({}, llm_cache.stats()["size"])],
+    )
+    metrics.callback(
+        "resumate_singleflight_coalesced_total", "Calls that joined an identical in-flight generation.",
+        "counter", lambda: [({}, ollama_singleflight.stats()["coalesced_calls"])],
+    )
+    metrics.callback(
+        "resumate_scheduler_active", "Upstream Ollama calls currently running.", "gauge",
+        lambda: [({}, ollama_scheduler.stats()["active"])],
+    )
+    metrics.callback(
+        "resumate_scheduler_queued", "Requests waiting for an upstream slot.", "gauge",
+        lambda: [({"lane": lane}, s["queued"]) for lane, s in ollama_scheduler.stats()["lanes"].items()],
+    )
+    metrics.callback(
+        "resumate_scheduler_rejected_total", "Requests rejected with 429 because a lane queue was full.",
+        "counter",
+        lambda: [({"lane": lane}, s["rejected"]) for lane, s in ollama_scheduler.stats()["lanes"].items()],
+    )
+    metrics.callback(
+        "resumate_ollama_backend_healthy", "1 if the Ollama backend passed its last check.", "gauge",
+        lambda: [({"backend": b.url}, 1 if b.healthy else 0) for b in ollama_pool.backends],
+    )
+    metrics.callback(
+        "resumate_ollama_backend_in_flight", "Generations currently running per Ollama backend.", "gauge",
+        lambda: [({"backend": b.url}, b.in_flight) for b in ollama_pool.backends],
+    )
+    metrics.callback(
+        "resumate_ollama_failovers_total", "Generations retried on another Ollama backend.", "counter",
+        lambda: [({}, ollama_pool.failovers)],
+    )
+    metrics.callback(
+        "resumate_ollama_circuit_state", "Ollama circuit breaker state (0 closed, 1 half-open, 2 open).",
+        "gauge", lambda: [({}, {"closed": 0, "half_open": 1, "open": 2}[ollama_breaker.state])],
+    )
+    metrics.callback(
+        "resumate_ollama_circuit_rejected_total", "Requests short-circuited to fallbacks while open.",
+        "counter", lambda: [({}, ollama_breaker.rejected)],
+    )
+    metrics.callback(
+        "resumate_output_budget_tokens", "Learned num_predict budget per task.", "gauge",
+        lambda: [
+            ({"task": task}, context_planner.output_budget(task, context_planner.max_predict))
+            for task in context_planner.tracker.stats()
+        ],
+    )
+    metrics.callback(
+        "resumate_prompts_compacted_total", "Prompts whitespace-compacted to fit the context window.",
+        "counter", lambda: [({}, context_planner.compacted)],
+    )
+    metrics.callback(
+        "resumate_prompts_rejected_total", "Prompts rejected with 413 as too large for the context window.",
+        "counter", lambda: [({}, context_planner.rejected)],
+    )
+    metrics.callback(
+        "resumate_model_ready", "1 once the startup model warmup has finished.", "gauge",
+        lambda: [({}, 1 if model_residency.ready else 0)],
+    )
+    metrics.callback(
+        "resumate_model_switches_total", "Times the resident Ollama model changed.", "counter",
+        lambda: [({}, model_residency.switches)],
+    )
+    metrics.callback(
+        "resumate_model_switches_held_total", "Model switches deferred to avoid evicting the resident model.",
+        "counter", lambda: [({}, model_residency.held)],
+    )
+    metrics.callback(
+        "resumate_jobs_queued", "Jobs waiting for a job worker.", "gauge",
+        lambda: [({}, job_queue.queued())],
+    )
+    metrics.callback(
+        "resumate_jobs_running", "Jobs currently running.", "gauge",
+        lambda: [({}, job_queue.running())],
+    )
+    metrics.callback(
+        "resumate_jobs_finished_total", "Finished jobs by status.", "counter",
+        lambda: [({"status": status}, job_queue.stats()[status]) for status in ("succeeded", "failed")],
+    )
+    metrics.callback(
+        "resumate_jobs_rejected_total", "Jobs rejected with 429 because the job queue was full.", "counter",
+        lambda: [({}, job_queue.stats()["rejected"])],
+    )
+    metrics.callback(
+        "resumate_chat_sessions", "Chat sessions held in memory.", "gauge",
+        lambda: [({}, chat_sessions.stats()["sessions"])],
+    )
+    metrics.callback(
+        "resumate_chat_folds_total", "Times older chat turns were folded into the rolling summary.",
+        "counter", lambda: [({}, chat_sessions.stats()["folds"])],
+    )
+    metrics.callback(
+        "resumate_cpu_executor_busy", "CPU-bound calls currently running in the executor.", "gauge",
+        lambda: [({}, cpu_executor.busy)],
+    )
+    metrics.callback(
+        "resumate_event_loop_lag_max_seconds", "Largest event-loop lag seen since start.", "gauge",
+        lambda: [({}, loop_lag_monitor.max)],
+    )
+    metrics.callback(
+        "resumate_answer_batches_total", "Micro-batches sent for answer grading.", "counter",
+        lambda: [({}, answer_batcher.stats()["batches"])],
+    )
+    metrics.callback(
+        "resumate_answer_batch_items_total", "Answers graded through micro-batches.", "counter",
+        lambda: [({}, answer_batcher.stats()["items"])],
+    )
+
+
+register_component_metrics()
+
+
+@app.get("/token-stats")
+async def token_stats():
+    """Ollama token throughput aggregated per model and task."""
+    rows = {}
+    for counter, field in (
+        (OLLAMA_PROMPT_TOKENS, "prompt_tokens"),
+        (OLLAMA_EVAL_TOKENS, "eval_tokens"),
+        (OLLAMA_PROMPT_EVAL_SECONDS, "prompt_eval_seconds"),
+        (OLLAMA_EVAL_SECONDS, "eval_seconds"),
+    ):
+        for (model, task), value in counter.samples().items():
+            rows.setdefault((model, task), {"model": model, "task": task})[field] = (
+                int(value) if field.endswith("tokens") else round(value, 4)
+            )
+
+    for row in rows.values():
+        prompt_s = row.get("prompt_eval_seconds", 0)
+        eval_s = row.get("eval_seconds", 0)
+        row["prompt_tokens_per_s"] = round(row.get("prompt_tokens", 0) / prompt_s, 2) if prompt_s else None
+        row["eval_tokens_per_s"] = round(row.get("eval_tokens", 0) / eval_s, 2) if eval_s else None
+    return {"stats": sorted(rows.values(), key=lambda r: (r["model"], r["task"]))}
+
+
+@app.get("/json-stats")
+async def json_stats():
+    """JSON task retry rate per task, split by constrained (schema) vs free decoding."""
+    rows = {}
+    for counter, field in (
+        (JSON_TASK_RUNS, "runs"),
+        (JSON_TASK_RETRIES, "retries"),
+        (JSON_SCHEMA_ERRORS, "schema_errors"),
+    ):
+        for (task, output_format), value in counter.samples().items():
+            rows.setdefault((task, output_format), {"task": task, "format": output_format})[field] = int(value)
+
+    for row in rows.values():
+        runs = row.setdefault("runs", 0)
+        row.setdefault("retries", 0)
+        row.setdefault("schema_errors", 0)
+        row["retry_rate"] = round(row["retries"] / runs, 4) if runs else None
+    return {
+        "structured_output": OLLAMA_STRUCTURED_OUTPUT,
+        "stats": sorted(rows.values(), key=lambda r: (r["task"], r["format"])),
+    }
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     return {
         "service": "ResuMate Model Server",
         "parser": f"resume parser mode: {RESUME_PARSER_MODE}",
-        "generative": f"Ollama via {OLLAMA_URL} (when available)",
+        "generative": f"Ollama via {', '.join(OLLAMA_URLS)} (when available)",
         "endpoints": [
-            "/generate", "/health", "/parse-resume", "/score-resume",
-            "/generate-interview", "/evaluate-answer", "/interview-feedback",
-            "/chat", "/match-resume", "/evaluate", "/compare-models"
+            "/generate", "/health", "/ready", "/metrics", "/token-stats", "/json-stats",
+            "/parse-resume", "/parse-resume/stream", "/score-resume", "/score-resume/stream",
+            "/generate-interview", "/evaluate-answer", "/evaluate-answers", "/interview-feedback", "/chat",
+            "/match-resume", "/match-resume/stream", "/analyze-resume", "/evaluate", "/compare-models",
+            "/jobs", "/jobs/{id}", "/jobs/{id}/events", "/chat/sessions/{id}",
         ],
     }
 
 
+startup_profile.mark("app")
+
+
+def uncompiled_server_modules() -> List[str]:
+    """Loaded modules from this directory (not benchmarks/ or tests/) that have no .pyc."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    missing = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path or not path.endswith(".py") or os.path.dirname(os.path.abspath(path)) != here:
+            continue
+        if not os.path.exists(importlib.util.cache_from_source(path)):
+            missing.append(os.path.basename(path))
+    return sorted(missing)
+
+
+@app.on_event("startup")
+async def finish_startup():
+    # Registered last, so it runs after every other startup hook.
+    startup_profile.finish()
+    phases = startup_profile.phases
+    logger.info(
+        f"Startup finished in {phases['startup']:.3f}s "
+        f"(imports {phases['imports']:.3f}s, app {phases['app']:.3f}s)"
+    )
+    for entry in startup_profile.stats().get("slowest_imports", [])[:10]:
+        logger.info(f"  import {entry['module']}: {entry['cumulative_ms']}ms ({entry['self_ms']}ms self)")
+    if sys.dont_write_bytecode:
+        # Nothing precompiled and nothing cached: every start recompiles these modules.
+        missing = uncompiled_server_modules()
+        if missing:
+            logger.warning(
+                f"No precompiled bytecode for {len(missing)} server module(s) "
+                f"({', '.join(missing[:5])}{', ...' if len(missing) > 5 else ''}); "
+                "run `python -m compileall -l .` in model-server/ to start faster"
+            )
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8000"))
     logger.info(f"Starting ResuMate Model Server")
     logger.info(f"Listening on port: {port}")
-    logger.info(f"Ollama endpoint: {OLLAMA_URL}")
+    logger.info(f"Ollama endpoints: {', '.join(OLLAMA_URLS)}")
     logger.info(f"Primary model: {PRIMARY_MODEL} | Fallback: {FALLBACK_MODEL}")
     logger.info(f"Resume parsing mode: {RESUME_PARSER_MODE}")
     uvicorn.run(app, host="0.0.0.0", port=port)
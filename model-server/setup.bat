@@ -24,6 +24,8 @@ if %errorlevel% neq 0 (
     pause
     exit /b 1
 )
+REM -- Precompile the server's modules so the first start does not have to
+python -m compileall -q -l . >nul
 echo Done.
 
 REM -- Check Ollama (optional, for generative AI tasks)
@@ -0,0 +1,59 @@
+"""
+ResuMate Single-Flight Coalescing
+─────────────────────────────────
+Concurrent callers asking for the same key share one in-flight coroutine
+and all receive its result (or its exception). The shared work runs as its
+own task, so a caller disconnecting does not cancel it for the others; it
+is only cancelled once every caller waiting on it has gone.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Deduplicate identical concurrent async calls by key."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._waiters.pop(task, None)
+        # Mark the exception as retrieved even if every waiter went away.
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once per key at a time; later callers join the running call."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+                if self._waiters[task] <= 0 and not task.done():
+                    # Nobody wants the result any more (e.g. a hedged call lost): stop the upstream work.
+                    task.cancel()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.leaders + self.followers
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.leaders,
+            "coalesced_calls": self.followers,
+            "coalesce_rate": round(self.followers / total, 4) if total else 0.0,
+        }
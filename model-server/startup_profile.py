@@ -0,0 +1,110 @@
+"""
+ResuMate Startup Profile
+────────────────────────
+Cold-start timings for the model server: when each startup phase finished
+(imports done, app built, startup hooks run, first request served),
+measured from the moment this module was imported, which server.py does
+before anything else.
+
+With import profiling on, every module imported during startup is timed
+(cumulative and self time, like `python -X importtime` but collected
+in-process and exposed through /health), so a slow new dependency shows up
+without re-running the server under a profiler.
+"""
+
+import builtins
+import importlib.util
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ImportTimer:
+    """Times first-time imports by wrapping builtins.__import__.
+
+    Modules pulled in by importlib.import_module or a package's fromlist are
+    attributed to the import statement that triggered them.
+    """
+
+    def __init__(self):
+        self.cumulative: Dict[str, float] = {}
+        self.self_time: Dict[str, float] = {}
+        self._children: List[float] = []
+        self._original = None
+
+    def install(self) -> None:
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original or builtins.__import__
+        full_name = name
+        if level:
+            try:
+                package = (globals or {}).get("__package__") or (globals or {}).get("__name__", "")
+                full_name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                return original(name, globals, locals, fromlist, level)
+        if full_name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            if full_name in sys.modules and full_name not in self.cumulative:
+                self.cumulative[full_name] = elapsed
+                self.self_time[full_name] = max(0.0, elapsed - children)
+
+    def slowest(self, limit: int = 15) -> List[Dict[str, Any]]:
+        ranked = sorted(self.cumulative, key=self.cumulative.get, reverse=True)[:limit]
+        return [
+            {
+                "module": name,
+                "cumulative_ms": round(self.cumulative[name] * 1000, 2),
+                "self_ms": round(self.self_time[name] * 1000, 2),
+            }
+            for name in ranked
+        ]
+
+
+class StartupProfile:
+    """Phase timestamps (seconds since creation) for one server process."""
+
+    def __init__(self, profile_imports: bool = False):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.imports: Optional[ImportTimer] = ImportTimer() if profile_imports else None
+        self.modules_at_start = len(sys.modules)
+        self.modules_loaded = 0
+        if self.imports is not None:
+            self.imports.install()
+
+    def mark(self, phase: str) -> None:
+        """Record the first time a phase is reached; later calls are ignored."""
+        if phase not in self.phases:
+            self.phases[phase] = round(time.perf_counter() - self.started, 4)
+
+    def finish(self) -> None:
+        """End of startup: stop timing imports (request-time imports are not startup cost)."""
+        self.mark("startup")
+        self.modules_loaded = len(sys.modules) - self.modules_at_start
+        if self.imports is not None:
+            self.imports.uninstall()
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"phases_s": dict(self.phases), "modules_loaded": self.modules_loaded}
+        if self.imports is not None:
+            out["slowest_imports"] = self.imports.slowest()
+        return out
@@ -0,0 +1,98 @@
+"""
+ResuMate Streaming JSON Parser
+──────────────────────────────
+Consumes a model's output chunk by chunk, reports each top-level member of
+the JSON object as soon as it is complete, and flags the moment the object
+closes so the caller can stop generation instead of paying for trailing
+prose. Only string/escape/bracket state is tracked, so each character is
+scanned once.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StreamingJSONParser:
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self._pos = 0
+        self._start = -1
+        self._end = -1
+        self._member_start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self._end >= 0
+
+    @property
+    def json_text(self) -> Optional[str]:
+        """The first complete top-level object, once it has closed."""
+        return self.text[self._start:self._end] if self.complete else None
+
+    @property
+    def trailing_text(self) -> str:
+        """Output after the object closed ("" until then)."""
+        return self.text[self._end:] if self.complete else ""
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add output text; return (key, value) members completed by it."""
+        self.text += chunk
+        completed: List[Tuple[str, Any]] = []
+        text = self.text
+        i = self._pos
+        while i < len(text) and not self.complete:
+            ch = text[i]
+            if self._start < 0:
+                if ch == "{":
+                    self._start = i
+                    self._member_start = i + 1
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close(i, completed)
+            elif ch == "," and self._depth == 1:
+                self._emit(self._member_start, i, completed)
+                self._member_start = i + 1
+            i += 1
+        self._pos = i
+        return completed
+
+    def _close(self, i: int, completed: List[Tuple[str, Any]]) -> None:
+        try:
+            json.loads(self.text[self._start:i + 1])
+        except ValueError:
+            # A brace in leading prose, not the answer: keep looking for the next object.
+            self._start = -1
+            self._depth = 0
+            self.fields.clear()
+            return
+        self._emit(self._member_start, i, completed)
+        self._end = i + 1
+
+    def _emit(self, start: int, stop: int, completed: List[Tuple[str, Any]]) -> None:
+        member = self.text[start:stop].strip()
+        if not member:
+            return
+        try:
+            decoded = json.loads("{" + member + "}")
+        except ValueError:
+            return
+        for key, value in decoded.items():
+            self.fields[key] = value
+            completed.append((key, value))
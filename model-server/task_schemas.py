@@ -0,0 +1,209 @@
+"""
+ResuMate Task Output Schemas
+────────────────────────────
+Pydantic models describing the JSON each LLM task must return. Their JSON
+Schema is passed to Ollama's structured-output `format` option so decoding
+is constrained to valid, complete objects, and every output is validated
+against the same model before it is used.
+"""
+
+from typing import Any, Dict, List, Literal, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+Strength = Literal["strong", "moderate", "weak"]
+
+
+class ExperienceEntry(BaseModel):
+    jobTitle: str
+    company: str
+    duration: str
+    description: str
+
+
+class EducationEntry(BaseModel):
+    degree: str
+    school: str
+    field: str
+    year: str
+
+
+class ParsedResumeFields(BaseModel):
+    fullName: str
+    email: str
+    phone: str
+    location: str
+    summary: str
+    skills: List[str]
+    experience: List[ExperienceEntry]
+    education: List[EducationEntry]
+    projects: List[str]
+    certifications: List[str]
+
+
+class ParsedResume(ParsedResumeFields):
+    score: int
+    scoreBreakdown: Dict[str, int]
+    strengths: List[str]
+    improvements: List[str]
+
+
+class CategoryScores(BaseModel):
+    experience: int
+    education: int
+    skills: int
+    formatting: int
+    impact: int
+
+
+class ResumeScore(BaseModel):
+    overallScore: int
+    categoryScores: CategoryScores
+    strengths: List[str]
+    improvements: List[str]
+    summary: str
+
+
+class ResumeMatch(BaseModel):
+    matchScore: int
+    matchedSkills: List[str]
+    missingSkills: List[str]
+    experienceMatch: Strength
+    educationMatch: Strength
+    overallFit: Literal["excellent", "good", "fair", "poor"]
+    summary: str
+    suggestions: List[str]
+
+
+class ResumeAnalysis(BaseModel):
+    parsed: ParsedResumeFields
+    score: ResumeScore
+
+
+class ResumeAnalysisWithMatch(ResumeAnalysis):
+    match: ResumeMatch
+
+
+# Merged analysis when the resume is parsed by the rule-based parser.
+class ResumeScoreAnalysis(BaseModel):
+    score: ResumeScore
+
+
+class ResumeScoreAnalysisWithMatch(ResumeScoreAnalysis):
+    match: ResumeMatch
+
+
+class InterviewQuestion(BaseModel):
+    id: int
+    question: str
+    type: Literal["technical", "behavioral", "situational"]
+    difficulty: Literal["easy", "medium", "hard"]
+    expectedKeywords: List[str]
+    sampleAnswer: str
+
+
+class InterviewQuestions(BaseModel):
+    questions: List[InterviewQuestion]
+
+
+class AnswerEvaluation(BaseModel):
+    score: int
+    feedback: str
+    strengths: List[str]
+    improvements: List[str]
+    keywordMatches: List[str]
+    missedKeywords: List[str]
+
+
+class IndexedAnswerEvaluation(AnswerEvaluation):
+    index: int
+
+
+class AnswerEvaluations(BaseModel):
+    evaluations: List[IndexedAnswerEvaluation]
+
+
+class InterviewFeedback(BaseModel):
+    overallScore: int
+    overallFeedback: str
+    strengths: List[str]
+    areasToImprove: List[str]
+    tips: List[str]
+    recommendation: Literal["hire", "consider", "needs improvement"]
+
+
+class AccuracyReport(BaseModel):
+    accuracy: float
+    precision: float
+    recall: float
+    f1Score: float
+    details: str
+
+
+class ComparedExperience(BaseModel):
+    title: str
+    company: str
+
+
+class ComparedEducation(BaseModel):
+    degree: str
+    institution: str
+
+
+class ComparedParse(BaseModel):
+    skills: List[str]
+    experience: List[ComparedExperience]
+    education: List[ComparedEducation]
+
+
+TASK_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "parse-resume-ollama": ParsedResume,
+    "score-resume": ResumeScore,
+    "match-resume": ResumeMatch,
+    "analyze-resume": ResumeAnalysis,
+    "generate-interview": InterviewQuestions,
+    "evaluate-answer": AnswerEvaluation,
+    "evaluate-answers": AnswerEvaluations,
+    "interview-feedback": InterviewFeedback,
+    "evaluate-accuracy": AccuracyReport,
+    "compare-models": ComparedParse,
+}
+
+
+def _inline(node: Any, defs: Dict[str, Any], fields: bool = False) -> Any:
+    if isinstance(node, dict):
+        if fields:
+            # Keys of "properties" are field names (a field may be called "title").
+            return {k: _inline(v, defs) for k, v in node.items()}
+        ref = node.get("$ref")
+        if ref:
+            return _inline(defs[ref.rsplit("/", 1)[-1]], defs)
+        return {k: _inline(v, defs, k == "properties") for k, v in node.items() if k not in ("$defs", "title")}
+    if isinstance(node, list):
+        return [_inline(item, defs) for item in node]
+    return node
+
+
+_schema_cache: Dict[Type[BaseModel], Dict[str, Any]] = {}
+
+
+def ollama_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON Schema for Ollama's `format` option, with $refs inlined (the grammar
+    converter handles flat schemas most reliably)."""
+    schema = _schema_cache.get(model)
+    if schema is None:
+        raw = model.model_json_schema()
+        schema = _inline(raw, raw.get("$defs", {}))
+        _schema_cache[model] = schema
+    return schema
+
+
+def schema_errors(model: Type[BaseModel], data: Any) -> Optional[str]:
+    """Validate data against a task model; return a short error summary or None."""
+    try:
+        model.model_validate(data)
+        return None
+    except ValidationError as exc:
+        first = exc.errors()[0]
+        location = ".".join(str(part) for part in first.get("loc", ()))
+        return f"{exc.error_count()} schema error(s), first at '{location}': {first.get('msg')}"
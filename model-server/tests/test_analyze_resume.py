@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+RESUME = server.PRELOAD_SAMPLE_RESUME
+SCORE = {
+    "overallScore": 80,
+    "categoryScores": {"experience": 80, "education": 70, "skills": 85, "formatting": 75, "impact": 70},
+    "strengths": ["APIs"],
+    "improvements": ["metrics"],
+    "summary": "solid",
+}
+
+
+@pytest.fixture
+def merged_calls(monkeypatch):
+    """Answers the merged prompt with every section its schema asks for."""
+    calls = []
+
+    async def run_json_task(prompt, task_name, schema=None, system=None, **kwargs):
+        calls.append({"task": task_name, "schema": schema, "system": system})
+        data = {"score": SCORE}
+        if "parsed" in schema.model_fields:
+            data["parsed"] = {"fullName": "Jane Doe", "skills": ["Python", "Go"]}
+        return {"data": data, "model": "test-model", "inference_time": 0.1}
+
+    monkeypatch.setattr(server, "run_json_task", run_json_task)
+    return calls
+
+
+@pytest.mark.parametrize("parser_mode", ["regex", "ollama"])
+def test_merged_analysis_succeeds_in_both_parser_modes(monkeypatch, merged_calls, parser_mode):
+    monkeypatch.setattr(server, "RESUME_PARSER_MODE", parser_mode)
+    request = server.AnalyzeResumeRequest(resumeText=RESUME, mode="merged")
+    response = asyncio.run(server.analyze_resume(request))
+
+    assert response["mode"] == "merged"
+    assert [call["task"] for call in merged_calls] == ["analyze-resume"]
+    assert response["data"]["score"]["overallScore"] == 80
+    assert response["data"]["parse"]["fullName"] == "Jane Doe"
+    asks_for_parse = '"parsed"' in merged_calls[0]["system"]
+    assert asks_for_parse == (parser_mode == "ollama")
+    assert ("parsed" in merged_calls[0]["schema"].model_fields) == asks_for_parse
+    if parser_mode == "regex":
+        assert response["stages"]["parse"]["model"] == "regex-nlp"
+
+
+def test_missing_section_reports_merged_fallback(monkeypatch):
+    monkeypatch.setattr(server, "RESUME_PARSER_MODE", "regex")
+
+    async def run_json_task(prompt, task_name, schema=None, system=None, **kwargs):
+        data = {} if task_name == "analyze-resume" else SCORE
+        return {"data": data, "model": "test-model", "inference_time": 0.1}
+
+    monkeypatch.setattr(server, "run_json_task", run_json_task)
+    request = server.AnalyzeResumeRequest(resumeText=RESUME, mode="merged")
+    response = asyncio.run(server.analyze_resume(request))
+
+    assert response["mode"] == "merged-fallback"
+    assert response["data"]["score"]["overallScore"] == 80
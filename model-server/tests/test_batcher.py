@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batcher import MicroBatcher  # noqa: E402
+
+
+def recording_batcher(delay=0.05, **kwargs):
+    batches = []
+
+    async def handler(items):
+        batches.append(list(items))
+        await asyncio.sleep(delay)
+        return [item * 10 for item in items]
+
+    return MicroBatcher(handler, **kwargs), batches
+
+
+def test_lone_item_is_sent_without_waiting_for_the_window():
+    batcher, batches = recording_batcher(delay=0, window_seconds=1.0)
+
+    async def run():
+        start = time.perf_counter()
+        result = await batcher.submit("s", 1)
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == 10
+    assert batches == [[1]]
+    assert elapsed < 0.5
+
+
+def test_items_arriving_during_a_batch_are_grouped():
+    batcher, batches = recording_batcher(window_seconds=1.0, max_batch_size=8)
+
+    async def run():
+        first = asyncio.ensure_future(batcher.submit("s", 1))
+        await asyncio.sleep(0)
+        rest = [asyncio.ensure_future(batcher.submit("s", n)) for n in (2, 3)]
+        other = asyncio.ensure_future(batcher.submit("t", 4))
+        return await asyncio.gather(first, *rest, other)
+
+    assert asyncio.run(run()) == [10, 20, 30, 40]
+    assert sorted(batches) == [[1], [2, 3], [4]]
+
+
+def test_size_cap_flushes_immediately():
+    batcher, batches = recording_batcher(window_seconds=5.0, max_batch_size=2)
+
+    async def run():
+        first = asyncio.ensure_future(batcher.submit("s", 1))
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        results = await asyncio.gather(first, batcher.submit("s", 2), batcher.submit("s", 3))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results == [10, 20, 30]
+    assert batches == [[1], [2, 3]]
+    assert elapsed < 1.0
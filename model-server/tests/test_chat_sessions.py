@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_sessions import ChatSessionStore  # noqa: E402
+
+
+def test_long_message_is_sent_whole():
+    store = ChatSessionStore(history_tokens=100)
+    message = "Rank these candidates: " + "detail " * 2000 + "END"
+    assert store.render(store.open("s1"), message).endswith(message)
+
+
+def test_sessionless_message_creates_no_session():
+    store = ChatSessionStore()
+    session = store.open(None, resume={"skills": ["Python"]})
+    assert "Python" in session.resume_summary
+    assert store.stats()["created"] == 0
+    assert store.stats()["sessions"] == 0
+
+
+def test_history_stays_within_budget():
+    store = ChatSessionStore(history_tokens=100)
+    session = store.open("s1")
+    for turn in range(10):
+        store.record(session, f"question {turn} " + "words " * 40, "answer " * 40)
+    assert session.folded_turns > 0
+    assert store.get("s1") is session
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import circuit_breaker  # noqa: E402
+from circuit_breaker import CircuitBreaker, CircuitOpenError  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def open_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.check()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold_and_rejects(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == circuit_breaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.rejected == 1
+    assert breaker.times_opened == 1
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = open_breaker()
+    clock[0] += 30
+    assert breaker.state == circuit_breaker.HALF_OPEN
+    breaker.check()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_discovery_check_leaves_the_probe_slot(clock):
+    breaker = open_breaker()
+    clock[0] += 30
+    breaker.check(probe=False)
+    breaker.check(probe=False)
+    breaker.check()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_successful_probe_closes(clock):
+    breaker = open_breaker()
+    clock[0] += 30
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == circuit_breaker.CLOSED
+    breaker.check()
+    breaker.check()
+
+
+def test_failed_probe_reopens_for_another_timeout(clock):
+    breaker = open_breaker()
+    clock[0] += 30
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == circuit_breaker.OPEN
+    assert breaker.times_opened == 2
+    clock[0] += 29
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    clock[0] += 1
+    breaker.check()
+
+
+def test_probe_that_never_reports_back_is_replaced(clock):
+    breaker = open_breaker()
+    clock[0] += 30
+    breaker.check()
+    clock[0] += 30
+    breaker.check()
+
+
+def test_disabled_breaker_never_rejects(clock):
+    breaker = CircuitBreaker(failure_threshold=1, enabled=False)
+    breaker.record_failure()
+    breaker.check()
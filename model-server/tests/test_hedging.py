@@ -0,0 +1,109 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hedging import Hedger  # noqa: E402
+
+
+def hedger(**kwargs):
+    return Hedger(default_delay=0.02, min_delay=0.02, **kwargs)
+
+
+def call(result, delay, log, name):
+    """A call that records whether it finished or was cancelled."""
+    async def run():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log.append(f"{name} cancelled")
+            raise
+        log.append(f"{name} finished")
+        return result
+    return run
+
+
+def valid(result):
+    return result != "invalid"
+
+
+def test_fast_primary_is_not_hedged():
+    log = []
+    h = hedger()
+
+    def make_hedge():
+        raise AssertionError("no hedge is due")
+
+    result = asyncio.run(h.run("chat", call("p", 0, log, "primary"), make_hedge, valid))
+    assert result == ("p", "primary")
+    assert h.stats()["tasks"]["chat"]["not_hedged"] == 1
+
+
+def test_hedge_wins_and_slow_primary_is_cancelled():
+    log = []
+    h = hedger()
+    result = asyncio.run(h.run(
+        "chat", call("p", 5, log, "primary"), lambda: call("h", 0.01, log, "hedge"), valid
+    ))
+    assert result == ("h", "hedge")
+    assert log == ["hedge finished", "primary cancelled"]
+    assert h.stats()["tasks"]["chat"]["hedge_won"] == 1
+
+
+def test_primary_wins_and_hedge_is_cancelled():
+    log = []
+    h = hedger()
+    result = asyncio.run(h.run(
+        "chat", call("p", 0.04, log, "primary"), lambda: call("h", 5, log, "hedge"), valid
+    ))
+    assert result == ("p", "primary")
+    assert log == ["primary finished", "hedge cancelled"]
+
+
+def test_invalid_hedge_result_keeps_waiting_for_primary():
+    log = []
+    h = hedger()
+    result = asyncio.run(h.run(
+        "chat", call("p", 0.06, log, "primary"), lambda: call("invalid", 0.01, log, "hedge"), valid
+    ))
+    assert result == ("p", "primary")
+
+
+def test_nothing_to_hedge_to_is_skipped():
+    log = []
+    h = hedger()
+    result = asyncio.run(h.run("chat", call("p", 0.04, log, "primary"), lambda: None, valid))
+    assert result == ("p", "primary")
+    assert h.stats()["tasks"]["chat"]["skipped"] == 1
+
+
+def test_rate_cap_skips_hedges():
+    log = []
+    h = hedger(max_rate=0.5)
+    asyncio.run(h.run("chat", call("p", 5, log, "primary"), lambda: call("h", 0, log, "hedge"), valid))
+    result = asyncio.run(h.run(
+        "chat", call("p", 0.04, log, "primary"), lambda: call("h", 0, log, "hedge2"), valid
+    ))
+    assert result == ("p", "primary")
+    assert "hedge2 finished" not in log
+    assert h.stats()["tasks"]["chat"]["skipped"] == 1
+
+
+def test_cancelled_caller_cancels_both_calls():
+    log = []
+    h = hedger()
+
+    async def run():
+        task = asyncio.ensure_future(h.run(
+            "chat", call("p", 5, log, "primary"), lambda: call("h", 5, log, "hedge"), valid
+        ))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert sorted(log) == ["hedge cancelled", "primary cancelled"]
@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_queue import JobQueue  # noqa: E402
+
+
+async def noop(payload):
+    return {}
+
+
+@pytest.fixture
+def queue():
+    return JobQueue({"task": noop})
+
+
+@pytest.mark.parametrize("url", [
+    "http://169.254.169.254/latest/meta-data/",
+    "http://127.0.0.1:8000/health",
+    "http://10.0.0.5/hook",
+    "http://192.168.1.20/hook",
+    "http://[::1]/hook",
+    "http://[::ffff:169.254.169.254]/hook",
+    "http://localhost:5000/hook",
+])
+def test_internal_webhook_targets_are_rejected(queue, url):
+    with pytest.raises(ValueError, match="internal address"):
+        queue.validate_webhook(url)
+
+
+def test_internal_ip_literal_is_rejected_at_submit(queue):
+    with pytest.raises(ValueError):
+        queue.submit("task", {}, "http://169.254.169.254/latest/meta-data/")
+
+
+def test_public_webhook_target_is_allowed(queue):
+    queue.validate_webhook("https://93.184.216.34/hook")
+
+
+def test_allow_list_admits_listed_internal_hosts_only():
+    queue = JobQueue({"task": noop}, webhook_hosts=["localhost"])
+    queue.validate_webhook("http://localhost:5000/hook")
+    with pytest.raises(ValueError, match="not allowed"):
+        queue.validate_webhook("http://169.254.169.254/")
+
+
+def test_delivery_refuses_internal_target(queue):
+    # Hostnames are only resolved by check_webhook and at delivery, not by submit.
+    job = queue.submit("task", {}, "http://localhost:5000/hook")
+    asyncio.run(queue._deliver(job))
+    assert job["webhook"]["delivered"] is False
+    assert job["webhook"]["attempts"] == 0
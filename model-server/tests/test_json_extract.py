@@ -0,0 +1,48 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_extract import extract_json, normalize_json  # noqa: E402
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(HERE, "benchmarks", "malformed_outputs.jsonl")
+
+with open(CORPUS, encoding="utf-8") as f:
+    CASES = [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["id"] for case in CASES])
+def test_corpus_case(case):
+    extraction = extract_json(case["output"])
+    if case["expected_keys"] is None:
+        assert extraction is None or isinstance(extraction.value, list)
+        return
+    assert extraction is not None
+    assert set(extraction.value) == set(case["expected_keys"])
+    assert (extraction.method == "salvaged") == case["id"].startswith("truncated")
+
+
+def test_truncated_output_is_not_salvaged_when_disabled():
+    case = next(case for case in CASES if case["id"] == "truncated_in_list")
+    assert extract_json(case["output"], salvage=False) is None
+
+
+def test_first_of_two_objects_wins():
+    extraction = extract_json('{"a": 1} and then {"b": 2}')
+    assert extraction.value == {"a": 1}
+
+
+def test_normalize_leaves_string_contents_alone():
+    text = "{'note': \"it's // not a comment, True\", 'ok': True,}"
+    assert json.loads(normalize_json(text)) == {"note": "it's // not a comment, True", "ok": True}
+
+
+def test_unclosed_braces_stay_linear():
+    start = time.perf_counter()
+    assert extract_json("{ " * 20000) is None
+    assert time.perf_counter() - start < 2.0
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_cache  # noqa: E402
+import server  # noqa: E402
+from llm_cache import ResponseCache, make_cache_key  # noqa: E402
+
+
+def test_hit_returns_a_copy_of_the_stored_value():
+    cache = ResponseCache()
+    cache.set("k", {"data": {"score": 80}})
+    first = cache.get("k")
+    first["data"]["score"] = 0
+    assert cache.get("k") == {"data": {"score": 80}}
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(ttl_seconds=60)
+    cache.set("k", 1)
+    now[0] += 59
+    assert cache.get("k") == 1
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    ResponseCache(sqlite_path=path).set("k", {"model": "m"})
+    cache = ResponseCache(sqlite_path=path)
+    assert cache.get("k") == {"model": "m"}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_key_is_stable_across_option_order_and_whitespace():
+    a = make_cache_key("m", "Score  this\n resume", 0.1, {"max_tokens": 512, "system": "s"})
+    b = make_cache_key("m", "Score this resume", 0.1, {"system": "s", "max_tokens": 512})
+    assert a == b
+    assert a != make_cache_key("m", "Score this resume", 0.2, {"system": "s", "max_tokens": 512})
+    assert a != make_cache_key("other", "Score this resume", 0.1, {"system": "s", "max_tokens": 512})
+
+
+def test_cached_answer_keeps_the_model_that_answered(monkeypatch):
+    score = {
+        "overallScore": 80,
+        "categoryScores": {"experience": 80, "education": 70, "skills": 85, "formatting": 75, "impact": 70},
+        "strengths": ["APIs"],
+        "improvements": ["metrics"],
+        "summary": "solid",
+    }
+
+    async def get_available_model():
+        return "primary"
+
+    async def call_ollama_hedged(*args, **kwargs):
+        return json.dumps(score), {}, "fallback"
+
+    monkeypatch.setattr(server, "get_available_model", get_available_model)
+    monkeypatch.setattr(server, "call_ollama_hedged", call_ollama_hedged)
+    monkeypatch.setattr(server, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(server, "llm_cache", ResponseCache())
+
+    first = asyncio.run(server.run_json_task("resume text", "score-resume", system="rubric"))
+    second = asyncio.run(server.run_json_task("resume text", "score-resume", system="rubric"))
+    assert first["model"] == "fallback"
+    assert second["cached"] is True
+    assert second["model"] == "fallback"
@@ -0,0 +1,47 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_residency import ModelResidency  # noqa: E402
+
+GB = 1024 ** 3
+
+
+def pool(**sizes):
+    backend = SimpleNamespace(
+        healthy=True,
+        has_model=lambda model: model in sizes,
+        model_size=lambda model: sizes.get(model, 0),
+    )
+    return SimpleNamespace(backends=[backend])
+
+
+def test_unknown_budget_keeps_models_apart():
+    residency = ModelResidency(pool(primary=9 * GB, fallback=2 * GB))
+    residency.choose("primary")
+    assert residency.exclusive("primary", "fallback")
+    assert not residency.allows("fallback")
+
+
+def test_models_that_fit_the_budget_share_memory():
+    residency = ModelResidency(pool(primary=5 * GB, fallback=2 * GB), memory_budget_gb=8)
+    residency.choose("primary")
+    assert residency.allows("fallback")
+
+
+def test_models_over_budget_or_unsized_are_exclusive():
+    assert ModelResidency(pool(primary=7 * GB, fallback=2 * GB), memory_budget_gb=8).exclusive("primary", "fallback")
+    assert ModelResidency(pool(primary=5 * GB), memory_budget_gb=8).exclusive("primary", "fallback")
+
+
+def test_multi_policy_always_co_loads():
+    assert not ModelResidency(pool(primary=9 * GB, fallback=9 * GB), policy="multi").exclusive("primary", "fallback")
+
+
+def test_resident_model_is_held_for_min_residency():
+    residency = ModelResidency(pool(primary=9 * GB, fallback=2 * GB), min_residency_seconds=300)
+    assert residency.choose("primary") == "primary"
+    assert residency.choose("fallback") == "primary"
+    assert residency.held == 1
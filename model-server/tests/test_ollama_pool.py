@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+from ollama_pool import OllamaPool  # noqa: E402
+
+
+def reply(request):
+    return httpx.Response(200, json={"message": {"content": "hi"}, "response": "hi", "done": True, "eval_count": 1})
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Two backends behind a mock transport; "down" refuses connections."""
+    def handler(request):
+        if request.url.host == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.host == "bad":
+            return httpx.Response(400, json={"error": "invalid options"})
+        return reply(request)
+
+    pool = OllamaPool(["http://down", "http://up"], unhealthy_cooldown=60)
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(server, "ollama_pool", pool)
+    return pool
+
+
+def generate():
+    return asyncio.run(server.send_ollama_generate("Hello", 0.1, 16, "m", system="sys"))
+
+
+def test_failed_backend_fails_over_to_the_next(pool):
+    pool.backends[1].in_flight = 5  # least loaded (and not sticky): "down" is tried first
+    text, _ = generate()
+    assert text == "hi"
+    assert pool.failovers == 1
+    down, up = pool.backends
+    assert not down.healthy and down.failures == 1
+    assert up.healthy and up.in_flight == 5
+
+
+def test_unhealthy_backend_is_skipped_until_its_cooldown(pool):
+    down, up = pool.backends
+    pool.mark_failure(down, httpx.ConnectError("refused"))
+    assert pool.candidates("m") == [up]
+    down.unhealthy_since -= 61
+    assert pool.candidates("m") == [up, down]
+
+
+def test_request_errors_do_not_fail_over(pool):
+    pool.backends[0].url = "http://bad"
+    pool.backends[1].in_flight = 5
+    with pytest.raises(httpx.HTTPStatusError):
+        generate()
+    assert pool.failovers == 0
+    assert pool.backends[0].healthy
+
+
+def test_candidates_prefer_least_loaded_backends_with_the_model():
+    pool = OllamaPool(["http://a", "http://b", "http://c"], sticky_slack=0)
+    a, b, c = pool.backends
+    a.models, b.models, c.models = ["m"], ["m"], ["other"]
+    a.in_flight, b.in_flight = 3, 1
+    assert pool.candidates("m") == [b, a]
+
+
+def test_affinity_sticks_while_load_is_close():
+    pool = OllamaPool(["http://a", "http://b"], sticky_slack=1)
+    preferred = pool.candidates("m", affinity_key="template")[0]
+    other = next(b for b in pool.backends if b is not preferred)
+    preferred.in_flight = 1
+    assert pool.candidates("m", affinity_key="template")[0] is preferred
+    preferred.in_flight = 2
+    assert pool.candidates("m", affinity_key="template")[0] is other
+
+
+def test_stats_report_health():
+    pool = OllamaPool(["http://a", "http://b"])
+    pool.mark_failure(pool.backends[0], httpx.ConnectError("refused"))
+    stats = pool.stats()
+    assert stats["healthy"] == 1
+    assert json.dumps(stats)
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import PriorityScheduler, QueueFullError  # noqa: E402
+
+LANES = ["interactive", "standard", "batch"]
+
+
+async def hold(gate, order=None, name=None):
+    await gate.wait()
+    if order is not None:
+        order.append(name)
+    return name
+
+
+def test_waiting_interactive_calls_run_before_batch():
+    async def run():
+        scheduler = PriorityScheduler(max_concurrency=1, lanes=LANES)
+        gate, order = asyncio.Event(), []
+        busy = asyncio.ensure_future(scheduler.run("batch", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.ensure_future(scheduler.run(lane, lambda lane=lane: hold(gate, order, lane)))
+            for lane in ("batch", "standard", "interactive")
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["active"] == 1
+        gate.set()
+        await asyncio.gather(busy, *queued)
+        return order
+
+    assert asyncio.run(run()) == ["interactive", "standard", "batch"]
+
+
+def test_reserved_slot_is_kept_for_interactive():
+    async def run():
+        scheduler = PriorityScheduler(max_concurrency=2, lanes=LANES, reserved_slots=1)
+        gate = asyncio.Event()
+        first = asyncio.ensure_future(scheduler.run("batch", lambda: hold(gate)))
+        second = asyncio.ensure_future(scheduler.run("batch", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["active"] == 1
+        interactive = asyncio.ensure_future(scheduler.run("interactive", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["active"] == 2
+        gate.set()
+        await asyncio.gather(first, second, interactive)
+
+    asyncio.run(run())
+
+
+def test_full_lane_rejects_with_retry_after():
+    async def run():
+        scheduler = PriorityScheduler(max_concurrency=1, lanes=LANES, queue_limits={"batch": 1})
+        gate = asyncio.Event()
+        busy = asyncio.ensure_future(scheduler.run("batch", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(scheduler.run("batch", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError) as excinfo:
+            await scheduler.run("batch", lambda: hold(gate))
+        # Other lanes still queue.
+        interactive = asyncio.ensure_future(scheduler.run("interactive", lambda: hold(gate)))
+        gate.set()
+        await asyncio.gather(busy, queued, interactive)
+        return excinfo.value, scheduler.stats()
+
+    error, stats = asyncio.run(run())
+    assert error.lane == "batch"
+    assert error.retry_after >= 1
+    assert stats["lanes"]["batch"]["rejected"] == 1
+    assert stats["active"] == 0
+
+
+def test_rejection_becomes_429_with_retry_after_header():
+    import server
+
+    exc = server.queue_full_http_error(QueueFullError("batch", 7))
+    assert exc.status_code == 429
+    assert exc.headers["Retry-After"] == "7"
+
+
+def test_cancelled_waiter_frees_its_place():
+    async def run():
+        scheduler = PriorityScheduler(max_concurrency=1, lanes=LANES)
+        gate = asyncio.Event()
+        busy = asyncio.ensure_future(scheduler.run("standard", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(scheduler.run("standard", lambda: hold(gate)))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        gate.set()
+        await busy
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert stats["active"] == 0
+    assert stats["lanes"]["standard"]["queued"] == 0
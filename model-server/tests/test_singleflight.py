@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+from singleflight import SingleFlight  # noqa: E402
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Counts calls that reach Ollama; each takes a moment so identical calls overlap."""
+    calls = []
+
+    async def post_ollama_generate(prompt, *args, **kwargs):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return '{"ok": true}', {}
+
+    monkeypatch.setattr(server, "post_ollama_generate", post_ollama_generate)
+    monkeypatch.setattr(server, "LLM_SINGLEFLIGHT_ENABLED", True)
+    monkeypatch.setattr(server, "ollama_singleflight", SingleFlight())
+    return calls
+
+
+def call(stream_json=False, listener=None):
+    async def run():
+        if listener is not None:
+            server.json_field_listener.set(listener)
+        return await server.call_ollama_with_stats("Rate this.", 0.2, 256, "m", "score-resume", stream_json=stream_json)
+    return run()
+
+
+async def gather(*calls):
+    return await asyncio.gather(*calls)
+
+
+def test_identical_calls_are_joined(upstream):
+    asyncio.run(gather(call(), call()))
+    assert len(upstream) == 1
+
+
+def test_streaming_and_plain_calls_are_not_joined(upstream):
+    asyncio.run(gather(call(stream_json=True), call()))
+    assert len(upstream) == 2
+
+
+def test_call_with_field_listener_runs_on_its_own(upstream):
+    events = []
+    asyncio.run(gather(call(stream_json=True, listener=lambda k, v: events.append(k)), call(stream_json=True)))
+    assert len(upstream) == 2
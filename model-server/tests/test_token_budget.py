@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from token_budget import ContextPlanner, PromptTooLargeError  # noqa: E402
+
+
+def test_short_prompt_gets_small_ctx_after_large_one():
+    planner = ContextPlanner(ctx_buckets=(2048, 4096, 8192), max_predict=512)
+    _, large_ctx, _ = planner.plan("word " * 5000, "parse-resume-ollama", 512)
+    _, small_ctx, _ = planner.plan("Rate this answer.", "evaluate-answer", 512)
+    assert large_ctx == 8192
+    assert small_ctx == 2048
+
+
+def test_pinned_task_keeps_its_bucket():
+    planner = ContextPlanner(ctx_buckets=(2048, 4096, 8192), max_predict=512, task_ctx={"parse": 3000})
+    assert planner.task_ctx == {"parse": 4096}
+    assert planner.plan("short resume", "parse", 512)[1] == 4096
+    assert planner.plan("word " * 5000, "parse", 512)[1] == 8192
+    assert planner.plan("short answer", "chat", 512)[1] == 2048
+
+
+def test_oversized_prompt_is_rejected():
+    planner = ContextPlanner(ctx_buckets=(2048,), max_predict=512)
+    with pytest.raises(PromptTooLargeError):
+        planner.plan("word " * 5000, "chat", 512)
+    assert planner.rejected == 1
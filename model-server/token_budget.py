@@ -0,0 +1,168 @@
+"""
+ResuMate Token Budgeting
+────────────────────────
+Local token estimation and per-request sizing of Ollama's num_ctx and
+num_predict. Output budgets are learned from the eval_count Ollama reports
+for each task; context windows are rounded up to a few fixed buckets
+because every distinct num_ctx makes Ollama reload the model. A task can
+be pinned to a bucket so its calls always share one num_ctx; unpinned
+calls get the smallest bucket their own prompt fits.
+"""
+
+import math
+import re
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+class PromptTooLargeError(Exception):
+    """Raised when a prompt cannot fit the largest allowed context window."""
+
+    def __init__(self, prompt_tokens: int, limit: int):
+        super().__init__(
+            f"Prompt is too large for the model context (~{prompt_tokens} tokens, limit {limit})."
+        )
+        self.prompt_tokens = prompt_tokens
+        self.limit = limit
+
+
+def _piece_tokens(piece: str) -> int:
+    if piece.isalpha():
+        return max(1, math.ceil(len(piece) / 4))
+    if piece.isdigit():
+        return max(1, math.ceil(len(piece) / 3))
+    return 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: long words split every ~4 chars, digits every ~3."""
+    return sum(_piece_tokens(piece) for piece in _TOKEN_RE.findall(text or ""))
+
+
+def truncate_tokens(text: str, max_tokens: int, keep_tail: bool = False) -> str:
+    """Cut text to about max_tokens estimated tokens, keeping its start (or end)."""
+    text = text or ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    pieces = list(_TOKEN_RE.finditer(text))
+    if keep_tail:
+        pieces.reverse()
+    count = 0
+    for piece in pieces:
+        count += _piece_tokens(piece.group())
+        if count > max_tokens:
+            return "…" + text[piece.end():].lstrip() if keep_tail else text[:piece.start()].rstrip() + "…"
+    return text
+
+
+def compact_prompt(prompt: str) -> str:
+    """Squeeze whitespace runs (common in PDF-extracted resumes) without touching content."""
+    prompt = re.sub(r"[ \t]+", " ", prompt)
+    prompt = re.sub(r" ?\n[ \n]*\n", "\n\n", prompt)
+    return prompt.strip()
+
+
+class OutputLengthTracker:
+    """Rolling per-task record of generated token counts."""
+
+    def __init__(self, window: int = 200, min_samples: int = 8):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[int]] = {}
+
+    def record(self, task: str, eval_count: int, truncated: bool = False) -> None:
+        # A truncated output says the budget was too small, not how long the answer is.
+        value = eval_count * 2 if truncated else eval_count
+        self._samples.setdefault(task, deque(maxlen=self.window)).append(int(value))
+
+    def percentile(self, task: str, pct: float) -> Optional[int]:
+        samples = self._samples.get(task)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+        return ordered[idx]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            task: {
+                "samples": len(samples),
+                "p50": self.percentile(task, 50) or 0,
+                "p95": self.percentile(task, 95) or 0,
+            }
+            for task, samples in self._samples.items()
+        }
+
+
+class ContextPlanner:
+    """Pick num_ctx / num_predict for a prompt.
+
+    task_ctx pins tasks to a minimum num_ctx (rounded up to a bucket); a
+    prompt that needs more still gets the larger bucket.
+    """
+
+    def __init__(
+        self,
+        ctx_buckets: Sequence[int] = (2048, 4096, 8192),
+        max_predict: int = 1024,
+        percentile: float = 95.0,
+        headroom: float = 1.25,
+        tracker: Optional[OutputLengthTracker] = None,
+        task_ctx: Optional[Dict[str, int]] = None,
+    ):
+        self.ctx_buckets: List[int] = sorted(int(b) for b in ctx_buckets)
+        self.task_ctx: Dict[str, int] = {
+            task: self.bucket(size) for task, size in (task_ctx or {}).items()
+        }
+        self.max_predict = int(max_predict)
+        self.percentile = percentile
+        self.headroom = headroom
+        self.tracker = tracker or OutputLengthTracker()
+        self.compacted = 0
+        self.rejected = 0
+
+    def output_budget(self, task: str, requested: int) -> int:
+        budget = min(int(requested), self.max_predict)
+        learned = self.tracker.percentile(task, self.percentile)
+        if learned is not None:
+            budget = min(budget, max(64, math.ceil(learned * self.headroom) + 16))
+        return budget
+
+    def bucket(self, tokens: int) -> int:
+        """Smallest bucket holding tokens (the largest when none does)."""
+        return next((b for b in self.ctx_buckets if b >= tokens), self.ctx_buckets[-1])
+
+    def plan(
+        self, prompt: str, task: str, requested_max_tokens: int, prefix_tokens: int = 0
+    ) -> Tuple[str, int, int]:
+        """Return (prompt, num_ctx, num_predict), compacting or rejecting oversized prompts.
+
+        prefix_tokens accounts for a fixed system prompt sent alongside.
+        """
+        num_predict = self.output_budget(task, requested_max_tokens)
+        largest = self.ctx_buckets[-1]
+
+        prompt_tokens = prefix_tokens + estimate_tokens(prompt)
+        if prompt_tokens + num_predict > largest:
+            self.compacted += 1
+            prompt = compact_prompt(prompt)
+            prompt_tokens = prefix_tokens + estimate_tokens(prompt)
+        if prompt_tokens + num_predict > largest:
+            self.rejected += 1
+            raise PromptTooLargeError(prompt_tokens, largest - num_predict)
+
+        num_ctx = max(self.bucket(prompt_tokens + num_predict), self.task_ctx.get(task, 0))
+        return prompt, num_ctx, num_predict
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "ctx_buckets": self.ctx_buckets,
+            "task_ctx": dict(self.task_ctx),
+            "max_predict": self.max_predict,
+            "percentile": self.percentile,
+            "compacted": self.compacted,
+            "rejected": self.rejected,
+            "tasks": self.tracker.stats(),
+        }
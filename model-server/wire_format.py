@@ -0,0 +1,153 @@
+"""
+ResuMate Wire Formats
+─────────────────────
+Content negotiation for request and response bodies between the backend
+and the model server.
+
+Responses are JSON by default, serialized with orjson when it is installed
+(several times faster than the stdlib encoder on the nested parse, score
+and match documents). A client sending `Accept: application/msgpack` gets
+MessagePack instead. Request bodies may be JSON or MessagePack
+(Content-Type), and are decoded straight from the received bytes.
+
+orjson and msgpack are optional: without orjson, JSON goes through the
+stdlib; without msgpack, MessagePack is neither offered nor accepted.
+Error responses (HTTPException, validation errors) are always JSON.
+"""
+
+import json
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = frozenset({"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"})
+
+# Response format for the current request, set from its Accept header.
+response_format: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+
+def stats() -> dict:
+    return {
+        "formats": [JSON] + ([MSGPACK] if msgpack is not None else []),
+        "json_encoder": "orjson" if orjson is not None else "stdlib",
+    }
+
+
+def media_type(header: Optional[str]) -> str:
+    return (header or "").split(";", 1)[0].strip().lower()
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """MessagePack when the Accept header prefers it over JSON (and msgpack is installed), else JSON."""
+    if msgpack is None or not accept or "msgpack" not in accept:
+        return JSON
+    best, best_q = JSON, 0.0
+    for part in accept.split(","):
+        kind, _, params = part.partition(";")
+        kind = kind.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # On equal q the earlier entry wins; JSON covers the wildcards.
+        candidate = MSGPACK if kind in MSGPACK_TYPES else JSON if kind in (JSON, "application/*", "*/*") else None
+        if candidate and q > best_q:
+            best, best_q = candidate, q
+    return best
+
+
+def dumps_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    # Same output options as Starlette's JSONResponse.
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(body: bytes) -> Any:
+    # Both parse bytes directly; orjson without an intermediate str copy.
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI's 422 handling applies.
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def loads_msgpack(body: bytes) -> Any:
+    try:
+        return msgpack.unpackb(body, raw=False)
+    except (ValueError, TypeError, msgpack.UnpackException):
+        raise HTTPException(status_code=400, detail="Invalid MessagePack body")
+
+
+class NegotiatedResponse(Response):
+    """Default response class: JSON (orjson) or MessagePack, per response_format."""
+
+    media_type = JSON
+
+    def __init__(self, content: Any = None, *args: Any, **kwargs: Any):
+        self.media_type = response_format.get()
+        super().__init__(content, *args, **kwargs)
+        if msgpack is not None:
+            self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK:
+            return msgpack.packb(content, use_bin_type=True)
+        return dumps_json(content)
+
+
+class JSONBodyRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = loads_json(await self.body())
+        return self._json
+
+
+class MsgPackBodyRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = loads_msgpack(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Negotiates the response format and decodes JSON (orjson) or MessagePack bodies.
+
+    FastAPI only parses bodies it sees as JSON, so a MessagePack request is
+    handed to it with a JSON content type and a json() that unpacks the body.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response_format.set(negotiate(request.headers.get("accept")))
+            kind = media_type(request.headers.get("content-type"))
+            if kind in MSGPACK_TYPES and msgpack is not None:
+                headers = [
+                    (name, JSON.encode()) if name == b"content-type" else (name, value)
+                    for name, value in request.scope["headers"]
+                ]
+                request = MsgPackBodyRequest(dict(request.scope, headers=headers), request.receive)
+            elif kind == JSON or not kind:
+                request = JSONBodyRequest(request.scope, request.receive)
+            return await handler(request)
+
+        return route_handler